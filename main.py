@@ -1,28 +1,83 @@
 import argparse
+import sys
 from lle import World
-from src.problem import SearchProblem, GemProblem, ExitProblem, CornerProblem
-from src.search import astar, bfs, dfs, Solution, visualize_solution
+from src.problem import SearchProblem, GemProblem, ExitProblem, CornerProblem, MultiAgentExitProblem, MultiAgentGemProblem
+from src.search import astar, bfs, dfs, Solution
 
 
 PROBLEMS: dict = {
     'gem': GemProblem,
     'exit': ExitProblem,
-    'corner': CornerProblem
+    'corner': CornerProblem,
+    'multi_exit': MultiAgentExitProblem,
+    'multi_gem': MultiAgentGemProblem
 }
 
+def cbs(problem: MultiAgentExitProblem, verbose: bool = False) -> Solution:
+
+    # Conflict-Based Search is only loaded when asked for. Running out of budget is not the same as having no solution.
+    from src.cbs import cbs as conflict_based_search
+    result = conflict_based_search(problem=problem, verbose=verbose)
+    if result.stopped_early: sys.exit(f'[E] CBS stopped before deciding whether there is a solution ({result.limit} budget exceeded).')
+    return result.solution
+
+
 ALGORITHMS: dict = {
     'astar': astar,
     'bfs': bfs,
-    'dfs': dfs
+    'dfs': dfs,
+    'cbs': cbs
 }
 
+def batch_main(argv: list[str]) -> None:
+
+    # python main.py batch <maps...> --problems ... --algorithms ... : headless, one JSON line per job.
+    from src import batch, benchmark
+    parser = argparse.ArgumentParser(prog='main.py batch', description='Solve many maps with several problems and algorithms, one JSON line per job.')
+    parser.add_argument('maps', nargs='+', help='Map files, directories (every .txt file inside) or glob patterns.')
+    parser.add_argument('--problems', nargs='+', default=['exit'], choices=benchmark.PROBLEMS.keys(), help='Problems to solve on every map.')
+    parser.add_argument('--algorithms', nargs='+', default=['astar'], choices=benchmark.ALGORITHMS.keys(), help='Algorithms to run on every problem.')
+    parser.add_argument('--workers', type=int, default=None, help='Number of worker processes (one per CPU by default).')
+    parser.add_argument('--output', type=str, default=None, help='JSONL file to write (standard output by default).')
+    args = parser.parse_args(argv)
+
+    if args.output is None:
+        batch.batch(patterns=args.maps, problems=args.problems, algorithms=args.algorithms, workers=args.workers)
+        return
+
+    with open(args.output, 'w') as f:
+        n_jobs: int = batch.batch(patterns=args.maps, problems=args.problems, algorithms=args.algorithms, workers=args.workers, output=f)
+    print(f'[i] {n_jobs} jobs written to {args.output}.')
+
+
+def serve_main(argv: list[str]) -> None:
+
+    # python main.py serve [--socket PATH] : long-running solver answering JSON-lines requests (see src/daemon.py).
+    from src import daemon
+    parser = argparse.ArgumentParser(prog='main.py serve', description='Long-running solver answering JSON-lines solve requests with warm problems.')
+    parser.add_argument('--socket', type=str, default=None, help='Unix socket to listen on (standard input and output by default).')
+    parser.add_argument('--workers', type=int, default=None, help='Number of worker processes (one per CPU by default).')
+    parser.add_argument('--capacity', type=int, default=64, help='Number of problems kept in memory by each worker.')
+    parser.add_argument('--cache-dir', type=str, default=None, help='Directory of a persistent cache for the distance tables.')
+    args = parser.parse_args(argv)
+
+    with daemon.SolverDaemon(workers=args.workers, capacity=args.capacity, cache_dir=args.cache_dir) as solver:
+        if args.socket is None: solver.serve(input=sys.stdin, output=sys.stdout)
+        else: solver.serve_unix(path=args.socket)
+
+
 def main():
     
+    if len(sys.argv) > 1 and sys.argv[1] == 'batch': return batch_main(argv=sys.argv[2:])
+    if len(sys.argv) > 1 and sys.argv[1] == 'serve': return serve_main(argv=sys.argv[2:])
+
     parser = argparse.ArgumentParser(description='Solve a problem in a world using different algorithms.')
     parser.add_argument('world_file', type=str, help='Path to the text file containing the world representation.')
-    parser.add_argument('--problem', required=True, choices=PROBLEMS.keys(), help='Type of problem to solve (gem, exit, corner).')
-    parser.add_argument('--algo', required=True, choices=ALGORITHMS.keys(), help='Algorithm to use (astar, bfs, dfs).')
+    parser.add_argument('--problem', required=True, choices=PROBLEMS.keys(), help='Type of problem to solve (gem, exit, corner, multi_exit, multi_gem).')
+    parser.add_argument('--algo', required=True, choices=ALGORITHMS.keys(), help='Algorithm to use (astar, bfs, dfs, or cbs for multi_exit).')
     parser.add_argument('--verbose', action='store_true', help='Enable verbose mode for debugging.')
+    parser.add_argument('--export', type=str, default=None, help='Write the replay to a .gif, .mp4 or .avi file, or to a directory of PNG images, instead of showing it.')
+    parser.add_argument('--delay', type=float, default=None, help='Play the solution with this delay (seconds) between steps instead of waiting for input.')
     args = parser.parse_args()
 
     with open(args.world_file, 'r') as f:
@@ -33,7 +88,13 @@ def main():
     problem: object = problem_class(world=world)
     algorithm: callable = ALGORITHMS[args.algo]
     sol: Solution = algorithm(problem=problem, verbose=args.verbose)
-    visualize_solution(w=world, solution=sol, name='Solution')
+
+    # Rendering libraries are only loaded here, the solver itself does not need them.
+    from src.visualization import export_solution, visualize_solution
+    if args.export is None: return visualize_solution(w=world, solution=sol, name='Solution', delay=args.delay)
+    if sol is None: return print('No solution found!')
+    paths: list[str] = export_solution(w=world, solution=sol, path=args.export)
+    print(f'[i] Replay of {sol.n_steps} steps written to {args.export} ({len(paths)} files).')
 
 
 
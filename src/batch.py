@@ -0,0 +1,74 @@
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+from typing import Iterator, Optional, TextIO
+from lle import World
+from src.benchmark import ALGORITHMS, PROBLEMS, RESTRICTED
+from src.problem import SearchProblem
+from src.search import Solution
+from src.stats import SearchStats
+
+
+def expand_maps(patterns: list[str]) -> list[str]:
+
+    # Each pattern is a map file, a directory (every .txt file inside it) or a glob. Sorted, without duplicates.
+    paths: set[str] = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern): paths.update(glob.glob(os.path.join(pattern, '*.txt')))
+        elif os.path.isfile(pattern): paths.add(pattern)
+        else: paths.update(p for p in glob.glob(pattern, recursive=True) if os.path.isfile(p))
+    return sorted(paths)
+
+
+def make_jobs(paths: list[str], problems: list[str], algorithms: list[str]) -> list[tuple[str, str, str]]:
+
+    # One (map path, problem, algorithm) job per combination, skipping the algorithms that do not handle a problem.
+    for name in algorithms: assert name in ALGORITHMS, f'[E] Unknown algorithm : {name}.'
+    for name in problems: assert name in PROBLEMS, f'[E] Unknown problem : {name}.'
+    return [(path, problem, algorithm) for path in paths for problem in problems for algorithm in algorithms
+            if problem in RESTRICTED.get(algorithm, (problem,))]
+
+
+def solve_job(job: tuple[str, str, str]) -> dict:
+
+    # Worker : solves one job and returns its JSON record. Errors (unreadable map, ...) end up in the record.
+    path, problem_name, algorithm = job
+    record: dict = {'map': path, 'problem': problem_name, 'algorithm': algorithm}
+
+    try:
+        with open(path, 'r') as f:
+            problem: SearchProblem = PROBLEMS[problem_name](world=World(f.read()))
+        stats: SearchStats = SearchStats()
+        start: float = time.perf_counter()
+        solution: Optional[Solution] = ALGORITHMS[algorithm](problem, stats)
+        elapsed: float = time.perf_counter() - start
+    except Exception as e:
+        record['error'] = repr(e)
+        return record
+
+    record['actions'] = None if solution is None else [a.name for a in solution.actions]
+    record['steps'] = None if solution is None else solution.n_steps
+    record['nodes_expanded'] = stats.nodes_expanded
+    record['time'] = elapsed
+    return record
+
+
+def run_batch(jobs: list[tuple[str, str, str]], workers: Optional[int] = None) -> Iterator[dict]:
+
+    # Solves the jobs on a pool of 'workers' processes (one per CPU by default) and yields the records as they complete.
+    with multiprocessing.Pool(processes=workers) as pool:
+        yield from pool.imap_unordered(solve_job, jobs)
+
+
+def batch(patterns: list[str], problems: list[str], algorithms: list[str], workers: Optional[int] = None,
+          output: TextIO = sys.stdout) -> int:
+
+    # Streams one JSON line per job to 'output' and returns the number of jobs.
+    jobs: list[tuple[str, str, str]] = make_jobs(paths=expand_maps(patterns=patterns), problems=problems, algorithms=algorithms)
+    for record in run_batch(jobs=jobs, workers=workers):
+        output.write(json.dumps(record) + '\n')
+        output.flush()
+    return len(jobs)
@@ -0,0 +1,214 @@
+import argparse
+import csv
+import json
+import os
+import statistics
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict, fields
+from typing import Callable, Optional
+from lle import World
+from src.map_generator import generate_map
+from src.problem import SearchProblem, GemProblem, ExitProblem, CornerProblem
+from src.search import Solution, astar, bfs, dfs, ida_star, bidirectional_search
+from src.stats import SearchStats
+
+
+PROBLEMS: dict = {
+    'gem': GemProblem,
+    'exit': ExitProblem,
+    'corner': CornerProblem
+}
+
+# Every algorithm is called as algorithm(problem, stats) so that the nodes expanded can be recorded.
+ALGORITHMS: dict[str, Callable[[SearchProblem, SearchStats], Optional[Solution]]] = {
+    'dfs': lambda problem, stats: dfs(problem=problem, stats=stats),
+    'bfs': lambda problem, stats: bfs(problem=problem, stats=stats),
+    'astar': lambda problem, stats: astar(problem=problem, stats=stats),
+    'astar_bucket': lambda problem, stats: astar(problem=problem, frontier='bucket', stats=stats),
+    'ida_star': lambda problem, stats: ida_star(problem=problem, transposition_size=1_000_000, stats=stats),
+    'bidirectional': lambda problem, stats: bidirectional_search(problem=problem, stats=stats)
+}
+
+# Algorithms that only solve some of the problems.
+RESTRICTED: dict[str, tuple[str, ...]] = {
+    'bidirectional': ('exit',)
+}
+
+
+@dataclass
+class BenchmarkRecord:
+
+    # One run of one algorithm on one problem of one generated map. 'time' is the median over the repetitions (seconds),
+    # 'peak_memory' the tracemalloc peak in bytes (None when memory is not measured), 'steps' None without a solution.
+    problem: str
+    algorithm: str
+    height: int
+    width: int
+    seed: int
+    steps: Optional[int]
+    nodes_expanded: int
+    time: float
+    peak_memory: Optional[int]
+
+
+def measure(algorithm: str, problem_name: str, map_str: str, repeat: int = 1, memory: bool = True,
+            compiled: bool = False) -> tuple[Optional[Solution], SearchStats, float, Optional[int]]:
+
+    """
+    Runs 'algorithm' on a fresh 'problem_name' problem of 'map_str' and returns (solution, stats, median time, peak memory).
+
+    Building the problem (distance tables, ...) is not timed. Memory is measured by one more run under tracemalloc,
+    which slows Python down too much for its timing to be kept.
+    """
+
+    assert repeat >= 1, '[E] At least one repetition is needed.'
+    times: list[float] = []
+    solution, stats = None, SearchStats()
+
+    for i in range(repeat):
+        problem: SearchProblem = PROBLEMS[problem_name](world=World(map_str), compiled=compiled)
+        run_stats: SearchStats = SearchStats()
+        start: float = time.perf_counter()
+        result: Optional[Solution] = ALGORITHMS[algorithm](problem, run_stats)
+        times.append(time.perf_counter() - start)
+        if i == 0: solution, stats = result, run_stats
+
+    peak: Optional[int] = None
+    if memory:
+        problem = PROBLEMS[problem_name](world=World(map_str), compiled=compiled)
+        tracemalloc.start()
+        try:
+            ALGORITHMS[algorithm](problem, SearchStats())
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return solution, stats, statistics.median(times), peak
+
+
+def run_benchmark(algorithms: list[str], problems: list[str], sizes: list[int], seeds: list[int],
+                  wall_density: float = 0.2, n_gems: int = 4, n_lasers: int = 0, n_exits: int = 1,
+                  repeat: int = 1, memory: bool = True, compiled: bool = False, time_limit: Optional[float] = None,
+                  verbose: bool = False) -> list[BenchmarkRecord]:
+
+    """
+    Sweeps algorithms x problems x sizes, each size being a 'size' x 'size' map generated once per seed.
+
+    Args:
+        time_limit: Once an (algorithm, problem) pair needs more than 'time_limit' seconds on a map,
+            it is not run on the larger sizes anymore.
+    """
+
+    for name in algorithms: assert name in ALGORITHMS, f'[E] Unknown algorithm : {name}.'
+    for name in problems: assert name in PROBLEMS, f'[E] Unknown problem : {name}.'
+
+    records: list[BenchmarkRecord] = []
+    too_slow: set[tuple[str, str]] = set()
+
+    for size in sorted(sizes):
+        for seed in seeds:
+
+            map_str: str = generate_map(height=size, width=size, wall_density=wall_density, n_gems=n_gems,
+                                        n_lasers=n_lasers, n_exits=n_exits, seed=seed)
+
+            for problem_name in problems:
+                for algorithm in algorithms:
+
+                    if problem_name not in RESTRICTED.get(algorithm, (problem_name,)): continue
+                    if (algorithm, problem_name) in too_slow: continue
+
+                    solution, stats, elapsed, peak = measure(algorithm=algorithm, problem_name=problem_name, map_str=map_str,
+                                                             repeat=repeat, memory=memory, compiled=compiled)
+                    record: BenchmarkRecord = BenchmarkRecord(problem=problem_name, algorithm=algorithm, height=size, width=size,
+                                                              seed=seed, steps=None if solution is None else solution.n_steps,
+                                                              nodes_expanded=stats.nodes_expanded, time=elapsed, peak_memory=peak)
+                    records.append(record)
+                    if verbose: print(f'[i] {record}')
+                    if time_limit is not None and elapsed > time_limit: too_slow.add((algorithm, problem_name))
+
+    return records
+
+
+def write_json(records: list[BenchmarkRecord], path: str) -> None:
+    with open(path, 'w') as f:
+        json.dump([asdict(r) for r in records], f, indent=2)
+
+
+def write_csv(records: list[BenchmarkRecord], path: str) -> None:
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=[field.name for field in fields(BenchmarkRecord)])
+        writer.writeheader()
+        writer.writerows(asdict(r) for r in records)
+
+
+def save_plots(records: list[BenchmarkRecord], directory: str) -> list[str]:
+
+    # One figure per problem with the time, nodes expanded and peak memory against the map size,
+    # one line per algorithm (mean over the seeds). Returns the paths of the saved files.
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    os.makedirs(directory, exist_ok=True)
+    metrics: list[tuple[str, str]] = [('time', 'Time (s)'), ('nodes_expanded', 'Nodes expanded'), ('peak_memory', 'Peak memory (bytes)')]
+    paths: list[str] = []
+
+    for problem_name in sorted({r.problem for r in records}):
+
+        figure, axes = plt.subplots(1, len(metrics), figsize=(5 * len(metrics), 4))
+        for algorithm in sorted({r.algorithm for r in records if r.problem == problem_name}):
+
+            runs: list[BenchmarkRecord] = [r for r in records if r.problem == problem_name and r.algorithm == algorithm]
+            sizes: list[int] = sorted({r.height for r in runs})
+            for ax, (metric, label) in zip(axes, metrics):
+                values: list = [[getattr(r, metric) for r in runs if r.height == s and getattr(r, metric) is not None] for s in sizes]
+                points: list[tuple[int, float]] = [(s, statistics.mean(v)) for s, v in zip(sizes, values) if v]
+                if points: ax.plot(*zip(*points), marker='o', label=algorithm)
+                ax.set_xlabel('Map size')
+                ax.set_ylabel(label)
+
+        axes[0].legend()
+        figure.suptitle(f'{problem_name} problem')
+        figure.tight_layout()
+        path: str = os.path.join(directory, f'{problem_name}.png')
+        figure.savefig(path)
+        plt.close(figure)
+        paths.append(path)
+
+    return paths
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser(description='Benchmark the search algorithms on generated maps.')
+    parser.add_argument('--algorithms', nargs='+', default=['bfs', 'astar'], choices=ALGORITHMS.keys(), help='Algorithms to run.')
+    parser.add_argument('--problems', nargs='+', default=['exit', 'gem'], choices=PROBLEMS.keys(), help='Problems to solve.')
+    parser.add_argument('--sizes', nargs='+', type=int, default=[5, 10, 15, 20], help='Side lengths of the generated maps.')
+    parser.add_argument('--seeds', nargs='+', type=int, default=[0, 1, 2], help='Seeds of the generated maps (one map per seed and size).')
+    parser.add_argument('--wall-density', type=float, default=0.2, help='Probability for a cell to be a wall.')
+    parser.add_argument('--gems', type=int, default=4, help='Number of gems per map.')
+    parser.add_argument('--lasers', type=int, default=0, help='Number of laser sources per map.')
+    parser.add_argument('--exits', type=int, default=1, help='Number of exits per map.')
+    parser.add_argument('--repeat', type=int, default=3, help='Number of timed runs per measurement (the median is kept).')
+    parser.add_argument('--time-limit', type=float, default=None, help='Skip larger maps once a run takes longer (seconds).')
+    parser.add_argument('--no-memory', action='store_true', help='Do not measure the peak memory (faster).')
+    parser.add_argument('--compiled', action='store_true', help='Build the problems on the compiled world.')
+    parser.add_argument('--output', type=str, default='benchmark', help='Directory for results.json, results.csv and the plots.')
+    parser.add_argument('--verbose', action='store_true', help='Print every record.')
+    args = parser.parse_args()
+
+    records: list[BenchmarkRecord] = run_benchmark(
+        algorithms=args.algorithms, problems=args.problems, sizes=args.sizes, seeds=args.seeds,
+        wall_density=args.wall_density, n_gems=args.gems, n_lasers=args.lasers, n_exits=args.exits,
+        repeat=args.repeat, memory=not args.no_memory, compiled=args.compiled, time_limit=args.time_limit, verbose=args.verbose)
+
+    os.makedirs(args.output, exist_ok=True)
+    write_json(records=records, path=os.path.join(args.output, 'results.json'))
+    write_csv(records=records, path=os.path.join(args.output, 'results.csv'))
+    paths: list[str] = save_plots(records=records, directory=args.output)
+    print(f'[i] {len(records)} runs written to {args.output} ({len(paths)} plots).')
+
+
+if __name__ == '__main__':
+    main()
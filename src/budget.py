@@ -0,0 +1,117 @@
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Optional
+from src.stats import SearchStats
+
+
+# Number of expansions between two memory measurements (reading the resident memory is a system call).
+MEMORY_CHECK_INTERVAL: int = 1024
+
+
+def resident_memory() -> int:
+
+    # Memory currently used by the process in bytes : resident set size on Linux, peak resident size on other Unix
+    # systems, and the memory traced by tracemalloc (0 when it is off) elsewhere.
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        # ru_maxrss is in bytes on macOS and in kilobytes on the other systems.
+        peak: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except ImportError:
+        return tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+
+
+@dataclass
+class SearchBudget:
+
+    """
+    Hard limits of a streamed search, None meaning no limit.
+
+    Args:
+        max_nodes: Maximum number of nodes expanded.
+        max_memory: Maximum growth of the process memory (bytes) since the search started, checked every MEMORY_CHECK_INTERVAL expansions.
+        max_time: Maximum wall-clock time (seconds).
+    """
+
+    max_nodes: Optional[int] = None
+    max_memory: Optional[int] = None
+    max_time: Optional[float] = None
+
+    def start(self) -> "BudgetClock":
+        return BudgetClock(budget=self)
+
+
+class BudgetClock:
+
+    # The running state of a SearchBudget during one search.
+
+    def __init__(self, budget: SearchBudget) -> None:
+        self.budget: SearchBudget = budget
+        self.deadline: Optional[float] = None if budget.max_time is None else time.perf_counter() + budget.max_time
+        self.memory_start: int = resident_memory() if budget.max_memory is not None else 0
+
+    def exceeded(self, expanded: int) -> Optional[str]:
+        # The name of the first limit reached after 'expanded' expansions ('nodes', 'time' or 'memory'), if any.
+        budget: SearchBudget = self.budget
+        if budget.max_nodes is not None and expanded >= budget.max_nodes: return 'nodes'
+        if self.deadline is not None and time.perf_counter() > self.deadline: return 'time'
+        if budget.max_memory is not None and expanded % MEMORY_CHECK_INTERVAL == 0:
+            if resident_memory() - self.memory_start > budget.max_memory: return 'memory'
+        return None
+
+
+class CancelToken:
+
+    # Thread-safe cancellation flag : cancel() may be called from another thread or an asyncio task,
+    # the search stops before its next expansion.
+
+    def __init__(self) -> None:
+        self.event: threading.Event = threading.Event()
+
+    def cancel(self) -> None:
+        self.event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.event.is_set()
+
+
+@dataclass
+class SearchEvent:
+
+    # Yielded by a streamed search before each expansion. 'node' is a NodeView, 'elapsed' is in seconds.
+    node: Any
+    expanded: int
+    frontier_size: int
+    elapsed: float
+
+
+@dataclass
+class SearchResult:
+
+    """
+    Outcome of a streamed search.
+
+    'status' is 'solved', 'no_solution', 'budget_exceeded' (see 'limit' : 'nodes', 'time' or 'memory') or 'cancelled'.
+    When the search stopped early, 'partial' is the path to the most promising node expanded so far :
+    the one with the lowest heuristic (the deepest one on ties), or the deepest one for uninformed searches.
+    """
+
+    status: str
+    solution: Any = None
+    partial: Any = None
+    limit: Optional[str] = None
+    stats: SearchStats = field(default_factory=SearchStats)
+
+    @property
+    def stopped_early(self) -> bool:
+        return self.status in ('budget_exceeded', 'cancelled')
@@ -0,0 +1,145 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+import numpy as np
+from lle import World
+from src.benchmark import ALGORITHMS, PROBLEMS
+from src.problem import CompiledWorld, DistanceTable, SearchProblem, TableSource
+from src.search import Solution
+from src.stats import SearchStats
+
+
+Position = tuple[int, int]
+
+
+class DiskCache:
+
+    """
+    Persistent, content-addressed cache of preprocessed problems and solved maps.
+
+    Entries are keyed by a hash of the map text and the problem type (see `key`). Distance fields are stored as
+    .npy files and memory-mapped when loaded, solutions as action strings (Solution.to_text) in an SQLite database,
+    which also records the size and last use of every entry. Once the cache holds more than 'max_bytes',
+    the least recently used entries are evicted.
+
+    A DiskCache can be shared between threads.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024) -> None:
+
+        os.makedirs(directory, exist_ok=True)
+        self.directory: str = directory
+        self.max_bytes: int = max_bytes
+        self.lock: threading.RLock = threading.RLock()
+        self.db: sqlite3.Connection = sqlite3.connect(os.path.join(directory, 'cache.sqlite'), check_same_thread=False)
+        with self.db:
+            self.db.execute('CREATE TABLE IF NOT EXISTS entries (name TEXT PRIMARY KEY, size INTEGER NOT NULL, last_used REAL NOT NULL)')
+            self.db.execute('CREATE TABLE IF NOT EXISTS solutions (name TEXT PRIMARY KEY, actions TEXT)')
+
+    @staticmethod
+    def key(map_text: str, problem: str) -> str:
+        # Hash of the problem type and of the map text, ignoring blank lines and the indentation of the rows.
+        rows: list[str] = [' '.join(row.split()) for row in map_text.strip().splitlines() if row.strip()]
+        return hashlib.sha256('\n'.join([problem, *rows]).encode()).hexdigest()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def tables(self, key: str) -> "CachedTables":
+        return CachedTables(cache=self, key=key)
+
+    def problem(self, map_text: str, problem: str, compiled: bool = False) -> SearchProblem:
+        # A new problem of the map whose distance tables are read from (or written to) the cache.
+        return PROBLEMS[problem](world=World(map_text), compiled=compiled, tables=self.tables(key=self.key(map_text=map_text, problem=problem)))
+
+    def load_array(self, name: str) -> Optional[np.ndarray]:
+        with self.lock:
+            if not os.path.exists(self.path(name=name)): return None
+            self.touch(name=name)
+            return np.asarray(np.load(self.path(name=name), mmap_mode='r'))
+
+    def save_array(self, name: str, array: np.ndarray) -> None:
+        with self.lock:
+            np.save(self.path(name=name), array)
+            self.record(name=name, size=os.path.getsize(self.path(name=name)))
+
+    def get_solution(self, key: str, algorithm: str) -> tuple[bool, Optional[str]]:
+        # (hit, actions) : actions is None for a map known to have no solution.
+        with self.lock:
+            name: str = f'{key}-{algorithm}.solution'
+            row: Optional[tuple] = self.db.execute('SELECT actions FROM solutions WHERE name = ?', (name,)).fetchone()
+            if row is None: return False, None
+            self.touch(name=name)
+            return True, row[0]
+
+    def put_solution(self, key: str, algorithm: str, actions: Optional[str]) -> None:
+        with self.lock:
+            name: str = f'{key}-{algorithm}.solution'
+            with self.db: self.db.execute('INSERT OR REPLACE INTO solutions VALUES (?, ?)', (name, actions))
+            self.record(name=name, size=len(name) + len(actions or ''))
+
+    def solve(self, map_text: str, problem: str, algorithm: str = 'astar', compiled: bool = False) -> Optional[Solution]:
+
+        # Solves the map with one of the benchmark ALGORITHMS. A warm solve neither builds distance tables nor searches :
+        # the stored actions are replayed lazily on a problem built from the cached tables.
+        key: str = self.key(map_text=map_text, problem=problem)
+        instance: SearchProblem = self.problem(map_text=map_text, problem=problem, compiled=compiled)
+        hit, actions = self.get_solution(key=key, algorithm=algorithm)
+        if hit: return None if actions is None else Solution.from_text(text=actions, problem=instance)
+
+        solution: Optional[Solution] = ALGORITHMS[algorithm](instance, SearchStats())
+        self.put_solution(key=key, algorithm=algorithm, actions=None if solution is None else solution.to_text())
+        return solution
+
+    def touch(self, name: str) -> None:
+        with self.lock, self.db:
+            self.db.execute('UPDATE entries SET last_used = ? WHERE name = ?', (time.time(), name))
+
+    def record(self, name: str, size: int) -> None:
+        with self.lock:
+            with self.db: self.db.execute('INSERT OR REPLACE INTO entries VALUES (?, ?, ?)', (name, size, time.time()))
+            self.evict()
+
+    def size(self) -> int:
+        with self.lock:
+            return self.db.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+
+    def evict(self) -> None:
+
+        # Removes the least recently used entries until the cache fits in max_bytes.
+        with self.lock:
+            total: int = self.size()
+            if total <= self.max_bytes: return
+            for name, size in self.db.execute('SELECT name, size FROM entries ORDER BY last_used').fetchall():
+                if total <= self.max_bytes: break
+                with self.db:
+                    self.db.execute('DELETE FROM entries WHERE name = ?', (name,))
+                    self.db.execute('DELETE FROM solutions WHERE name = ?', (name,))
+                if name.endswith('.npy') and os.path.exists(self.path(name=name)): os.remove(self.path(name=name))
+                total -= size
+
+    def close(self) -> None:
+        with self.lock:
+            self.db.close()
+
+
+class CachedTables(TableSource):
+
+    # The distance tables of one cache key : loaded from '<key>-<name>.npy' when present, computed and saved otherwise.
+
+    def __init__(self, cache: DiskCache, key: str) -> None:
+        self.cache: DiskCache = cache
+        self.key: str = key
+
+    def table(self, name: str, compiled_world: CompiledWorld, targets: list[Position]) -> DistanceTable:
+        filename: str = f'{self.key}-{name}.npy'
+        distances: Optional[np.ndarray] = self.cache.load_array(name=filename)
+        if distances is not None and distances.shape[0] == len(targets):
+            return DistanceTable(compiled_world=compiled_world, targets=targets, distances=distances)
+
+        table: DistanceTable = DistanceTable(compiled_world=compiled_world, targets=targets)
+        if targets: self.cache.save_array(name=filename, array=table.distances)
+        return table
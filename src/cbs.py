@@ -0,0 +1,350 @@
+import math
+import time
+from dataclasses import dataclass, replace
+from typing import Iterator, Optional
+from lle import Action
+from src.budget import BudgetClock, SearchBudget, SearchResult
+from src.priority_queue import PriorityQueue
+from src.problem import CompiledWorld, DistanceTable, MultiAgentExitProblem
+from src.problem.compiled_world import Position
+from src.search import Solution, astar
+from src.stats import SearchStats
+
+
+# Stay first, then the movements : on ties, the low level prefers to wait.
+MOVES: list[Action] = [Action.STAY, Action.NORTH, Action.SOUTH, Action.EAST, Action.WEST]
+
+SpaceTimeState = tuple[Position, int]
+
+# Heuristic penalty of the low level states that conflict with the paths of the other agents (below one, see SpaceTimeProblem).
+CONFLICT_PENALTY: float = 0.5
+
+# Limits of cbs() when no budget is given : the high level may not terminate on some unsolvable problems.
+DEFAULT_BUDGET: SearchBudget = SearchBudget(max_nodes=10_000, max_time=60.0)
+
+
+@dataclass(frozen=True)
+class Constraints:
+
+    # Constraints of one agent : (cell, time) pairs it must not occupy, (cell, time) pairs it must not occupy from
+    # that time on (an exit taken by another agent), (time, cells) pairs where it must stand on one of the cells
+    # (e.g. upstream of a laser it has to block), and sets of cells one of which it must end on (to block a laser for good).
+    forbidden: frozenset[tuple[Position, int]] = frozenset()
+    forbidden_from: frozenset[tuple[Position, int]] = frozenset()
+    required: frozenset[tuple[int, frozenset[Position]]] = frozenset()
+    required_end: frozenset[frozenset[Position]] = frozenset()
+
+    def forbid(self, pos: Position, t: int) -> "Constraints":
+        return replace(self, forbidden=self.forbidden | {(pos, t)})
+
+    def forbid_from(self, pos: Position, t: int) -> "Constraints":
+        return replace(self, forbidden_from=self.forbidden_from | {(pos, t)})
+
+    def require(self, cells: frozenset[Position], t: int) -> "Constraints":
+        return replace(self, required=self.required | {(t, cells)})
+
+    def require_end(self, cells: frozenset[Position]) -> "Constraints":
+        return replace(self, required_end=self.required_end | {cells})
+
+    @property
+    def last_time(self) -> int:
+        return max([t for _, t in self.forbidden | self.forbidden_from] + [t for t, _ in self.required], default=0)
+
+
+class SpaceTimeProblem:
+
+    """
+    Low level of CBS : one agent walking under its Constraints, on (position, time) states. It has the interface
+    of a SearchProblem used by the searches of src/search.py (initial_state, get_successors, is_goal_state, heuristic).
+
+    The agent walks on the relaxed world of its colour (see CompiledWorld.relaxed_for) : whether it survives on
+    the beams of other colours is checked by the high level. Entering an exit ends the path, as LLE agents cannot
+    leave an exit, so an exit is only a goal when no constraint applies to it afterwards. After the last constraint
+    nothing changes any more, hence the states are bounded by that time plus the number of cells.
+
+    Among the cheapest paths, the search prefers the ones that do not conflict with the current paths of the other
+    agents ('others') : the heuristic of such a state gets a penalty below one, which keeps the paths optimal as costs are integers.
+    """
+
+    def __init__(self, world: CompiledWorld, start: Position, distances: DistanceTable, constraints: Constraints,
+                 others: Optional[list[list[Position]]] = None) -> None:
+
+        self.world: CompiledWorld = world
+        self.distances: DistanceTable = distances
+        self.occupied: set[tuple[Position, int]] = {(pos, t) for path in others or () for t, pos in enumerate(path)}
+        self.arrivals: dict[Position, int] = {path[-1]: len(path) - 1 for path in others or () if path[-1] in world.exits}
+        self.forbidden: frozenset[tuple[Position, int]] = constraints.forbidden
+        self.forbidden_from: dict[Position, int] = dict()
+        for pos, t in constraints.forbidden_from: self.forbidden_from[pos] = min(self.forbidden_from.get(pos, t), t)
+        self.initial_state: SpaceTimeState = (start, 0)
+        self.horizon: int = constraints.last_time + world.height * world.width
+
+        # Cells allowed at each constrained time, and last time each exit is constrained (arriving earlier breaks it).
+        self.required: dict[int, frozenset[Position]] = dict()
+        self.busy_until: dict[Position, float] = dict()
+        for t, cells in constraints.required:
+            self.required[t] = self.required.get(t, cells) & cells
+            for e in world.exits - cells: self.busy_until[e] = max(self.busy_until.get(e, -1), t)
+        for pos, t in constraints.forbidden:
+            if pos in world.exits: self.busy_until[pos] = max(self.busy_until.get(pos, -1), t)
+        for pos, t in constraints.forbidden_from:
+            if pos in world.exits: self.busy_until[pos] = math.inf
+        for cells in constraints.required_end:
+            for e in world.exits - cells: self.busy_until[e] = math.inf
+
+    def allows(self, pos: Position, t: int) -> bool:
+        cells: Optional[frozenset[Position]] = self.required.get(t)
+        return (pos, t) not in self.forbidden and t < self.forbidden_from.get(pos, t + 1) and (cells is None or pos in cells)
+
+    def get_successors(self, state: SpaceTimeState) -> list[tuple[SpaceTimeState, Action]]:
+
+        pos, t = state
+        if pos in self.world.exits or t >= self.horizon: return list()
+
+        ret: list[tuple[SpaceTimeState, Action]] = list()
+        for a in MOVES:
+            dr, dc = a.delta
+            p: Position = (pos[0] + dr, pos[1] + dc)
+            if self.world.is_safe(pos=p) and self.allows(pos=p, t=t + 1): ret.append(((p, t + 1), a))
+        return ret
+
+    def is_goal_state(self, state: SpaceTimeState) -> bool:
+        pos, t = state
+        return pos in self.world.exits and t > self.busy_until.get(pos, -1)
+
+    def heuristic(self, problem_state: SpaceTimeState) -> float:
+        pos, t = problem_state
+        return self.distances.to_nearest(pos=pos) + CONFLICT_PENALTY * self.conflicts_with_others(pos=pos, t=t)
+
+    def conflicts_with_others(self, pos: Position, t: int) -> bool:
+        # Whether standing on 'pos' at time t clashes with another agent (same cell, cell left at t - 1, or exit taken).
+        return (pos, t) in self.occupied or (pos, t - 1) in self.occupied or t >= self.arrivals.get(pos, t + 1)
+
+
+@dataclass
+class Conflict:
+
+    # 'agent' and 'other' cannot both keep their paths : 'vertex' (same cell at time t), 'exit' (the same, on the exit
+    # where 'agent' has arrived : it stays there, so 'other' is kept off it from time t on), 'follow' ('agent' enters at
+    # time t the cell 'other' was on at t - 1, which LLE forbids, swaps included), 'laser' ('agent' stands at time t on
+    # a beam of colour 'other' that 'other' does not block, i.e. it is not on one of the 'upstream' cells) or 'beam_exit'
+    # (the same, on the exit where 'agent' has arrived while 'other' does not end upstream : arrived agents still die
+    # on beams, so either 'agent' never takes that exit or 'other' blocks the beam for good).
+    kind: str
+    agent: int
+    other: int
+    pos: Position
+    t: int
+    upstream: frozenset[Position] = frozenset()
+
+    def resolutions(self) -> list[tuple[int, str, object, int]]:
+        # One (agent, 'forbid', 'forbid_from', 'require' or 'require_end', cell or cells, time) constraint per child of the high level node.
+        if self.kind == 'exit': return [(self.agent, 'forbid', self.pos, self.t), (self.other, 'forbid_from', self.pos, self.t)]
+        if self.kind == 'vertex': return [(self.agent, 'forbid', self.pos, self.t), (self.other, 'forbid', self.pos, self.t)]
+        if self.kind == 'follow': return [(self.agent, 'forbid', self.pos, self.t), (self.other, 'forbid', self.pos, self.t - 1)]
+        if self.kind == 'beam_exit': return [(self.agent, 'forbid_from', self.pos, 0), (self.other, 'require_end', self.upstream, self.t)]
+        return [(self.agent, 'forbid', self.pos, self.t), (self.other, 'require', self.upstream, self.t)]
+
+
+def assignable(options: list[frozenset[Position]]) -> bool:
+
+    # Whether every agent can get an exit of its own among its 'options', by augmenting paths.
+    owners: dict[Position, int] = dict()
+
+    def assign(agent: int, visited: set[Position]) -> bool:
+        for e in options[agent]:
+            if e in visited: continue
+            visited.add(e)
+            if e not in owners or assign(agent=owners[e], visited=visited):
+                owners[e] = agent
+                return True
+        return False
+
+    return all(assign(agent=i, visited=set()) for i in range(len(options)))
+
+
+@dataclass
+class CBSNode:
+
+    # A node of the high level : the constraints of each agent, its paths (cell at each time) and plans (actions),
+    # their total cost, the first of their conflicts and the number of conflicts.
+    constraints: list[Constraints]
+    paths: list[list[Position]]
+    plans: list[list[Action]]
+    cost: int = 0
+    conflict: Optional[Conflict] = None
+    n_conflicts: int = 0
+
+    @property
+    def priority(self) -> float:
+        # Cheapest first, then the fewest conflicts.
+        return self.cost + self.n_conflicts / (self.n_conflicts + 1)
+
+
+class ConflictBasedSearch:
+
+    """
+    Conflict-Based Search for a MultiAgentExitProblem, optimal for its cost (sum over the agents of the number of
+    steps before they arrive). The low level plans each agent alone with the A* of src/search.py (see SpaceTimeProblem),
+    the high level explores, cheapest first, a tree of constraint sets : each node replans the paths of its constraints
+    and, on the first conflict between two paths, branches on the two ways of resolving it. Ties go to the nodes
+    with the fewest conflicts, and each agent avoids the paths of the others when it can at no cost.
+
+    Each agent only ends on the exits it can hold in some assignment of one exit per agent (see exits_for) : without it,
+    exits on beams and exits wanted by too many agents make the tree branch on every time step they could be taken at.
+    """
+
+    def __init__(self, problem: MultiAgentExitProblem) -> None:
+
+        self.problem: MultiAgentExitProblem = problem
+        self.n_agents: int = problem.n_agents
+        self.starts: list[Position] = list(problem.initial_state.agents_positions)
+
+        # For every beam cell : (colour, cells upstream of it) for each beam going through it.
+        self.beams_at: dict[Position, list[tuple[int, frozenset[Position]]]] = dict()
+        for colour, cells in problem.compiled_world.beams:
+            for k, cell in enumerate(cells):
+                self.beams_at.setdefault(cell, list()).append((colour, frozenset(cells[:k])))
+
+        # Exits each agent can end on : reachable on its relaxed world, and off the beams of the other colours unless
+        # an exit upstream lets that colour block the beam for good (agents on an exit still die when a beam reaches them).
+        exits: list[Position] = problem.compiled_world.exit_list
+        self.exits_for: list[frozenset[Position]] = [
+            frozenset(e for k, e in enumerate(exits) if problem.agent_exit_distances[i].to(idx=k, pos=self.starts[i]) < math.inf
+                      and all(colour == i or upstream & problem.compiled_world.exits for colour, upstream in self.beams_at.get(e, ())))
+            for i in range(self.n_agents)
+        ]
+        # An exit holds a single agent : only keep the exits that leave one to each other agent.
+        self.exits_for = [frozenset(e for e in self.exits_for[i] if assignable(self.exits_for[:i] + [frozenset({e})] + self.exits_for[i + 1:]))
+                          for i in range(self.n_agents)]
+        self.distances: list[DistanceTable] = [self.distances_to(agent=i, targets=self.exits_for[i]) for i in range(self.n_agents)]
+
+    def distances_to(self, agent: int, targets: frozenset[Position]) -> DistanceTable:
+        # The exit distances of 'agent' restricted to 'targets' (the distance fields are shared, not recomputed).
+        table: DistanceTable = self.problem.agent_exit_distances[agent]
+        kept: list[int] = [k for k, e in enumerate(table.targets) if e in targets]
+        return DistanceTable(compiled_world=self.problem.agent_worlds[agent], targets=[table.targets[k] for k in kept],
+                             distances=table.distances[kept])
+
+    def plan(self, agent: int, constraints: Constraints, paths: list[list[Position]]) -> Optional[tuple[list[Position], list[Action]]]:
+
+        # Cheapest path of one agent under its constraints, as (cell at each time, actions), avoiding the other 'paths' on ties.
+        others: list[list[Position]] = [path for i, path in enumerate(paths) if i != agent]
+        low_level: SpaceTimeProblem = SpaceTimeProblem(world=self.problem.agent_worlds[agent], start=self.starts[agent],
+                                                       distances=self.distances[agent], constraints=constraints, others=others)
+        if not low_level.allows(pos=self.starts[agent], t=0): return None
+        solution: Optional[Solution] = astar(problem=low_level)
+        if solution is None: return None
+        return [self.starts[agent]] + [pos for pos, _ in solution.states], solution.actions
+
+    def conflicts(self, paths: list[list[Position]]) -> Iterator[Conflict]:
+
+        # Every conflict between the paths, earliest first. Agents stay on their exit once arrived, so the last time step
+        # covers every later one.
+        exits: frozenset[Position] = self.problem.compiled_world.exits
+
+        def at(agent: int, t: int) -> Position:
+            return paths[agent][min(t, len(paths[agent]) - 1)]
+
+        previous: dict[Position, int] = dict()
+        for t in range(max(len(path) for path in paths)):
+
+            positions: list[Position] = [at(agent=i, t=t) for i in range(self.n_agents)]
+            seen: dict[Position, int] = dict()
+            for i, pos in enumerate(positions):
+                j: Optional[int] = seen.setdefault(pos, i)
+                if j == i: continue
+                if pos not in exits: yield Conflict(kind='vertex', agent=j, other=i, pos=pos, t=t); continue
+                arrived, other = (j, i) if len(paths[j]) <= len(paths[i]) else (i, j)
+                yield Conflict(kind='exit', agent=arrived, other=other, pos=pos, t=t)
+
+            for i, pos in enumerate(positions):
+                j = previous.get(pos)
+                if j is not None and j != i: yield Conflict(kind='follow', agent=i, other=j, pos=pos, t=t)
+
+            for i, pos in enumerate(positions):
+                for colour, upstream in self.beams_at.get(pos, ()):
+                    if colour != i and positions[colour] not in upstream:
+                        arrived: bool = t >= len(paths[i]) - 1 and paths[colour][-1] not in upstream
+                        yield Conflict(kind='beam_exit' if arrived else 'laser', agent=i, other=colour, pos=pos, t=t, upstream=upstream)
+
+            previous = {pos: i for i, pos in enumerate(positions)}
+
+    def moves(self, plans: list[list[Action]]) -> list[Action]:
+        # The moves of the plans in the order of the operator decomposition of MultiAgentProblem : one per agent that
+        # has not arrived yet at each time step.
+        return [plan[t] for t in range(max(len(plan) for plan in plans)) for plan in plans if t < len(plan)]
+
+    def evaluate(self, node: CBSNode) -> CBSNode:
+        node.cost = sum(len(plan) for plan in node.plans)
+        conflicts: Iterator[Conflict] = self.conflicts(paths=node.paths)
+        node.conflict = next(conflicts, None)
+        node.n_conflicts = 0 if node.conflict is None else 1 + sum(1 for _ in conflicts)
+        return node
+
+    def solve(self, budget: Optional[SearchBudget] = None, verbose: bool = False, stats: Optional[SearchStats] = None) -> SearchResult:
+
+        # A SearchResult : 'solved', 'no_solution' (the agents cannot all reach an exit), or 'budget_exceeded'
+        # when the budget (on high level nodes) ran out first.
+        stats = stats or SearchStats()
+        started: float = time.perf_counter()
+        clock: BudgetClock = (budget or SearchBudget()).start()
+
+        def finish(status: str, node: Optional[CBSNode] = None, limit: Optional[str] = None) -> SearchResult:
+            solution: Optional[Solution] = None if node is None else Solution(actions=self.moves(plans=node.plans), problem=self.problem)
+            stats.solution_depth = None if solution is None else solution.n_steps
+            stats.time_total += time.perf_counter() - started
+            if verbose: print(f'[v] CBS : {status}, cost {None if node is None else node.cost}, high level nodes expanded {stats.nodes_expanded}')
+            return SearchResult(status=status, solution=solution, limit=limit, stats=stats)
+
+        if not all(self.exits_for): return finish(status='no_solution')
+        root: CBSNode = CBSNode(constraints=[Constraints(required_end=frozenset({exits})) for exits in self.exits_for],
+                                paths=list(), plans=list())
+        for agent in range(self.n_agents):
+            planned = self.plan(agent=agent, constraints=root.constraints[agent], paths=root.paths)
+            if planned is None: return finish(status='no_solution')
+            root.paths.append(planned[0])
+            root.plans.append(planned[1])
+
+        queue: PriorityQueue[CBSNode] = PriorityQueue()
+        queue.push(item=self.evaluate(node=root), priority=root.priority)
+
+        while not queue.is_empty():
+
+            node: CBSNode = queue.pop()
+            if node.conflict is None: return finish(status='solved', node=node)
+
+            limit: Optional[str] = clock.exceeded(expanded=stats.nodes_expanded)
+            if limit is not None: return finish(status='budget_exceeded', limit=limit)
+            stats.nodes_expanded += 1
+
+            for agent, kind, where, t in node.conflict.resolutions():
+
+                constraints: list[Constraints] = list(node.constraints)
+                if kind == 'forbid': constraints[agent] = constraints[agent].forbid(pos=where, t=t)
+                elif kind == 'forbid_from': constraints[agent] = constraints[agent].forbid_from(pos=where, t=t)
+                elif kind == 'require_end': constraints[agent] = constraints[agent].require_end(cells=where)
+                else: constraints[agent] = constraints[agent].require(cells=where, t=t)
+
+                planned = self.plan(agent=agent, constraints=constraints[agent], paths=node.paths)
+                if planned is None: continue
+
+                child: CBSNode = CBSNode(constraints=constraints, paths=list(node.paths), plans=list(node.plans))
+                child.paths[agent], child.plans[agent] = planned
+                queue.push(item=self.evaluate(node=child), priority=child.priority)
+                stats.nodes_generated += 1
+
+        return finish(status='no_solution')
+
+
+def cbs(problem: MultiAgentExitProblem, budget: Optional[SearchBudget] = None, verbose: bool = False,
+        stats: Optional[SearchStats] = None) -> SearchResult:
+
+    # Conflict-Based Search : a SearchResult whose solution is optimal, in the move order of the operator decomposition
+    # of the problem. The search stops with 'budget_exceeded' once DEFAULT_BUDGET (unless another budget is given) runs out.
+    # 'stats' counts the high level nodes.
+    # Checked by capability rather than class : the problem module is also imported without the 'src.' prefix.
+    if not hasattr(problem, 'agent_exit_distances') or hasattr(problem, 'agent_gem_distances'):
+        raise TypeError(f'[E] CBS only solves multi-agent exit problems (per-agent exit distances, no gems to collect), '
+                        f'not {type(problem).__name__}.')
+    return ConflictBasedSearch(problem=problem).solve(budget=budget or DEFAULT_BUDGET, verbose=verbose, stats=stats)
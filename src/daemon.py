@@ -0,0 +1,225 @@
+import io
+import itertools
+import json
+import multiprocessing
+import os
+import socketserver
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, TextIO
+from lle import World
+from src.benchmark import PROBLEMS
+from src.budget import SearchBudget, SearchResult
+from src.cache import DiskCache
+from src.problem import SearchProblem
+from src.search import SEARCH_SETTINGS, iter_search
+from src.stats import SearchStats
+
+
+class ProblemCache:
+
+    """
+    In-memory LRU of ready-to-search problems (parsed World, compiled world and distance tables), keyed by
+    the map hash of DiskCache.key and the compiled flag. With a DiskCache, the distance tables of a problem
+    that is not in memory are read from disk instead of being computed.
+    """
+
+    def __init__(self, capacity: int = 64, disk: Optional[DiskCache] = None) -> None:
+        assert capacity > 0, '[E] The capacity of the cache must be positive.'
+        self.capacity: int = capacity
+        self.disk: Optional[DiskCache] = disk
+        self.problems: OrderedDict[tuple[str, bool], SearchProblem] = OrderedDict()
+
+    def get(self, map_text: str, problem: str, compiled: bool = True) -> tuple[SearchProblem, bool]:
+
+        # (problem, hit) : the cached problem of the map, built (and maybe evicting the least recently used one) on a miss.
+        assert problem in PROBLEMS, f'[E] Unknown problem : {problem}.'
+        key: tuple[str, bool] = (DiskCache.key(map_text=map_text, problem=problem), compiled)
+        if key in self.problems:
+            self.problems.move_to_end(key)
+            return self.problems[key], True
+
+        if self.disk is not None: instance: SearchProblem = self.disk.problem(map_text=map_text, problem=problem, compiled=compiled)
+        else: instance = PROBLEMS[problem](world=World(map_text), compiled=compiled)
+        self.problems[key] = instance
+        if len(self.problems) > self.capacity: self.problems.popitem(last=False)
+        return instance, False
+
+
+def solve_request(cache: ProblemCache, request: dict) -> dict:
+
+    """
+    Answers one solve request with a problem of the cache. The request holds the 'map' text, and optionally
+    'problem' ('exit'), 'algorithm' (one of SEARCH_SETTINGS, 'astar'), 'compiled' (true), 'packed' (false) and
+    the limits 'max_nodes', 'max_time' and 'max_memory'. Errors end up in the response.
+    """
+
+    response: dict = {'id': request.get('id')}
+    try:
+        algorithm: str = request.get('algorithm', 'astar')
+        assert algorithm in SEARCH_SETTINGS, f'[E] Unknown algorithm : {algorithm}.'
+        assert isinstance(request.get('map'), str), '[E] A solve request needs a map.'
+        problem, hit = cache.get(map_text=request['map'], problem=request.get('problem', 'exit'), compiled=request.get('compiled', True))
+        budget: SearchBudget = SearchBudget(max_nodes=request.get('max_nodes'), max_memory=request.get('max_memory'), max_time=request.get('max_time'))
+        stats: SearchStats = SearchStats()
+        start: float = time.perf_counter()
+        result: SearchResult = iter_search(problem=problem, algorithm=algorithm, budget=budget, packed=request.get('packed', False), stats=stats).run()
+        elapsed: float = time.perf_counter() - start
+    except Exception as e:
+        response['error'] = repr(e)
+        return response
+
+    response['status'] = result.status
+    if result.limit is not None: response['limit'] = result.limit
+    response['actions'] = None if result.solution is None else [a.name for a in result.solution.actions]
+    response['steps'] = None if result.solution is None else result.solution.n_steps
+    if result.partial is not None: response['partial'] = [a.name for a in result.partial.actions]
+    response['nodes_expanded'] = stats.nodes_expanded
+    response['time'] = elapsed
+    response['cached'] = hit
+    return response
+
+
+def worker_loop(index: int, requests: multiprocessing.Queue, responses: multiprocessing.Queue, capacity: int,
+                cache_dir: Optional[str]) -> None:
+
+    # Worker process : answers (ticket, request) pairs with its own warm cache until it receives None.
+    cache: ProblemCache = ProblemCache(capacity=capacity, disk=None if cache_dir is None else DiskCache(directory=cache_dir))
+    while (item := requests.get()) is not None:
+        ticket, request = item
+        response: dict = solve_request(cache=cache, request=request)
+        response['worker'] = index
+        responses.put((ticket, response))
+
+
+class Session:
+
+    # One client stream : every response is written as one JSON line, in completion order (responses carry the request id).
+
+    def __init__(self, output: TextIO) -> None:
+        self.output: TextIO = output
+        self.condition: threading.Condition = threading.Condition()
+        self.pending: int = 0
+
+    def send(self, response: dict, done: bool = False) -> None:
+        with self.condition:
+            self.output.write(json.dumps(response) + '\n')
+            self.output.flush()
+            if done:
+                self.pending -= 1
+                self.condition.notify_all()
+
+    def wait(self) -> None:
+        with self.condition:
+            self.condition.wait_for(lambda: self.pending == 0)
+
+
+class SolverDaemon:
+
+    """
+    Long-running solver : a pool of worker processes, each keeping a ProblemCache, answers JSON-lines solve requests
+    (see solve_request) so that a warm request only pays for the search itself. A request is always sent to the
+    same worker for the same map, whose cache thus already holds the problem.
+
+    Besides solve requests, {"op": "ping"} is answered right away and {"op": "shutdown"} ends the session.
+    """
+
+    def __init__(self, workers: Optional[int] = None, capacity: int = 64, cache_dir: Optional[str] = None) -> None:
+
+        self.n_workers: int = workers or os.cpu_count() or 1
+        self.responses: multiprocessing.Queue = multiprocessing.Queue()
+        self.queues: list[multiprocessing.Queue] = [multiprocessing.Queue() for _ in range(self.n_workers)]
+        self.processes: list[multiprocessing.Process] = [
+            multiprocessing.Process(target=worker_loop, args=(i, q, self.responses, capacity, cache_dir), daemon=True)
+            for i, q in enumerate(self.queues)
+        ]
+        self.sessions: dict[int, Session] = dict()
+        self.tickets: itertools.count = itertools.count()
+        self.lock: threading.Lock = threading.Lock()
+        self.collector: threading.Thread = threading.Thread(target=self.collect, daemon=True)
+
+    def __enter__(self) -> "SolverDaemon":
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def start(self) -> "SolverDaemon":
+        for process in self.processes: process.start()
+        self.collector.start()
+        return self
+
+    def submit(self, request: dict, session: Session) -> None:
+
+        # Reads the map file of a 'path' request, then routes the request to the worker of its map.
+        if 'map' not in request and 'path' in request:
+            with open(request['path'], 'r') as f:
+                request = {**request, 'map': f.read()}
+        assert isinstance(request.get('map'), str), '[E] A solve request needs a map or a path.'
+
+        worker: int = int(DiskCache.key(map_text=request['map'], problem=request.get('problem', 'exit'))[:8], 16) % self.n_workers
+        with self.lock:
+            ticket: int = next(self.tickets)
+            self.sessions[ticket] = session
+        with session.condition: session.pending += 1
+        self.queues[worker].put((ticket, request))
+
+    def collect(self) -> None:
+        # Collector thread : hands every response over to the session of its request.
+        while (item := self.responses.get()) is not None:
+            ticket, response = item
+            with self.lock: session: Session = self.sessions.pop(ticket)
+            session.send(response=response, done=True)
+
+    def serve(self, input: TextIO, output: TextIO) -> bool:
+
+        # Answers the requests of one stream until its end or a shutdown request, then waits for its pending responses.
+        # Returns whether a shutdown was requested.
+        session: Session = Session(output=output)
+        shutdown: bool = False
+
+        for line in input:
+            if not line.strip(): continue
+            request: dict = dict()
+            try:
+                request = json.loads(line)
+                assert isinstance(request, dict), '[E] A request must be a JSON object.'
+                op: str = request.get('op', 'solve')
+                if op == 'shutdown':
+                    shutdown = True
+                    break
+                if op == 'ping': session.send(response={'id': request.get('id'), 'ok': True})
+                elif op == 'solve': self.submit(request=request, session=session)
+                else: raise AssertionError(f'[E] Unknown operation : {op}.')
+            except Exception as e:
+                session.send(response={'id': request.get('id'), 'error': repr(e)})
+
+        session.wait()
+        return shutdown
+
+    def serve_unix(self, path: str) -> None:
+
+        # Serves every client connecting to the Unix socket 'path' (one thread per connection) until one asks for a shutdown.
+        daemon: SolverDaemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                reader: io.TextIOWrapper = io.TextIOWrapper(self.rfile, encoding='utf-8')
+                writer: io.TextIOWrapper = io.TextIOWrapper(self.wfile, encoding='utf-8', write_through=True)
+                shutdown: bool = daemon.serve(input=reader, output=writer)
+                reader.detach(), writer.detach()  # The handler closes the socket streams itself
+                if shutdown: threading.Thread(target=self.server.shutdown).start()
+
+        if os.path.exists(path): os.remove(path)
+        with socketserver.ThreadingUnixStreamServer(path, Handler) as server:
+            server.daemon_threads = True
+            server.serve_forever()
+        os.remove(path)
+
+    def close(self) -> None:
+        for q in self.queues: q.put(None)
+        for process in self.processes: process.join()
+        self.responses.put(None)
+        self.collector.join()
+
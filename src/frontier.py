@@ -0,0 +1,225 @@
+import heapq
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Callable, Generic, TypeVar
+from src.node_store import NodeStore
+from src.priority_queue import BucketQueue, IndexedPriorityQueue
+
+
+T = TypeVar("T")
+
+
+class Frontier(ABC, Generic[T]):
+
+    """
+    The open list of a search. Nodes are pushed with a priority, which a frontier is free to ignore
+    (stack and FIFO queue), and tie-breaking between equal priorities is a property of the frontier.
+
+    Nodes are SearchNode-like objects (with `.state` and `.cost`), or indices in a NodeStore once `bind` was called.
+    """
+
+    def bind(self, store: NodeStore) -> None:
+        """Called by best_first_search before the first push : nodes are then indices in 'store'"""
+
+    @abstractmethod
+    def push(self, node: T, priority: float) -> None:
+        """Adds a node to the frontier"""
+
+    @abstractmethod
+    def pop(self) -> T:
+        """Removes and returns the next node to expand"""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of nodes waiting in the frontier"""
+
+
+class StackFrontier(Frontier[T]):
+
+    # Last in, first out : depth-first order, priorities are ignored.
+
+    def __init__(self) -> None:
+        self.stack: list[T] = []
+
+    def push(self, node: T, priority: float) -> None:
+        self.stack.append(node)
+
+    def pop(self) -> T:
+        return self.stack.pop()
+
+    def __len__(self) -> int:
+        return len(self.stack)
+
+
+class QueueFrontier(Frontier[T]):
+
+    # First in, first out : breadth-first order, priorities are ignored.
+
+    def __init__(self) -> None:
+        self.queue: deque[T] = deque()
+
+    def push(self, node: T, priority: float) -> None:
+        self.queue.append(node)
+
+    def pop(self) -> T:
+        return self.queue.popleft()
+
+    def __len__(self) -> int:
+        return len(self.queue)
+
+
+class HeapFrontier(Frontier[T]):
+
+    """
+    Binary heap on the priorities. Ties are broken by 'tie_break' :
+    'fifo' / 'lifo' on insertion order, 'high_g' / 'low_g' on the node cost (then FIFO).
+    """
+
+    TIE_BREAKS: tuple[str, ...] = ('fifo', 'lifo', 'high_g', 'low_g')
+
+    def __init__(self, tie_break: str = 'fifo') -> None:
+        assert tie_break in self.TIE_BREAKS, f'[E] Unknown tie-breaking policy : {tie_break}.'
+        self.heap: list[tuple[float, float, int, T]] = []
+        self.tie_break: str = tie_break
+        self.g_of: Callable[[T], float] = lambda node: node.cost
+        self.count = 0
+
+    def bind(self, store: NodeStore) -> None:
+        self.g_of = store.costs.__getitem__
+
+    def push(self, node: T, priority: float) -> None:
+        if self.tie_break == 'high_g': tie = -self.g_of(node)
+        elif self.tie_break == 'low_g': tie = self.g_of(node)
+        else: tie = 0
+        order: int = -self.count if self.tie_break == 'lifo' else self.count
+        heapq.heappush(self.heap, (priority, tie, order, node))
+        self.count += 1
+
+    def pop(self) -> T:
+        return heapq.heappop(self.heap)[3]
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+
+class BucketFrontier(Frontier[T]):
+
+    # BucketQueue on integer priorities, see BucketQueue for the tie-breaking policies.
+
+    def __init__(self, tie_break: str = 'high_g', lifo: bool = False) -> None:
+        self.queue: BucketQueue[T] = BucketQueue(tie_break=tie_break, g_of=lambda node: node.cost, lifo=lifo)
+
+    def bind(self, store: NodeStore) -> None:
+        self.queue.g_of = store.costs.__getitem__
+
+    def push(self, node: T, priority: float) -> None:
+        self.queue.push(item=node, priority=priority)
+
+    def pop(self) -> T:
+        return self.queue.pop()
+
+    def __len__(self) -> int:
+        return len(self.queue)
+
+
+class IndexedFrontier(Frontier[T]):
+
+    """
+    Keeps at most one node per state : pushing a node for a state that is already queued replaces it
+    if its priority is lower (decrease-key on an IndexedPriorityQueue), and is ignored otherwise.
+    """
+
+    def __init__(self) -> None:
+        self.queue: IndexedPriorityQueue = IndexedPriorityQueue()
+        self.nodes: dict = {}
+        self.state_of: Callable[[T], object] = lambda node: node.state
+
+    def bind(self, store: NodeStore) -> None:
+        self.state_of = store.states.__getitem__
+
+    def push(self, node: T, priority: float) -> None:
+        state: object = self.state_of(node)
+        if state in self.queue and self.queue.priority(state) <= priority: return
+        self.nodes[state] = node
+        self.queue.update(item=state, priority=priority)
+
+    def pop(self) -> T:
+        return self.nodes.pop(self.queue.pop())
+
+    def __len__(self) -> int:
+        return len(self.queue)
+
+
+class ClosedSet(ABC, Generic[T]):
+
+    """
+    Duplicate detection of a search. `admit` is called with the state and path cost of each node when it is checked
+    (popped or generated, depending on the search) and tells whether the node must be kept, recording it if so.
+    """
+
+    @abstractmethod
+    def admit(self, state: T, cost: float) -> bool:
+        """Whether the node must be kept, recording it if so"""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of states recorded"""
+
+
+class StateSet(ClosedSet[T]):
+
+    # Each state is admitted once, whatever its cost (enough for uniform or depth-first orders).
+
+    def __init__(self) -> None:
+        self.states: set = set()
+
+    def admit(self, state: T, cost: float) -> bool:
+        if state in self.states: return False
+        self.states.add(state)
+        return True
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+
+class CostTable(ClosedSet[T]):
+
+    # A state is admitted again only through a strictly cheaper path (re-opening), as needed by A*.
+
+    def __init__(self) -> None:
+        self.costs: dict = {}
+
+    def admit(self, state: T, cost: float) -> bool:
+        known: float | None = self.costs.get(state)
+        if known is not None and known <= cost: return False
+        self.costs[state] = cost
+        return True
+
+    def __len__(self) -> int:
+        return len(self.costs)
+
+
+class NoClosedSet(ClosedSet[T]):
+
+    # Tree search : every node is admitted. Only safe on acyclic or bounded search spaces.
+
+    def admit(self, state: T, cost: float) -> bool:
+        return True
+
+    def __len__(self) -> int:
+        return 0
+
+
+FRONTIERS: dict = {
+    'stack': StackFrontier,
+    'deque': QueueFrontier,
+    'heap': HeapFrontier,
+    'bucket': BucketFrontier,
+    'indexed': IndexedFrontier
+}
+
+CLOSED_SETS: dict = {
+    'set': StateSet,
+    'cost': CostTable,
+    'none': NoClosedSet
+}
@@ -0,0 +1,70 @@
+import math
+import random
+from typing import Optional
+from lle import World
+from src.problem import CompiledWorld
+from src.problem.distance_table import walking_distances
+
+
+Position = tuple[int, int]
+LASER_DIRECTIONS: tuple[str, ...] = ('N', 'E', 'S', 'W')
+
+
+def generate_map(height: int, width: int, wall_density: float = 0.2, n_gems: int = 0, n_lasers: int = 0, n_exits: int = 1,
+                 seed: Optional[int] = None, max_attempts: int = 1000) -> str:
+
+    """
+    Generates a random single agent LLE map and returns it as a map string (the format World expects).
+
+    The same arguments always give the same map. The four corners are never walls, exits or laser sources, and layouts
+    are drawn until every gem, every exit and every corner can be reached from the start, so that every problem
+    (gem, exit and corner) has a solution on the map.
+    Lasers are of colour 0 (the only colour a single agent map allows) : their sources block the way, their beams do not.
+    Gems are never put on a beam.
+
+    Args:
+        wall_density: Probability for each of the remaining cells to be a wall.
+        max_attempts: Number of layouts tried before giving up with an AssertionError.
+    """
+
+    assert height > 0 and width > 0 and 0 <= wall_density < 1, '[E] Invalid map size or wall density.'
+    assert n_exits >= 1 and n_gems >= 0 and n_lasers >= 0, '[E] A map needs at least one exit.'
+    assert 1 + n_exits + n_gems + n_lasers <= height * width, '[E] Too many items for the size of the map.'
+
+    rng: random.Random = random.Random(seed)
+    for _ in range(max_attempts):
+        map_str: Optional[str] = draw_map(rng=rng, height=height, width=width, wall_density=wall_density,
+                                          n_gems=n_gems, n_lasers=n_lasers, n_exits=n_exits)
+        if map_str is not None: return map_str
+
+    raise AssertionError(f'[E] Could not generate a solvable {height}x{width} map in {max_attempts} attempts.')
+
+
+def draw_map(rng: random.Random, height: int, width: int, wall_density: float, n_gems: int, n_lasers: int, n_exits: int) -> Optional[str]:
+
+    # Draws one layout, or returns None when it does not meet the requirements of generate_map.
+    cells: list[Position] = [(r, c) for r in range(height) for c in range(width)]
+    corners: set[Position] = {(0, 0), (0, width - 1), (height - 1, 0), (height - 1, width - 1)}
+    grid: dict[Position, str] = {}
+    # Exits and laser sources are kept off the corners so that the corner problem can visit them all.
+    picked: list[Position] = rng.sample(cells, 1 + n_exits + n_gems + n_lasers)
+    start, exits = picked[0], picked[1:1 + n_exits]
+    gems, lasers = picked[1 + n_exits:1 + n_exits + n_gems], picked[1 + n_exits + n_gems:]
+    if any(p in corners for p in exits + lasers): return None
+
+    grid[start] = 'S0'
+    for e in exits: grid[e] = 'X'
+    for g in gems: grid[g] = 'G'
+    for p in lasers: grid[p] = f'L0{rng.choice(LASER_DIRECTIONS)}'
+    for p in cells:
+        if p not in grid and p not in corners and rng.random() < wall_density: grid[p] = '@'
+
+    rows: list[str] = [' '.join(grid.get((r, c), '.') for c in range(width)) for r in range(height)]
+    map_str: str = '\n'.join(rows)
+
+    compiled: CompiledWorld = CompiledWorld(world=World(map_str))
+    if any(g in compiled.beam_colours for g in gems): return None
+
+    targets: list[Position] = gems + exits + list(corners)
+    if any(math.isinf(walking_distances(compiled_world=compiled, target=t)[start]) for t in targets): return None
+    return map_str
@@ -0,0 +1,92 @@
+from array import array
+from typing import Optional
+from lle import Action
+
+
+class NodeStore:
+
+    """
+    Search nodes kept as parallel columns instead of one object per node : the state, the index of the parent node
+    (-1 for the root), the code of the action that led to it (its `.value`, -1 for the root) and the path cost.
+
+    A node is just its index in the store. Columns only grow during a search : nodes are never removed,
+    so that parent indices stay valid and a path can be rebuilt from any node.
+    """
+
+    __slots__ = ('states', 'parents', 'actions', 'costs')
+
+    def __init__(self) -> None:
+        self.states: list = []
+        self.parents: array = array('l')
+        self.actions: array = array('b')
+        self.costs: array = array('d')
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def add(self, state: object, parent: int, action: Optional[Action], cost: float) -> int:
+        self.states.append(state)
+        self.parents.append(parent)
+        self.actions.append(-1 if action is None else action.value)
+        self.costs.append(cost)
+        return len(self.states) - 1
+
+    def path(self, index: int) -> tuple[list[Action], list[object]]:
+
+        # Actions and states from the root (excluded) to node 'index', following the parent indices.
+        actions: list[Action] = []
+        states: list[object] = []
+
+        while self.parents[index] != -1:
+            actions.append(Action(self.actions[index]))
+            states.append(self.states[index])
+            index = self.parents[index]
+
+        actions.reverse()
+        states.reverse()
+        return actions, states
+
+    def path_actions(self, index: int) -> list[Action]:
+
+        # Only the actions of the path to node 'index'.
+        actions: list[Action] = []
+        while self.parents[index] != -1:
+            actions.append(Action(self.actions[index]))
+            index = self.parents[index]
+        actions.reverse()
+        return actions
+
+    def view(self, index: int) -> "NodeView":
+        return NodeView(store=self, index=index)
+
+
+class NodeView:
+
+    # Read-only, SearchNode-like access to one node of a NodeStore (state, parent, prev_action, cost).
+
+    __slots__ = ('store', 'index')
+
+    def __init__(self, store: NodeStore, index: int) -> None:
+        self.store: NodeStore = store
+        self.index: int = index
+
+    @property
+    def state(self) -> object:
+        return self.store.states[self.index]
+
+    @property
+    def parent(self) -> Optional["NodeView"]:
+        parent: int = self.store.parents[self.index]
+        return None if parent == -1 else NodeView(store=self.store, index=parent)
+
+    @property
+    def prev_action(self) -> Optional[Action]:
+        code: int = self.store.actions[self.index]
+        return None if code == -1 else Action(code)
+
+    @property
+    def cost(self) -> float:
+        return self.store.costs[self.index]
+
+    def __repr__(self) -> str:
+        return f'NodeView(index={self.index}, state={self.state}, cost={self.cost})'
@@ -0,0 +1,101 @@
+import math
+import multiprocessing
+import queue
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+from lle import Action, World
+from src.benchmark import PROBLEMS
+from src.problem import SearchProblem
+from src.search import Solution, astar, bfs, best_first_search, dfs
+from src.stats import SearchStats
+
+
+# name -> (algorithm(problem, stats), sub-optimality bound of its solutions : 1 is optimal, math.inf is no guarantee).
+PORTFOLIO: dict[str, tuple[Callable[[SearchProblem, SearchStats], Optional[Solution]], float]] = {
+    'dfs': (lambda problem, stats: dfs(problem=problem, stats=stats), math.inf),
+    'bfs': (lambda problem, stats: bfs(problem=problem, stats=stats), 1.0),
+    'astar': (lambda problem, stats: astar(problem=problem, stats=stats), 1.0),
+    'weighted_astar': (lambda problem, stats: best_first_search(problem=problem, priority='weighted', weight=2.0, stats=stats), 2.0),
+    'greedy': (lambda problem, stats: best_first_search(problem=problem, priority='h', stats=stats), math.inf)
+}
+
+
+@dataclass
+class PortfolioResult:
+
+    # The winner of a portfolio run. 'solution' is None when the winner proved that the problem has no solution.
+    algorithm: str
+    solution: Optional[Solution]
+    bound: float
+    nodes_expanded: int
+    time: float
+
+
+def run_worker(map_str: str, problem_name: str, algorithm: str, results: multiprocessing.Queue) -> None:
+
+    # Process entry point : lle.World cannot be shared, so each worker builds its own World and problem from the map text.
+    # Actions go back as their int values, Action objects cannot be pickled. A failure is reported instead of a result.
+    start: float = time.perf_counter()
+    try:
+        problem: SearchProblem = PROBLEMS[problem_name](world=World(map_str))
+        stats: SearchStats = SearchStats()
+        solution: Optional[Solution] = PORTFOLIO[algorithm][0](problem, stats)
+    except Exception as e:
+        results.put((algorithm, None, 0, time.perf_counter() - start, repr(e)))
+        return
+    actions: Optional[list[int]] = None if solution is None else [a.value for a in solution.actions]
+    results.put((algorithm, actions, stats.nodes_expanded, time.perf_counter() - start, None))
+
+
+def portfolio_solve(map_str: str, problem: str = 'exit', algorithms: tuple[str, ...] = ('dfs', 'bfs', 'astar', 'weighted_astar'),
+                    optimality: float = 1.0, timeout: Optional[float] = None) -> Optional[PortfolioResult]:
+
+    """
+    Runs each algorithm of the portfolio in its own process on the same map and returns the first result whose
+    sub-optimality bound is at most 'optimality' (1 for an optimal solution, math.inf for any solution).
+    The other workers are terminated as soon as there is a winner.
+
+    Every algorithm of the portfolio is complete, so the first one that finds no solution proves there is none :
+    its result is returned right away, with a None solution. Returns None when 'timeout' (seconds) runs out first,
+    or when every worker failed or only found solutions with a too large bound.
+    """
+
+    for name in algorithms: assert name in PORTFOLIO, f'[E] Unknown algorithm : {name}.'
+    assert problem in PROBLEMS, f'[E] Unknown problem : {problem}.'
+    assert any(PORTFOLIO[name][1] <= optimality for name in algorithms), \
+        f'[E] No algorithm of the portfolio guarantees a bound of {optimality}.'
+
+    results: multiprocessing.Queue = multiprocessing.Queue()
+    workers: list[multiprocessing.Process] = [
+        multiprocessing.Process(target=run_worker, args=(map_str, problem, name, results), daemon=True) for name in algorithms
+    ]
+    for worker in workers: worker.start()
+
+    stop_at: float = math.inf if timeout is None else time.perf_counter() + timeout
+    pending: int = len(workers)
+
+    try:
+        while pending:
+
+            try:
+                remaining: Optional[float] = None if timeout is None else max(0.0, stop_at - time.perf_counter())
+                algorithm, actions, expanded, elapsed, error = results.get(timeout=remaining)
+            except queue.Empty:
+                return None
+
+            pending -= 1
+            bound: float = PORTFOLIO[algorithm][1]
+            if error is not None or (actions is not None and bound > optimality): continue
+
+            solution: Optional[Solution] = None
+            if actions is not None:
+                solution = Solution(actions=[Action(a) for a in actions], problem=PROBLEMS[problem](world=World(map_str)))
+            return PortfolioResult(algorithm=algorithm, solution=solution, bound=bound, nodes_expanded=expanded, time=elapsed)
+
+        return None
+
+    finally:
+        for worker in workers:
+            if worker.is_alive(): worker.terminate()
+        for worker in workers: worker.join()
@@ -1,5 +1,6 @@
 import heapq
-from typing import Generic, Tuple, TypeVar
+from collections import deque
+from typing import Callable, Generic, Optional, Tuple, TypeVar
 
 
 T = TypeVar("T")
@@ -51,3 +52,150 @@ class PriorityQueue(Generic[T]):
                 break
         else:
             self.push(item, priority)
+
+
+class IndexedPriorityQueue(Generic[T]):
+
+    """
+
+    Binary heap that also keeps, for every item, its slot in the heap. This gives O(1) membership tests
+    and a true O(log n) decrease-key (`update`), instead of the linear scan + heapify of PriorityQueue.
+    Items must be hashable. Ties between equal priorities are broken by insertion order, as in PriorityQueue.
+
+    """
+
+    def __init__(self):
+        self.heap: list[list] = []  # Entries are [priority, count, item]
+        self.index: dict[T, int] = {}
+        self.count = 0
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def __contains__(self, item: T) -> bool:
+        return item in self.index
+
+    def priority(self, item: T) -> float:
+        return self.heap[self.index[item]][0]
+
+    def push(self, item: T, priority: float):
+        # Pushing an item that is already queued behaves like update.
+        if item in self.index: return self.update(item, priority)
+        self.heap.append([priority, self.count, item])
+        self.index[item] = len(self.heap) - 1
+        self.count += 1
+        self._sift_up(len(self.heap) - 1)
+
+    def pop(self) -> T:
+        last: list = self.heap.pop()
+        if not self.heap:
+            del self.index[last[2]]
+            return last[2]
+        (_, _, item) = self.heap[0]
+        self.heap[0] = last
+        self.index[last[2]] = 0
+        del self.index[item]
+        self._sift_down(0)
+        return item
+
+    def is_empty(self):
+        return len(self.heap) == 0
+
+    def isEmpty(self):
+        return self.is_empty()
+
+    def update(self, item: T, priority: float):
+        # Same contract as PriorityQueue.update : lower the priority of a queued item (decrease-key),
+        # do nothing if it is already queued with an equal or lower priority, push it otherwise.
+        slot: int | None = self.index.get(item)
+        if slot is None: return self.push(item, priority)
+        if self.heap[slot][0] <= priority: return
+        self.heap[slot][0] = priority
+        self._sift_up(slot)
+
+    def _sift_up(self, slot: int):
+        heap, index = self.heap, self.index
+        entry: list = heap[slot]
+        while slot > 0:
+            parent: int = (slot - 1) >> 1
+            if not _before(entry, heap[parent]): break
+            heap[slot] = heap[parent]
+            index[heap[slot][2]] = slot
+            slot = parent
+        heap[slot] = entry
+        index[entry[2]] = slot
+
+    def _sift_down(self, slot: int):
+        heap, index = self.heap, self.index
+        entry: list = heap[slot]
+        size: int = len(heap)
+        while True:
+            child: int = 2 * slot + 1
+            if child >= size: break
+            if child + 1 < size and _before(heap[child + 1], heap[child]): child += 1
+            if not _before(heap[child], entry): break
+            heap[slot] = heap[child]
+            index[heap[slot][2]] = slot
+            slot = child
+        heap[slot] = entry
+        index[entry[2]] = slot
+
+
+class BucketQueue(Generic[T]):
+
+    """
+
+    Bucket (radial) priority queue for small non-negative integer priorities, such as the f-values
+    of A* on unit-cost grids. Bucket f holds the items of priority f, so push is O(1) and pop only moves
+    a cursor forward instead of paying heapq comparisons and tuple allocations.
+
+    Inside a bucket, items are split by g (given by 'g_of', 0 if None) : 'high_g' pops the deepest
+    items first, 'low_g' the shallowest. Items sharing f and g are popped FIFO, or LIFO if 'lifo' is set.
+
+    """
+
+    def __init__(self, tie_break: str = 'high_g', g_of: Optional[Callable[[T], float]] = None, lifo: bool = False):
+        assert tie_break in ('high_g', 'low_g'), f'[E] Unknown tie-breaking policy : {tie_break}.'
+        self.buckets: list[dict[int, deque[T]]] = []
+        self.high_g: bool = tie_break == 'high_g'
+        self.g_of: Optional[Callable[[T], float]] = g_of
+        self.lifo: bool = lifo
+        self.cursor = 0  # No bucket below the cursor holds an item
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def push(self, item: T, priority: float):
+        f: int = int(priority)
+        assert f == priority and f >= 0, f'[E] BucketQueue only accepts non-negative integer priorities, got {priority}.'
+
+        while len(self.buckets) <= f: self.buckets.append({})
+        g: int = 0 if self.g_of is None else int(self.g_of(item))
+        self.buckets[f].setdefault(g, deque()).append(item)
+        self.cursor = min(self.cursor, f)
+        self.size += 1
+
+    def pop(self) -> T:
+        assert self.size > 0, '[E] Cannot pop from an empty BucketQueue.'
+        while not self.buckets[self.cursor]: self.cursor += 1
+
+        bucket: dict[int, deque[T]] = self.buckets[self.cursor]
+        g: int = max(bucket) if self.high_g else min(bucket)
+        items: deque[T] = bucket[g]
+        item: T = items.pop() if self.lifo else items.popleft()
+        if not items: del bucket[g]
+
+        self.size -= 1
+        return item
+
+    def is_empty(self):
+        return self.size == 0
+
+    def isEmpty(self):
+        return self.is_empty()
+
+
+def _before(a: list, b: list) -> bool:
+    # Whether heap entry 'a' ([priority, count, item]) must be popped before entry 'b'.
+    return a[0] < b[0] or (a[0] == b[0] and a[1] < b[1])
@@ -1,6 +1,10 @@
+from .compiled_world import CompiledWorld
+from .distance_table import DistanceTable, TableSource
 from .problem import SearchProblem
 from .exit_problem import ExitProblem
 from .corner_problem import CornerProblem, CornerState
 from .gem_problem import GemProblem
+from .state_encoding import StateEncoder, PackedProblem
+from .multi_agent_problem import MultiAgentState, MultiAgentProblem, MultiAgentExitProblem, MultiAgentGemProblem
 
-__all__ = ["SearchProblem", "ExitProblem", "CornerProblem", "CornerState", "GemProblem"]
+__all__ = ["CompiledWorld", "DistanceTable", "TableSource", "SearchProblem", "ExitProblem", "CornerProblem", "CornerState", "GemProblem", "StateEncoder", "PackedProblem", "MultiAgentState", "MultiAgentProblem", "MultiAgentExitProblem", "MultiAgentGemProblem"]
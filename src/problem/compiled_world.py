@@ -0,0 +1,141 @@
+import copy
+from lle import World, WorldState, Action
+
+
+Position = tuple[int, int]
+MOVES: list[Action] = [Action.NORTH, Action.EAST, Action.SOUTH, Action.WEST]
+
+
+class CompiledWorld:
+
+    """
+    A static, read-only snapshot of a World layout.
+
+    The World is parsed once into plain Python tables (walls, voids, exits, gems, laser beams and start tiles)
+    so that transitions can be computed by a pure function that never calls `World.set_state` or `World.step`.
+    The transition rules mirror the ones of LLE for a single agent.
+    """
+
+    def __init__(self, world: World) -> None:
+
+        self.height: int = world.height
+        self.width: int = world.width
+        self.n_agents: int = world.n_agents
+
+        # Laser sources are reported as walls by LLE, which is exactly how they behave for movement.
+        self.walls: frozenset[Position] = frozenset(world.wall_pos)
+        self.voids: frozenset[Position] = frozenset(world.void_pos)
+        self.exits: frozenset[Position] = frozenset(world.exit_pos)
+        self.exit_list: list[Position] = list(world.exit_pos)
+        self.start_positions: list[Position] = list(world.start_pos)
+
+        # LLE orders the 'gems_collected' flags of a WorldState by row-major position of the gems.
+        self.gems: list[Position] = sorted(world.gems.keys())
+        self.gem_index: dict[Position, int] = {pos: idx for idx, pos in enumerate(self.gems)}
+        self.n_gems: int = len(self.gems)
+        self.all_gems_mask: int = (1 << self.n_gems) - 1
+
+        # Each beam is stored as (colour, cells ordered from the source outwards).
+        self.beams: list[tuple[int, tuple[Position, ...]]] = list()
+        self.beam_colours: dict[Position, frozenset[int]] = dict()
+        self.compile_lasers(world=world)
+
+        # Cells where agent 0 dies as soon as it steps on them (voids and beams of another colour).
+        self.deadly: frozenset[Position] = frozenset(
+            list(self.voids) + [p for p, colours in self.beam_colours.items() if any(c != 0 for c in colours)]
+        )
+
+    def compile_lasers(self, world: World) -> None:
+
+        # A beam starts right after its source and goes on until it hits a wall (or another source) or leaves the grid.
+        colours: dict[Position, set[int]] = dict()
+
+        for source_pos, source in world.laser_sources.items():
+
+            dr, dc = source.direction.delta()
+            r, c = source_pos[0] + dr, source_pos[1] + dc
+            cells: list[Position] = list()
+
+            while self.in_bounds(pos=(r, c)) and (r, c) not in self.walls:
+                cells.append((r, c))
+                colours.setdefault((r, c), set()).add(source.agent_id)
+                r, c = r + dr, c + dc
+
+            self.beams.append((source.agent_id, tuple(cells)))
+
+        self.beam_colours = {p: frozenset(cs) for p, cs in colours.items()}
+
+    def relaxed_for(self, agent: int) -> "CompiledWorld":
+
+        # A copy where the deadly cells are those 'agent' can never survive on whatever the other agents do :
+        # voids, and the first cell of each beam of another colour (a beam is only cut after the agent blocking it).
+        # Distances on this copy are lower bounds of the walking distances of 'agent' on a multi-agent map.
+        relaxed: CompiledWorld = copy.copy(self)
+        relaxed.deadly = frozenset(list(self.voids) + [cells[0] for colour, cells in self.beams if colour != agent and cells])
+        return relaxed
+
+    def in_bounds(self, pos: Position) -> bool:
+        return 0 <= pos[0] < self.height and 0 <= pos[1] < self.width
+
+    def is_free(self, pos: Position) -> bool:
+        # Whether an agent can step on 'pos' (it may still die there).
+        return self.in_bounds(pos=pos) and pos not in self.walls
+
+    def is_safe(self, pos: Position) -> bool:
+        # Whether agent 0 can step on 'pos' and survive.
+        return self.is_free(pos=pos) and pos not in self.deadly
+
+    def gems_to_mask(self, gems_collected: list[bool]) -> int:
+        mask: int = 0
+        for idx, collected in enumerate(gems_collected):
+            if collected: mask |= 1 << idx
+        return mask
+
+    def mask_to_gems(self, gems_mask: int) -> list[bool]:
+        return [bool(gems_mask >> idx & 1) for idx in range(self.n_gems)]
+
+    def available_actions(self, pos: Position, alive: bool) -> list[Action]:
+
+        # Dead agents and agents that already arrived on an exit can only stay where they are.
+        if not alive or pos in self.exits: return [Action.STAY]
+
+        # LLE lists 'Stay' first, followed by the movements in North, East, South, West order.
+        ret: list[Action] = [Action.STAY]
+        for a in MOVES:
+            dr, dc = a.delta
+            if self.is_free(pos=(pos[0] + dr, pos[1] + dc)): ret.append(a)
+
+        return ret
+
+    def transition(self, pos: Position, alive: bool, gems_mask: int, action: Action) -> tuple[Position, bool, int]:
+
+        # Pure single agent transition : returns the (position, alive, gems_mask) reached by taking 'action'.
+        if not alive: return pos, alive, gems_mask
+
+        dr, dc = action.delta
+        new_pos: Position = (pos[0] + dr, pos[1] + dc)
+
+        if new_pos in self.deadly: return new_pos, False, gems_mask
+
+        gem: int | None = self.gem_index.get(new_pos)
+        if gem is not None: gems_mask |= 1 << gem
+        return new_pos, True, gems_mask
+
+    def successors(self, pos: Position, alive: bool, gems_mask: int) -> list[tuple[Position, bool, int, Action]]:
+
+        # A dead agent has no successor at all, mirroring SearchProblem.get_successors.
+        if not alive: return list()
+        return [(*self.transition(pos=pos, alive=alive, gems_mask=gems_mask, action=a), a) for a in self.available_actions(pos=pos, alive=alive)]
+
+    def get_successors(self, state: WorldState) -> list[tuple[WorldState, Action]]:
+
+        # Same contract as SearchProblem.get_successors, computed without touching any World.
+        pos: Position = state.agents_positions[0]
+        gems_mask: int = self.gems_to_mask(gems_collected=state.gems_collected)
+
+        ret: list[tuple[WorldState, Action]] = list()
+        for p, alive, mask, a in self.successors(pos=pos, alive=state.agents_alive[0], gems_mask=gems_mask):
+            ret.append((WorldState([p], self.mask_to_gems(gems_mask=mask), [alive]), a))
+
+        return ret
+
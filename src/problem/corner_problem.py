@@ -1,6 +1,8 @@
-
+from typing import Optional
 from lle import WorldState, World, Action
 from .problem import SearchProblem
+from .state_encoding import StateEncoder
+from .distance_table import DistanceTable, TableSource
 import copy
 
 
@@ -19,10 +21,19 @@ class CornerState(WorldState):
 
 class CornerProblem(SearchProblem[CornerState]):
     
-    def __init__(self, world: World) -> None:
+    def __init__(self, world: World, compiled: bool = False, tables: Optional[TableSource] = None) -> None:
         
-        super().__init__(world)
+        super().__init__(world, compiled=compiled, tables=tables)
         self.corners: list[tuple[int, int]] = [(0, 0), (0, world.width - 1), (world.height - 1, 0), (world.height - 1, world.width - 1)]
+        self.all_corners_mask: int = (1 << len(self.corners)) - 1
+        self.encoder = StateEncoder(compiled_world=self.compiled_world, n_corners=len(self.corners))
+
+        # On degenerate maps (one row or one column) the same cell stands for several corners.
+        for idx, c in enumerate(self.corners):
+            self.corner_bits[c] = self.corner_bits.get(c, 0) | 1 << idx
+
+        self.corner_distances: DistanceTable = self.distance_table(name='corners', targets=self.corners)
+        self.corner_to_exit: list[float] = [self.exit_distances.to_nearest(pos=c) for c in self.corners]
 
         self.initial_state: CornerState = CornerState(
             agents_positions=self.initial_state.agents_positions,
@@ -33,8 +44,11 @@ class CornerProblem(SearchProblem[CornerState]):
 
     def is_goal_state(self, state: CornerState) -> bool:
 
-        self.load_state(state=state)
         self.check_if_only_one_agent(state=state)
+        if self.compiled:
+            return state.agents_alive[0] and state.agents_positions[0] in self.compiled_world.exits and all(state.visited_corners)
+
+        self.load_state(state=state)
 
         is_agent_alive: bool = self.world.get_state().agents_alive[0]
         has_arrived: bool = self.world.agents[0].has_arrived
@@ -72,25 +86,33 @@ class CornerProblem(SearchProblem[CornerState]):
         
         self.check_if_only_one_agent(state=problem_state)
         agent_pos: tuple[int, int] = problem_state.agents_positions[0]
-
-        if all(problem_state.visited_corners):
-            self.load_state(state=problem_state)
-            exit_coords: list[tuple[int, int]] = self.world.exit_pos
-            distances: list[float] = [self.manhattan_distance(p1=agent_pos, p2=ec) for ec in exit_coords]
-            self.restore_initial_state()
-            d: float = min(distances)
-        
-        else:
-            corner_coords: list[tuple[int, int]] = [c for visited_bool, c in zip(problem_state.visited_corners, self.corners) if not visited_bool]
-            distances_to_corners: list[float] = [self.manhattan_distance(p1=agent_pos, p2=cc) for cc in corner_coords]
-            
-            min_dist_to_corner = min(distances_to_corners)
-            nearest_corner = corner_coords[distances_to_corners.index(min_dist_to_corner)]
-            
-            exit_coords: list[tuple[int, int]] = self.world.exit_pos
-            distances_to_exit_from_corner: list[float] = [self.manhattan_distance(p1=nearest_corner, p2=ec) for ec in exit_coords]
-            dist_corner_to_exit = min(distances_to_exit_from_corner)
-            
-            d: float = min_dist_to_corner + dist_corner_to_exit
-
-        return d
\ No newline at end of file
+        corners_mask: int = sum(1 << idx for idx, visited in enumerate(problem_state.visited_corners) if visited)
+        return self.estimate(agent_pos=agent_pos, corners_mask=corners_mask)
+
+    def estimate(self, agent_pos: tuple[int, int], corners_mask: int) -> float:
+
+        # Same bound as GemProblem : the largest 'agent -> corner -> nearest exit' walking distance.
+        remaining: list[int] = [idx for idx in range(len(self.corners)) if not corners_mask >> idx & 1]
+        if not remaining: return self.exit_distances.to_nearest(pos=agent_pos)
+        return max(self.corner_distances.to(idx=idx, pos=agent_pos) + self.corner_to_exit[idx] for idx in remaining)
+
+    def encode_state(self, state: CornerState) -> int:
+        gems_mask: int = self.compiled_world.gems_to_mask(gems_collected=state.gems_collected)
+        corners_mask: int = sum(1 << idx for idx, visited in enumerate(state.visited_corners) if visited)
+        return self.encoder.encode(pos=state.agents_positions[0], alive=state.agents_alive[0], gems_mask=gems_mask, corners_mask=corners_mask)
+
+    def decode_state(self, code: int) -> CornerState:
+        pos, alive, gems_mask, corners_mask = self.encoder.decode(code=code)
+        return CornerState(
+            agents_positions=[pos],
+            gems_collected=self.compiled_world.mask_to_gems(gems_mask=gems_mask),
+            agents_alive=[alive],
+            visited_corners=[bool(corners_mask >> idx & 1) for idx in range(len(self.corners))])
+
+    def is_packed_goal_state(self, code: int) -> bool:
+        pos, alive, _, corners_mask = self.encoder.decode(code=code)
+        return alive and pos in self.compiled_world.exits and corners_mask == self.all_corners_mask
+
+    def packed_heuristic(self, code: int) -> float:
+        pos, _, _, corners_mask = self.encoder.decode(code=code)
+        return self.estimate(agent_pos=pos, corners_mask=corners_mask)
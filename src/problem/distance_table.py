@@ -0,0 +1,78 @@
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Optional
+import numpy as np
+from .compiled_world import CompiledWorld, Position
+
+
+def walking_distances(compiled_world: CompiledWorld, target: Position) -> np.ndarray:
+
+    """
+    Runs a backward BFS from 'target' on the compiled grid and returns, for every cell, the number of steps
+    agent 0 needs to walk from that cell to 'target' (np.inf when it cannot).
+
+    Walls, voids and deadly laser beams cannot be crossed, and an exit cannot be left once entered.
+    """
+
+    distances: np.ndarray = np.full((compiled_world.height, compiled_world.width), np.inf)
+    if not compiled_world.is_free(pos=target): return distances
+
+    distances[target] = 0
+    queue: deque[Position] = deque([target])
+
+    while queue:
+
+        v: Position = queue.popleft()
+        for dr, dc in ((-1, 0), (0, 1), (1, 0), (0, -1)):
+
+            u: Position = (v[0] + dr, v[1] + dc)
+            if not compiled_world.is_safe(pos=u) or u in compiled_world.exits: continue
+            if distances[u] != np.inf: continue
+
+            distances[u] = distances[v] + 1
+            queue.append(u)
+
+    return distances
+
+
+class DistanceTable:
+
+    """
+    True walking distances from every cell of a CompiledWorld to each cell of a list of targets.
+
+    `distances[i]` is the (height, width) distance field of `targets[i]` and `nearest` is their element-wise
+    minimum, i.e. the distance to the closest target. Both are computed once, lookups are O(1).
+    Precomputed 'distances' (e.g. loaded from a cache) skip the BFS.
+    """
+
+    def __init__(self, compiled_world: CompiledWorld, targets: list[Position], distances: Optional[np.ndarray] = None) -> None:
+
+        self.targets: list[Position] = list(targets)
+        shape: tuple[int, int] = (compiled_world.height, compiled_world.width)
+
+        if self.targets:
+            if distances is None: distances = np.stack([walking_distances(compiled_world=compiled_world, target=t) for t in self.targets])
+            assert distances.shape == (len(self.targets), *shape), '[E] Distance fields do not match the targets and the grid.'
+            self.distances: np.ndarray = distances
+            self.nearest: np.ndarray = self.distances.min(axis=0)
+        else:
+            self.distances = np.empty((0, *shape))
+            self.nearest = np.full(shape, np.inf)
+
+    def to(self, idx: int, pos: Position) -> float:
+        return float(self.distances[idx][pos])
+
+    def to_nearest(self, pos: Position) -> float:
+        return float(self.nearest[pos])
+
+
+class TableSource(ABC):
+
+    """
+    Where a SearchProblem gets its DistanceTables from (see the 'tables' argument of SearchProblem).
+    'name' identifies the table within the problem ('exit', 'gems', 'corners').
+    """
+
+    @abstractmethod
+    def table(self, name: str, compiled_world: CompiledWorld, targets: list[Position]) -> DistanceTable:
+        """Returns the DistanceTable of 'targets', computing it if needed"""
@@ -12,8 +12,10 @@ class ExitProblem(SearchProblem[WorldState]):
     def is_goal_state(self, state: WorldState) -> bool:
         
         # The goal state requires that the agent is alive and positioned on the exit tile.
-        self.load_state(state=state)
         self.check_if_only_one_agent(state=state)
+        if self.compiled: return state.agents_alive[0] and state.agents_positions[0] in self.compiled_world.exits
+
+        self.load_state(state=state)
 
         is_agent_alive: bool = state.agents_alive[0]
         has_arrived: bool = self.world.agents[0].has_arrived
@@ -25,14 +27,18 @@ class ExitProblem(SearchProblem[WorldState]):
         
         # In this instance of the problem (exit problem), we are focusing solely on the distance
         # between the agent's position and the nearest exit. 
-        # Therefore, we will use the Manhattan distance formula.
+        # Therefore, we will use the true walking distance, precomputed once for every cell.
         
         self.check_if_only_one_agent(state=problem_state)
-        self.load_state(state=problem_state)
-        
-        agent_position: tuple[int, int] = problem_state.agents_positions[0]
-        exit_pos: list[tuple[int, int]] = self.world.exit_pos
+        return self.distance_to_exit(pos=problem_state.agents_positions[0])
 
-        distances: list[float] = [self.manhattan_distance(p1=agent_position, p2=ep) for ep in exit_pos]
-        self.restore_initial_state()
-        return min(distances)
+    def distance_to_exit(self, pos: tuple[int, int]) -> float:
+        return self.exit_distances.to_nearest(pos=pos)
+
+    def is_packed_goal_state(self, code: int) -> bool:
+        pos, alive, _, _ = self.encoder.decode(code=code)
+        return alive and pos in self.compiled_world.exits
+
+    def packed_heuristic(self, code: int) -> float:
+        pos, _, _, _ = self.encoder.decode(code=code)
+        return self.distance_to_exit(pos=pos)
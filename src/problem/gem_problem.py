@@ -1,7 +1,8 @@
-
-from lle import WorldState
+from typing import Optional
+from lle import WorldState, World
 from .problem import SearchProblem
 from .exit_problem import ExitProblem
+from .distance_table import DistanceTable, TableSource
 
 
 class GemProblem(SearchProblem[WorldState]):
@@ -10,12 +11,25 @@ class GemProblem(SearchProblem[WorldState]):
     A 'less simple' search problem where the agents must reach the exit **alive** AND collect **every gems**.
     """
 
+    def __init__(self, world: World, compiled: bool = False, tables: Optional[TableSource] = None) -> None:
+
+        super().__init__(world, compiled=compiled, tables=tables)
+        self.gem_distances: DistanceTable = self.distance_table(name='gems', targets=self.compiled_world.gems)
+        self.gem_to_exit: list[float] = [self.exit_distances.to_nearest(pos=g) for g in self.compiled_world.gems]
+        self.gem_to_gem: list[list[float]] = [[self.gem_distances.to(idx=j, pos=g) for j in range(self.compiled_world.n_gems)] for g in self.compiled_world.gems]
+
+        # Minimum spanning tree cost over the remaining gems and the exit, keyed by gems-collected bitmask.
+        self.mst_cache: dict[int, float] = dict()
+
     def is_goal_state(self, state: WorldState) -> bool:
         
         # The goal state requires that the agent is alive, positioned on the exit tile,
         # and that all gems have been collected.
-        self.load_state(state=state)
         self.check_if_only_one_agent(state=state)
+        if self.compiled:
+            return state.agents_alive[0] and state.agents_positions[0] in self.compiled_world.exits and all(state.gems_collected)
+
+        self.load_state(state=state)
 
         is_agent_alive: bool = state.agents_alive[0]
         has_arrived: bool = self.world.agents[0].has_arrived
@@ -25,38 +39,54 @@ class GemProblem(SearchProblem[WorldState]):
         self.restore_initial_state()
         return (gem_number == collected_gems_number and has_arrived and is_agent_alive)
  
-    def find_gems_coordinates(self, problem_state: WorldState) -> list[tuple[int, int]]:
-
-        bckup: WorldState = self.world.get_state()
-        self.load_state(state=problem_state)
-        gems: list[tuple[int, int]] = [c for c, gem in self.world.gems.items() if not gem.is_collected]
-        self.load_state(state=bckup)
-        return list(gems)
-    
     def heuristic(self, problem_state: WorldState) -> float:
 
         self.check_if_only_one_agent(state=problem_state)
         agent_pos: tuple[int, int] = problem_state.agents_positions[0]
+        gems_mask: int = self.compiled_world.gems_to_mask(gems_collected=problem_state.gems_collected)
+        return self.estimate(agent_pos=agent_pos, gems_mask=gems_mask)
 
-        if all(problem_state.gems_collected):
-            self.load_state(state=problem_state)
-            exit_coords: list[tuple[int, int]] = self.world.exit_pos
-            distances: list[float] = [self.manhattan_distance(p1=agent_pos, p2=ec) for ec in exit_coords]
-            self.restore_initial_state()
-            d: float = min(distances)
-        
-        else:
-            gems_coords: list[tuple[int, int]] = self.find_gems_coordinates(problem_state=problem_state)
-            distances_to_gems: list[float] = [self.manhattan_distance(p1=agent_pos, p2=gc) for gc in gems_coords]
-            
-            min_dist_to_gem = min(distances_to_gems)
-            nearest_gem = gems_coords[distances_to_gems.index(min_dist_to_gem)]
-            
-            exit_coords: list[tuple[int, int]] = self.world.exit_pos
-            distances_to_exit_from_gem: list[float] = [self.manhattan_distance(p1=nearest_gem, p2=ec) for ec in exit_coords]
-            dist_gem_to_exit = min(distances_to_exit_from_gem)
-            
-            d: float = min_dist_to_gem + dist_gem_to_exit
-
-        return d
-    
+    def estimate(self, agent_pos: tuple[int, int], gems_mask: int) -> float:
+
+        # Two admissible bounds, the largest one is kept :
+        # - every remaining gem must be walked to before reaching an exit ('agent -> gem -> nearest exit');
+        # - the path from the first gem collected to the exit spans the remaining gems and the exit,
+        #   so it costs at least their minimum spanning tree ('agent -> nearest gem' + MST).
+        remaining: list[int] = [idx for idx in range(self.compiled_world.n_gems) if not gems_mask >> idx & 1]
+        if not remaining: return self.exit_distances.to_nearest(pos=agent_pos)
+
+        to_gems: list[float] = [self.gem_distances.to(idx=idx, pos=agent_pos) for idx in remaining]
+        through_gem: float = max(d + self.gem_to_exit[idx] for d, idx in zip(to_gems, remaining))
+        return max(through_gem, min(to_gems) + self.mst_cost(gems_mask=gems_mask, remaining=remaining))
+
+    def mst_cost(self, gems_mask: int, remaining: list[int]) -> float:
+
+        # Prim's algorithm on the complete graph of the remaining gems plus one 'exit' node,
+        # using true walking distances. Thousands of states share a bitmask, hence the cache.
+        cost: float | None = self.mst_cache.get(gems_mask)
+        if cost is not None: return cost
+
+        # best[i] is the cheapest edge linking remaining[i] to the tree, which starts with the exit node.
+        best: list[float] = [self.gem_to_exit[idx] for idx in remaining]
+        in_tree: list[bool] = [False] * len(remaining)
+        cost = 0.0
+
+        for _ in remaining:
+
+            i: int = min((k for k in range(len(remaining)) if not in_tree[k]), key=best.__getitem__)
+            in_tree[i] = True
+            cost += best[i]
+
+            for k, idx in enumerate(remaining):
+                if not in_tree[k]: best[k] = min(best[k], self.gem_to_gem[remaining[i]][idx])
+
+        self.mst_cache[gems_mask] = cost
+        return cost
+
+    def is_packed_goal_state(self, code: int) -> bool:
+        pos, alive, gems_mask, _ = self.encoder.decode(code=code)
+        return alive and pos in self.compiled_world.exits and gems_mask == self.compiled_world.all_gems_mask
+
+    def packed_heuristic(self, code: int) -> float:
+        pos, _, gems_mask, _ = self.encoder.decode(code=code)
+        return self.estimate(agent_pos=pos, gems_mask=gems_mask)
@@ -0,0 +1,203 @@
+from typing import Optional
+from lle import Action, World, WorldState
+from .compiled_world import CompiledWorld, Position
+from .distance_table import DistanceTable, TableSource
+from .problem import SearchProblem
+from .state_encoding import PackedProblem
+
+
+# (dr, dc) of every action code (North, South, East, West, Stay).
+DELTAS: list[tuple[int, int]] = [Action(code).delta for code in range(5)]
+
+
+class MultiAgentState(WorldState):
+
+    # A WorldState at the start of a time step, plus the codes of the actions already chosen during this step
+    # by the first agents (operator decomposition).
+
+    def __new__(cls, agents_positions: list[object], gems_collected: list[bool], agents_alive: list[bool] | None = None, *args, **kwargs) -> None:
+        return super(MultiAgentState, cls).__new__(cls, agents_positions, gems_collected, agents_alive)
+
+    def __init__(self, agents_positions: list[object], gems_collected: list[bool], agents_alive: list[bool] | None = None, pending: tuple[int, ...] = ()) -> None:
+        super().__init__(agents_positions, gems_collected, agents_alive)
+        self.pending: tuple[int, ...] = pending
+
+    def __hash__(self) -> int:
+        return hash((super().__hash__(), self.pending))
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, MultiAgentState) and self.pending == other.pending and super().__eq__(other)
+
+
+class MultiAgentProblem(SearchProblem[MultiAgentState]):
+
+    """
+    Base of the problems where every agent of the map must reach an exit **alive**, for any number of agents.
+
+    The search uses operator decomposition : a time step is split into one move per agent, in agent order,
+    so that a state has at most 5 successors instead of 5^n. The joint action is played in the World once the
+    last agent has chosen its move, so that every rule of LLE applies (collisions, and lasers blocked by an agent
+    of their colour). Successors where an agent dies are discarded.
+
+    Agents that arrived on an exit can only stay : their move is chosen implicitly and costs nothing. The cost of
+    a plan is thus the sum over the agents of the number of steps (waits included) before they arrive.
+
+    Successors are always computed by the World, there is no compiled nor packed mode.
+    """
+
+    def __init__(self, world: World, compiled: bool = False, tables: Optional[TableSource] = None) -> None:
+
+        assert not compiled, f'[E] {type(self).__name__} has no compiled mode.'
+        super().__init__(world, compiled=False, tables=tables)
+        self.n_agents: int = world.n_agents
+
+        # Per-agent walking distances, relaxed so that they stay admissible whatever the other agents do (see relaxed_for).
+        self.agent_worlds: list[CompiledWorld] = [self.compiled_world.relaxed_for(agent=i) for i in range(self.n_agents)]
+        self.agent_exit_distances: list[DistanceTable] = [
+            self.distance_table(name=f'exit-{i}', targets=self.compiled_world.exit_list, compiled_world=self.agent_worlds[i])
+            for i in range(self.n_agents)
+        ]
+        self.initial_state: MultiAgentState = self.make_state(state=self.initial_state, pending=())
+
+    def check_if_only_one_agent(self, state: WorldState) -> None:
+        # Any number of agents is allowed.
+        return None
+
+    def has_arrived(self, state: WorldState, agent: int) -> bool:
+        return state.agents_positions[agent] in self.compiled_world.exits
+
+    def all_arrived(self, state: WorldState) -> bool:
+        return all(pos in self.compiled_world.exits for pos in state.agents_positions)
+
+    def make_state(self, state: WorldState, pending: tuple[int, ...]) -> MultiAgentState:
+
+        # The moves of the arrived agents (Stay) are appended right away, so that the next agent to move has not arrived.
+        if self.all_arrived(state=state): pending = ()
+        else:
+            while len(pending) < self.n_agents and self.has_arrived(state=state, agent=len(pending)):
+                pending += (Action.STAY.value,)
+        return MultiAgentState(state.agents_positions, state.gems_collected, state.agents_alive, pending=pending)
+
+    def play(self, state: MultiAgentState, action: Action) -> Optional[MultiAgentState]:
+
+        # The state reached when the next agent of 'state' takes 'action', or None when an agent dies.
+        chosen: MultiAgentState = self.make_state(state=state, pending=state.pending + (action.value,))
+        if len(chosen.pending) < self.n_agents: return chosen
+
+        self.load_state(state=state)
+        self.world.step([Action(code) for code in chosen.pending])
+        reached: WorldState = self.world.get_state()
+        self.restore_initial_state()
+
+        if not all(reached.agents_alive): return None
+        return self.make_state(state=reached, pending=())
+
+    def get_successors(self, state: MultiAgentState) -> list[tuple[MultiAgentState, Action]]:
+
+        # The moves of the next agent to move (at most 5), all of them computed from the state at the start of the step.
+        if self.all_arrived(state=state): return list()
+
+        self.load_state(state=state)
+        available_actions: list[Action] = self.world.available_actions()[len(state.pending)]
+        self.restore_initial_state()
+
+        ret: list[tuple[MultiAgentState, Action]] = list()
+        for a in available_actions:
+            s: Optional[MultiAgentState] = self.play(state=state, action=a)
+            if s is not None: ret.append((s, a))
+
+        return ret
+
+    def joint_actions(self, actions: list[Action]) -> list[list[Action]]:
+
+        # Groups the moves of a plan (e.g. the actions of a Solution) into the joint actions played in the World.
+        state: MultiAgentState = self.initial_state
+        ret: list[list[Action]] = list()
+
+        for a in actions:
+            chosen: tuple[int, ...] = self.make_state(state=state, pending=state.pending + (a.value,)).pending
+            if len(chosen) == self.n_agents: ret.append([Action(code) for code in chosen])
+            state = self.play(state=state, action=a)
+            assert state is not None, f'[E] Action {a} kills an agent.'
+
+        return ret
+
+    def candidate_positions(self, state: MultiAgentState) -> list[tuple[Position, ...]]:
+
+        # Where each agent can stand at the end of the step : an agent that already chose a move may still be
+        # stopped by a collision, so both its current cell and its destination are candidates.
+        ret: list[tuple[Position, ...]] = list()
+        for agent, pos in enumerate(state.agents_positions):
+            if agent >= len(state.pending): ret.append((pos,)); continue
+            dr, dc = DELTAS[state.pending[agent]]
+            ret.append((pos, (pos[0] + dr, pos[1] + dc)))
+        return ret
+
+    def exit_estimates(self, candidates: list[tuple[Position, ...]]) -> list[float]:
+        # Lower bound of the number of steps of each agent before it arrives.
+        return [min(self.agent_exit_distances[i].to_nearest(pos=p) for p in cells) for i, cells in enumerate(candidates)]
+
+    def is_goal_state(self, state: MultiAgentState) -> bool:
+        return all(state.agents_alive) and self.all_arrived(state=state)
+
+    def heuristic(self, problem_state: MultiAgentState) -> float:
+
+        # Sum of individual distances : every agent makes at least its own (relaxed) walking distance to an exit,
+        # and each of its steps costs one.
+        return sum(self.exit_estimates(candidates=self.candidate_positions(state=problem_state)))
+
+    def packed(self) -> PackedProblem:
+        raise TypeError(f'[E] {type(self).__name__} has no packed mode.')
+
+    def is_packed_goal_state(self, code: int) -> bool:
+        raise TypeError(f'[E] {type(self).__name__} has no packed mode.')
+
+    def packed_heuristic(self, code: int) -> float:
+        raise TypeError(f'[E] {type(self).__name__} has no packed mode.')
+
+
+class MultiAgentExitProblem(MultiAgentProblem):
+
+    """
+    Every agent must reach an exit **alive**.
+    """
+
+
+class MultiAgentGemProblem(MultiAgentProblem):
+
+    """
+    Every agent must reach an exit **alive** AND the agents must collect **every gems** between them.
+    """
+
+    def __init__(self, world: World, compiled: bool = False, tables: Optional[TableSource] = None) -> None:
+
+        super().__init__(world, compiled=compiled, tables=tables)
+        gems: list[Position] = self.compiled_world.gems
+        self.agent_gem_distances: list[DistanceTable] = [
+            self.distance_table(name=f'gems-{i}', targets=gems, compiled_world=self.agent_worlds[i]) for i in range(self.n_agents)
+        ]
+        self.agent_gem_to_exit: list[list[float]] = [[self.agent_exit_distances[i].to_nearest(pos=g) for g in gems] for i in range(self.n_agents)]
+
+    def is_goal_state(self, state: MultiAgentState) -> bool:
+        return all(state.gems_collected) and super().is_goal_state(state=state)
+
+    def heuristic(self, problem_state: MultiAgentState) -> float:
+
+        # Sum of individual distances, plus the smallest detour any agent has to make to collect the remaining gem that
+        # is the most out of the way ('agent -> gem -> exit' instead of 'agent -> exit'). Only one gem counts :
+        # a single agent may collect several gems on the same detour.
+        candidates: list[tuple[Position, ...]] = self.candidate_positions(state=problem_state)
+        to_exit: list[float] = self.exit_estimates(candidates=candidates)
+        total: float = sum(to_exit)
+        if total == float('inf'): return total
+
+        detour: float = 0.0
+        for idx, collected in enumerate(problem_state.gems_collected):
+            if collected: continue
+            through_gem: list[float] = [
+                min(self.agent_gem_distances[i].to(idx=idx, pos=p) for p in cells) + self.agent_gem_to_exit[i][idx] - to_exit[i]
+                for i, cells in enumerate(candidates)
+            ]
+            detour = max(detour, min(through_gem))
+
+        return total + detour
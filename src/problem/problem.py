@@ -1,7 +1,10 @@
 
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar
+from typing import Generic, Optional, TypeVar
 from lle import World, Action, WorldState
+from .compiled_world import CompiledWorld, Position
+from .state_encoding import StateEncoder, PackedProblem
+from .distance_table import DistanceTable, TableSource
 
 
 
@@ -14,14 +17,34 @@ class SearchProblem(ABC, Generic[S]):
     A Search Problem is a problem that can be solved by a search algorithm.
 
     The generic parameter S is the type of the problem state.
+
+    In compiled mode, the World is parsed once into a CompiledWorld and successors are generated
+    by a pure transition function instead of mutating the live World.
+
+    Every problem can also be searched on packed int states (see `packed`), which are only decoded
+    back to S when a solution is built.
+
+    Distance tables come from 'tables' when one is given (e.g. an on-disk cache), and are computed otherwise.
     """
 
-    def __init__(self, world: World) -> None:
+    def __init__(self, world: World, compiled: bool = False, tables: Optional[TableSource] = None) -> None:
         
         self.world: World = world
         self.world.reset()
         self.initial_state: WorldState = world.get_state()
         self.check_if_only_one_agent(state=self.initial_state)
+        self.compiled: bool = compiled
+        self.compiled_world: CompiledWorld = CompiledWorld(world=world)
+        self.corner_bits: dict[Position, int] = dict()
+        self.encoder: StateEncoder = StateEncoder(compiled_world=self.compiled_world)
+        self.tables: Optional[TableSource] = tables
+        self.exit_distances: DistanceTable = self.distance_table(name='exit', targets=self.compiled_world.exit_list)
+
+    def distance_table(self, name: str, targets: list[Position], compiled_world: Optional[CompiledWorld] = None) -> DistanceTable:
+        # Distances on 'compiled_world' (the compiled world of the problem by default) to the targets.
+        compiled_world = compiled_world or self.compiled_world
+        if self.tables is None: return DistanceTable(compiled_world=compiled_world, targets=targets)
+        return self.tables.table(name=name, compiled_world=compiled_world, targets=targets)
 
     def load_state(self, state: S) -> None:
         self.world.set_state(state=state)
@@ -53,8 +76,10 @@ class SearchProblem(ABC, Generic[S]):
             AssertionError: If there is more than one agent in the given state.
         """
 
-        self.load_state(state=state)
         self.check_if_only_one_agent(state=state)
+        if self.compiled: return self.compiled_world.get_successors(state=state)
+
+        self.load_state(state=state)
 
         ret: list = list()
         available_actions: list[Action] = self.world.available_actions()[0]
@@ -69,6 +94,29 @@ class SearchProblem(ABC, Generic[S]):
         self.restore_initial_state()
         return ret
     
+    def packed(self) -> PackedProblem:
+        return PackedProblem(problem=self)
+
+    def encode_state(self, state: S) -> int:
+        gems_mask: int = self.compiled_world.gems_to_mask(gems_collected=state.gems_collected)
+        return self.encoder.encode(pos=state.agents_positions[0], alive=state.agents_alive[0], gems_mask=gems_mask)
+
+    def decode_state(self, code: int) -> S:
+        pos, alive, gems_mask, _ = self.encoder.decode(code=code)
+        return WorldState([pos], self.compiled_world.mask_to_gems(gems_mask=gems_mask), [alive])
+
+    def get_packed_successors(self, code: int) -> list[tuple[int, Action]]:
+
+        # Same as get_successors, but on packed states. Corners are marked as soon as the agent stands on them.
+        pos, alive, gems_mask, corners_mask = self.encoder.decode(code=code)
+        ret: list[tuple[int, Action]] = list()
+
+        for p, is_alive, mask, a in self.compiled_world.successors(pos=pos, alive=alive, gems_mask=gems_mask):
+            corners: int = corners_mask | self.corner_bits.get(p, 0)
+            ret.append((self.encoder.encode(pos=p, alive=is_alive, gems_mask=mask, corners_mask=corners), a))
+
+        return ret
+
     @staticmethod
     def manhattan_distance(p1: tuple[int, int], p2: tuple[int, int]) -> float:
         return abs(p2[0] - p1[0]) + abs(p2[1] - p1[1])
@@ -81,3 +129,11 @@ class SearchProblem(ABC, Generic[S]):
     def heuristic(self, problem_state: S) -> float:
         """Heuristic made to check viability of state nodes"""
 
+    @abstractmethod
+    def is_packed_goal_state(self, code: int) -> bool:
+        """Whether the given packed state is the goal state"""
+
+    @abstractmethod
+    def packed_heuristic(self, code: int) -> float:
+        """Same as heuristic, evaluated on a packed state"""
+
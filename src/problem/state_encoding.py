@@ -0,0 +1,69 @@
+from typing import TYPE_CHECKING
+from lle import Action, WorldState
+from .compiled_world import CompiledWorld, Position
+
+if TYPE_CHECKING:
+    from .problem import SearchProblem
+
+
+class StateEncoder:
+
+    """
+    Packs a single agent state into one Python int.
+
+    Layout, from the least significant bit : the agent cell index (row-major), the alive flag,
+    the gems-collected bitmask and finally the visited-corners bitmask. Ints hash and compare much faster
+    than WorldState objects and take a fraction of their memory in sets, dicts and heaps.
+    """
+
+    def __init__(self, compiled_world: CompiledWorld, n_corners: int = 0) -> None:
+
+        self.width: int = compiled_world.width
+        self.n_gems: int = compiled_world.n_gems
+        self.n_corners: int = n_corners
+
+        self.cell_bits: int = max(1, (compiled_world.height * compiled_world.width - 1).bit_length())
+        self.cell_mask: int = (1 << self.cell_bits) - 1
+        self.gems_shift: int = self.cell_bits + 1
+        self.corners_shift: int = self.gems_shift + self.n_gems
+        self.gems_mask: int = (1 << self.n_gems) - 1
+
+        self.positions: list[Position] = [(r, c) for r in range(compiled_world.height) for c in range(compiled_world.width)]
+
+    def encode(self, pos: Position, alive: bool, gems_mask: int = 0, corners_mask: int = 0) -> int:
+        cell: int = pos[0] * self.width + pos[1]
+        return cell | (alive << self.cell_bits) | (gems_mask << self.gems_shift) | (corners_mask << self.corners_shift)
+
+    def decode(self, code: int) -> tuple[Position, bool, int, int]:
+        # Returns the (position, alive, gems_mask, corners_mask) fields packed in 'code'.
+        pos: Position = self.positions[code & self.cell_mask]
+        alive: bool = bool(code >> self.cell_bits & 1)
+        return pos, alive, code >> self.gems_shift & self.gems_mask, code >> self.corners_shift
+
+
+class PackedProblem:
+
+    """
+    View of a SearchProblem whose states are the ints produced by its StateEncoder.
+
+    It exposes the same interface as SearchProblem (initial_state, get_successors, is_goal_state, heuristic)
+    so that the search algorithms run on it unchanged. States are only decoded back to WorldState
+    when the Solution is built, through `decode_state`.
+    """
+
+    def __init__(self, problem: "SearchProblem") -> None:
+
+        self.problem: "SearchProblem" = problem
+        self.initial_state: int = problem.encode_state(state=problem.initial_state)
+
+    def get_successors(self, state: int) -> list[tuple[int, Action]]:
+        return self.problem.get_packed_successors(code=state)
+
+    def is_goal_state(self, state: int) -> bool:
+        return self.problem.is_packed_goal_state(code=state)
+
+    def heuristic(self, problem_state: int) -> float:
+        return self.problem.packed_heuristic(code=problem_state)
+
+    def decode_state(self, state: int) -> WorldState:
+        return self.problem.decode_state(code=state)
@@ -1,37 +1,122 @@
 
 
 from dataclasses import dataclass
-from typing import Generic, Optional, TypeVar
-from lle import Action, WorldState, World
-from src.priority_queue import PriorityQueue
-from src.problem import SearchProblem, GemProblem, ExitProblem, CornerProblem
-import cv2
+from typing import Callable, Generator, Generic, Iterator, Optional, TypeVar
+from lle import Action, WorldState
+from src.priority_queue import PriorityQueue, IndexedPriorityQueue
+from src.stats import SearchStats
+from src.node_store import NodeStore, NodeView
+from src.budget import BudgetClock, CancelToken, SearchBudget, SearchEvent, SearchResult
+from src.frontier import Frontier, StackFrontier, QueueFrontier, IndexedFrontier, ClosedSet, StateSet, CostTable, FRONTIERS, CLOSED_SETS
+from src.problem import SearchProblem, ExitProblem, PackedProblem, CompiledWorld
+from src.problem.compiled_world import MOVES
+import math
 import time
-import matplotlib.pyplot as plt
-import numpy as np
 
 
 
 S = TypeVar("S", bound=WorldState)
 
+# Weight of the heuristic in each priority function of best_first_search ('weighted' uses its own weight).
+PRIORITIES: dict = {'g': 0.0, 'h': 1.0, 'f': 1.0, 'weighted': None}
+
 
 
-@dataclass
 class Solution(Generic[S]):
-    
-    actions: list[Action]
-    states: list[S]
+
+    """
+    A plan : the actions to take from the initial state of a problem.
+
+    Only the action codes (one byte each) are kept, together with the initial state and the problem (and the 'decode'
+    function of packed problems) needed to replay them. `states` (the state reached after each action) is
+    materialised on first access by replaying the actions through `problem.get_successors`, which goes through the
+    compiled transition model of compiled problems, and cached; `iter_states` replays them without caching.
+    A Solution built with explicit 'states' and no problem keeps them as they are.
+    """
+
+    # Characters of the text form, indexed by action code (North, South, East, West, Stay).
+    TEXT: str = 'NSEW.'
+
+    def __init__(self, actions: list[Action], states: Optional[list[S]] = None, initial_state: Optional[object] = None,
+                 problem: Optional[SearchProblem | PackedProblem] = None, decode: Optional[Callable[[object], S]] = None) -> None:
+        assert states is not None or problem is not None, '[E] A Solution needs its states or a problem to replay them.'
+        self.codes: bytes = bytes(a.value for a in actions)
+        self.initial_state: Optional[object] = initial_state if initial_state is not None or problem is None else problem.initial_state
+        self.problem: Optional[SearchProblem | PackedProblem] = problem
+        self.decode: Optional[Callable[[object], S]] = decode
+        self._states: Optional[list[S]] = states
+
+    @property
+    def actions(self) -> list[Action]:
+        return [Action(code) for code in self.codes]
+
+    @property
+    def states(self) -> list[S]:
+        if self._states is None: self._states = list(self.iter_states())
+        return self._states
 
     @property
     def n_steps(self) -> int:
         # Returns how many steps are required to reach the solution.
-        return len(self.actions)
+        return len(self.codes)
+
+    def iter_states(self) -> Iterator[S]:
+
+        # Replays the actions from the initial state and yields every state reached.
+        if self.problem is None: yield from self._states; return
+
+        state: object = self.initial_state
+        for step, code in enumerate(self.codes):
+            state = next((s for s, a in self.problem.get_successors(state=state) if a.value == code), None)
+            assert state is not None, f'[E] Action {Action(code)} of step {step} cannot be replayed.'
+            yield state if self.decode is None else self.decode(state)
+
+    def __repr__(self) -> str:
+        return f'Solution(n_steps={self.n_steps}, actions={self.to_text()!r})'
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Solution): return NotImplemented
+        return self.codes == other.codes
+
+    def to_text(self) -> str:
+        # One character per action, e.g. 'EESN.W'.
+        return ''.join(self.TEXT[code] for code in self.codes)
+
+    def to_bytes(self) -> bytes:
+        # Number of actions (4 bytes, big endian) followed by the action codes packed two per byte.
+        packed: bytearray = bytearray(len(self.codes).to_bytes(4, 'big'))
+        for i in range(0, len(self.codes), 2):
+            pair: bytes = self.codes[i:i + 2]
+            packed.append(pair[0] << 4 | (pair[1] if len(pair) > 1 else 0))
+        return bytes(packed)
+
+    @staticmethod
+    def from_text(text: str, problem: SearchProblem | PackedProblem, initial_state: Optional[object] = None,
+                  decode: Optional[Callable[[object], S]] = None) -> "Solution[S]":
+        assert all(c in Solution.TEXT for c in text), f'[E] Invalid solution text : {text}.'
+        return Solution([Action(Solution.TEXT.index(c)) for c in text], initial_state=initial_state, problem=problem, decode=decode)
+
+    @staticmethod
+    def from_bytes(data: bytes, problem: SearchProblem | PackedProblem, initial_state: Optional[object] = None,
+                   decode: Optional[Callable[[object], S]] = None) -> "Solution[S]":
+        n_steps: int = int.from_bytes(data[:4], 'big')
+        assert len(data) == 4 + (n_steps + 1) // 2, '[E] Truncated or oversized solution bytes.'
+        codes: list[int] = [code for byte in data[4:] for code in (byte >> 4, byte & 15)][:n_steps]
+        return Solution([Action(code) for code in codes], initial_state=initial_state, problem=problem, decode=decode)
 
     @staticmethod
-    def from_node(node: "SearchNode") -> "Solution[S]":
+    def from_node(node: "SearchNode | NodeView", decode: Optional[Callable[[object], S]] = None,
+                  problem: Optional[SearchProblem | PackedProblem] = None) -> "Solution[S]":
         
         # Find the path from a Node state to the initial state, and reverse the route to
-        # give the solution up to a certain node 'node'.
+        # give the solution up to a certain node 'node'. Packed states are decoded with 'decode'.
+        # Nodes of a NodeStore are followed through their parent indices.
+        # With the 'problem' the search ran on, only the actions are kept and the states are replayed on demand.
+
+        if isinstance(node, NodeView):
+            if problem is not None: return Solution(node.store.path_actions(index=node.index), problem=problem, decode=decode)
+            actions, states = node.store.path(index=node.index)
+            return Solution(actions, states if decode is None else [decode(s) for s in states])
 
         actions: list[Action] = list()
         states: list[WorldState] = list()
@@ -39,17 +124,19 @@ class Solution(Generic[S]):
         while node.parent is not None:
 
             actions.append(node.prev_action)
-            states.append(node.state)
+            if problem is None: states.append(node.state if decode is None else decode(node.state))
             node = node.parent
 
         actions.reverse()
+        if problem is not None: return Solution(actions, problem=problem, decode=decode)
+        states.reverse()
         return Solution(actions, states)
 
 
 @dataclass
 class SearchNode:
 
-    state: WorldState
+    state: WorldState | int
     parent: Optional["SearchNode"]
     prev_action: Optional[Action]
     cost: float = 0.0
@@ -63,162 +150,627 @@ class SearchNode:
         return self.state == other.state and self.cost == other.cost
 
 
+def search_view(problem: SearchProblem, packed: bool) -> tuple[SearchProblem | PackedProblem, Optional[Callable]]:
+    # Returns the problem the algorithms should run on, and how to decode its states when building a Solution.
+    if not packed: return problem, None
+    view: PackedProblem = problem.packed()
+    return view, view.decode_state
+
+def instrument(problem: SearchProblem | PackedProblem, stats: Optional[SearchStats]) -> tuple[Callable, Callable, Callable]:
+    # The (get_successors, heuristic, is_goal_state) methods a search calls, timed into 'stats' when there is one.
+    if stats is None: return problem.get_successors, problem.heuristic, problem.is_goal_state
+    return (stats.timed(method=problem.get_successors, counter='time_successors'),
+            stats.timed(method=problem.heuristic, counter='time_heuristic'),
+            stats.timed(method=problem.is_goal_state, counter='time_goal'))
+
+
+def best_first_search(problem: SearchProblem, frontier: Frontier | str = 'heap', closed: ClosedSet | str = 'cost',
+                      priority: str = 'f', weight: float = 1.0, check_duplicates: str = 'on_pop', goal_test: str = 'on_pop',
+                      verbose: bool = False, packed: bool = False, stats: Optional[SearchStats] = None,
+                      on_expand: Optional[Callable[[NodeView], None]] = None) -> Optional[Solution]:
+
+    """
+    Generic search loop that dfs, bfs and astar are built on.
+
+    Args:
+        frontier: The open list, a Frontier or one of the names of FRONTIERS ('stack', 'deque', 'heap', 'bucket', 'indexed').
+            Tie-breaking is configured on the Frontier itself.
+        closed: The duplicate detection, a ClosedSet or one of the names of CLOSED_SETS ('set', 'cost', 'none').
+        priority: 'g' (path cost), 'h' (heuristic, greedy search), 'f' (g + h) or 'weighted' (g + weight * h).
+            Nodes whose heuristic is infinite are dropped since no goal can be reached from them.
+        check_duplicates: Whether nodes go through the closed set when they are popped ('on_pop') or generated ('on_generate').
+        goal_test: Whether the goal is tested when a node is popped ('on_pop', needed by A* for optimality)
+            or generated ('on_generate', enough for BFS).
+        packed: Run on packed int states (see SearchProblem.packed).
+        stats: Filled with the search statistics (a summary is printed in verbose mode).
+        on_expand: Called with every node right before it is expanded, as a NodeView : its state (packed with 'packed'),
+            parent (a NodeView, None at the root), prev_action and cost (g).
+
+    Nodes live in a NodeStore : the frontier only holds their indices.
+    """
+
+    result: SearchResult = SearchIterator(search_events(
+        problem=problem, frontier=frontier, closed=closed, priority=priority, weight=weight, check_duplicates=check_duplicates,
+        goal_test=goal_test, verbose=verbose, packed=packed, stats=stats, on_expand=on_expand, events=False)).run()
+    return result.solution
+
+
+def search_events(problem: SearchProblem, frontier: Frontier | str = 'heap', closed: ClosedSet | str = 'cost',
+                  priority: str = 'f', weight: float = 1.0, check_duplicates: str = 'on_pop', goal_test: str = 'on_pop',
+                  verbose: bool = False, packed: bool = False, stats: Optional[SearchStats] = None,
+                  on_expand: Optional[Callable[[NodeView], None]] = None, budget: Optional[SearchBudget] = None,
+                  cancel: Optional[CancelToken] = None, events: bool = True) -> Generator[SearchEvent, None, SearchResult]:
+
+    # The loop of best_first_search as a generator : yields a SearchEvent before each expansion (unless 'events' is False)
+    # and returns a SearchResult. The search stops early once 'budget' is exceeded or 'cancel' is cancelled.
+    assert priority in PRIORITIES, f'[E] Unknown priority : {priority}.'
+    assert check_duplicates in ('on_pop', 'on_generate') and goal_test in ('on_pop', 'on_generate'), '[E] Unknown check moment.'
+    if isinstance(frontier, str): frontier = FRONTIERS[frontier]()
+    if isinstance(closed, str): closed = CLOSED_SETS[closed]()
+    if stats is None and verbose: stats = SearchStats()
+    store: NodeStore = NodeStore()
+    frontier.bind(store)
+    states, costs, add = store.states, store.costs, store.add
+
+    started: float = time.perf_counter()
+    problem, decode = search_view(problem=problem, packed=packed)
+    get_successors, heuristic, is_goal_state = instrument(problem=problem, stats=stats)
+    h_weight: float = PRIORITIES[priority] if priority != 'weighted' else weight
+    g_weight: float = 0.0 if priority == 'h' else 1.0
+    on_pop: bool = check_duplicates == 'on_pop'
+    goal_on_pop: bool = goal_test == 'on_pop'
+    clock: Optional[BudgetClock] = None if budget is None else budget.start()
+    limited: bool = clock is not None or cancel is not None
+    best: tuple[float, float, int] = (math.inf, math.inf, -1)  # (h, -g, node) of the most promising node expanded
+    estimates: list[float] = []  # h of every node of the store, kept to rank the partial paths of limited searches
+
+    def estimate(state: object) -> float:
+        return heuristic(problem_state=state) if h_weight else 0.0
+
+    def priority_of(cost: float, estimated_distance: float) -> float:
+        return math.inf if estimated_distance == math.inf else g_weight * cost + h_weight * estimated_distance
+
+    def finish(node: Optional[int], status: str, limit: Optional[str] = None) -> SearchResult:
+        solution: Optional[Solution] = None if node is None else Solution.from_node(node=store.view(index=node), decode=decode, problem=problem)
+        record: SearchStats = stats if stats is not None else SearchStats()
+        record.nodes_expanded += expanded
+        record.nodes_generated += generated
+        record.duplicates_discarded += duplicates
+        record.observe(frontier_size=peak_frontier, closed_size=max(peak_closed, len(closed)))
+        record.solution_depth = None if solution is None else solution.n_steps
+        record.time_total += time.perf_counter() - started
+        if verbose: print(f'[v] {record.summary()}')
+        partial: Optional[Solution] = None
+        if status in ('budget_exceeded', 'cancelled') and best[2] != -1:
+            partial = Solution.from_node(node=store.view(index=best[2]), decode=decode, problem=problem)
+        return SearchResult(status=status, solution=solution, partial=partial, limit=limit, stats=record)
+
+    root: int = add(problem.initial_state, -1, None, 0.0)
+    expanded, generated, duplicates, peak_frontier, peak_closed = 0, 0, 0, 0, 0
+
+    if not goal_on_pop and is_goal_state(state=states[root]): return finish(node=root, status='solved')
+    if not on_pop: closed.admit(states[root], 0.0)
+    root_estimate: float = estimate(states[root])
+    if limited: estimates.append(root_estimate)
+    root_priority: float = priority_of(0.0, root_estimate)
+    if root_priority != math.inf: frontier.push(root, root_priority)
 
-def visualize_solution(w: World, solution: Solution, name: str) -> None:
-    
-    # Little method used to visualize solutions using openCV2
-    if not isinstance(solution, Solution): print('No solution found!'); return
+    # while we have element to explore
+    while len(frontier):
 
-    def show_img(img, step: int, action: Action) -> None:
-        cv2.imshow("Visualisation", img)
-        cv2.waitKey(1)
-        input(f'[{name} : Step {step}] Action : {action} ')
+        peak_frontier = max(peak_frontier, len(frontier))
+        current: int = frontier.pop()
+        state: object = states[current]
+        if on_pop and not closed.admit(state, costs[current]):
+            duplicates += 1
+            continue
+
+        if goal_on_pop and is_goal_state(state=state): return finish(node=current, status='solved')
 
-    show_img(img=w.get_image(), step=0, action='Initial state')
-    for step, a in enumerate(solution.actions):
-        w.step(action=a)
-        show_img(img=w.get_image(), step=step+1, action=a)
-    print(f'[G] Goal reached in {len(solution.actions)} steps for {name}.')
+        if limited:
+            if cancel is not None and cancel.cancelled: return finish(node=None, status='cancelled')
+            limit: Optional[str] = None if clock is None else clock.exceeded(expanded=expanded)
+            if limit is not None: return finish(node=None, status='budget_exceeded', limit=limit)
+            key: tuple[float, float, int] = (estimates[current], -costs[current], current)
+            if key < best: best = key
 
-def dfs(problem: SearchProblem, verbose: bool = False) -> Optional[Solution]:
-    
-    # DFS Method for algorithmic search in a graph.
-    stack: list[SearchNode] = [SearchNode(state=problem.initial_state, parent=None, prev_action=None)]
-    visited: set = set()
+        if events: yield SearchEvent(node=store.view(index=current), expanded=expanded, frontier_size=len(frontier),
+                                     elapsed=time.perf_counter() - started)
 
-    # while we have element to explore / we did not find any solution ;
-    while stack:
+        # We get every successors to current and add the new ones to the frontier
+        if on_expand is not None: on_expand(store.view(index=current))
+        expanded += 1
+        peak_closed = max(peak_closed, len(closed))
+        cost: float = costs[current] + 1
+        successors: list = get_successors(state=state)
+        generated += len(successors)
 
-        current: SearchNode = stack.pop()
-        if current not in visited:            
-            visited.add(current)
-    
-            if problem.is_goal_state(state=current.state):
-                if verbose: print(f'[v] Node visited : {len(visited)}')
-                return Solution.from_node(node=current)
+        for s, a in successors:
 
-            # We get every sucessors to current and add them to the stack
-            successors: list = problem.get_successors(state=current.state)
-            for s, a in successors: stack.append(SearchNode(state=s, parent=current, prev_action=a))
+            if not on_pop and not closed.admit(s, cost):
+                duplicates += 1
+                continue
 
-    if verbose: print(f'[v] Node visited : {len(visited)}')
-    return None
+            estimated_distance: float = estimate(s)
+            node_priority: float = priority_of(cost, estimated_distance)
+            if node_priority == math.inf: continue
+            node: int = add(s, current, a, cost)
+            if limited: estimates.append(estimated_distance)
 
-def bfs(problem: SearchProblem, verbose: bool = False) -> Optional[Solution]:
-    
-    # BFS for algorithmic search in a graph.
-    queue: PriorityQueue = PriorityQueue()
-    queue.push(item=SearchNode(state=problem.initial_state, parent=None, prev_action=None), priority=0)
-    visited: set = set()
+            if not goal_on_pop and is_goal_state(state=s): return finish(node=node, status='solved')
+            frontier.push(node, node_priority)
 
-    # while we have element to explore;
-    while not queue.isEmpty():
+    return finish(node=None, status='no_solution')
 
-        current: SearchNode = queue.pop()
-        if current not in visited:
-            visited.add(current)
 
-            if problem.is_goal_state(state=current.state):
-                if verbose: print(f'[v] Node visited : {len(visited)}')
-                return Solution.from_node(node=current)
+class SearchIterator:
 
-            # We get every sucessors to current and add them to the queue
-            successors: list = problem.get_successors(state=current.state)
-            for s, a in successors: queue.push(item=SearchNode(state=s, parent=current, prev_action=a), priority=0)
+    """
+    Iterator over the SearchEvents of a streamed search (see iter_search). Once it is exhausted,
+    `result` holds the SearchResult. `run` consumes the remaining events and returns the result.
+    """
 
-    if verbose: print(f'[v] Node visited : {len(visited)}')
-    return None
+    def __init__(self, generator: Generator[SearchEvent, None, SearchResult]) -> None:
+        self.generator: Generator[SearchEvent, None, SearchResult] = generator
+        self.result: Optional[SearchResult] = None
 
-def astar(problem: SearchProblem, verbose: bool = False) -> Optional[Solution]:
-    
-    # A* for algorithmic search in a graph.
-    init_node: SearchNode = SearchNode(state=problem.initial_state, parent=None, prev_action=None, cost=0.0)
-    queue: PriorityQueue = PriorityQueue()
-    
-    initial_priority = problem.heuristic(problem_state=problem.initial_state)
-    queue.push(item=init_node, priority=initial_priority)
+    def __iter__(self) -> "SearchIterator":
+        return self
 
-    visited: dict = {}
-    
-    # while we have element to explore
-    while not queue.isEmpty():
-        
-        current: SearchNode = queue.pop()
+    def __next__(self) -> SearchEvent:
+        try:
+            return next(self.generator)
+        except StopIteration as stop:
+            self.result = stop.value
+            raise
 
-        if current.state in visited and visited[current.state] <= current.cost: continue
-        visited[current.state] = current.cost
+    def run(self) -> SearchResult:
+        for _ in self: pass
+        return self.result
 
-        if problem.is_goal_state(state=current.state):
-            if verbose: print(f'[v] Node visited : {len(visited)}')
-            return Solution.from_node(node=current)
 
-        for s, a in problem.get_successors(state=current.state):
-    
-            estimated_distance: float = 1 + problem.heuristic(problem_state=s)
-            new_cost: float = current.cost + estimated_distance
-            node = SearchNode(state=s, parent=current, prev_action=a, cost=new_cost)
-            queue.push(item=node, priority=new_cost)
+# Settings of best_first_search for each streamable algorithm (fresh frontier and closed set on every call).
+SEARCH_SETTINGS: dict[str, Callable[[], dict]] = {
+    'dfs': lambda: dict(frontier=StackFrontier(), closed=StateSet(), priority='g'),
+    'bfs': lambda: dict(frontier=QueueFrontier(), closed=StateSet(), priority='g', check_duplicates='on_generate', goal_test='on_generate'),
+    'astar': lambda: dict(frontier='heap', closed=CostTable(), priority='f'),
+    'astar_bucket': lambda: dict(frontier='bucket', closed=CostTable(), priority='f'),
+    'astar_decrease_key': lambda: dict(frontier=IndexedFrontier(), closed=CostTable(), priority='f', check_duplicates='on_generate')
+}
 
-    if verbose: print(f'[v] Node visited : {len(visited)}')
-    return None
 
+def iter_search(problem: SearchProblem, algorithm: str = 'astar', budget: Optional[SearchBudget] = None,
+                cancel: Optional[CancelToken] = None, packed: bool = False, stats: Optional[SearchStats] = None) -> SearchIterator:
 
-class TestHelper:
+    """
+    Runs one of the SEARCH_SETTINGS algorithms step by step : iterating yields a SearchEvent before each expansion,
+    and `result` (or the return value of `run`) tells how the search ended, with the solution or the best partial path.
+    """
 
-    def __init__(self, LLEmap: str) -> None:
-        
-        self.world: World = World(LLEmap)
+    assert algorithm in SEARCH_SETTINGS, f'[E] Unknown algorithm : {algorithm}.'
+    return SearchIterator(search_events(problem=problem, packed=packed, stats=stats, budget=budget, cancel=cancel,
+                                        **SEARCH_SETTINGS[algorithm]()))
 
-    def get_exit_problem(self) -> ExitProblem:
-        return ExitProblem(self.world)
+
+async def search_async(problem: SearchProblem, algorithm: str = 'astar', budget: Optional[SearchBudget] = None,
+                       packed: bool = False, stats: Optional[SearchStats] = None) -> SearchResult:
+
+    # Runs iter_search in a worker thread. Cancelling the awaiting task cancels the search, which stops
+    # before its next expansion.
+    import asyncio
+    cancel: CancelToken = CancelToken()
+    try:
+        return await asyncio.to_thread(iter_search(problem=problem, algorithm=algorithm, budget=budget, cancel=cancel,
+                                                   packed=packed, stats=stats).run)
+    except asyncio.CancelledError:
+        cancel.cancel()
+        raise
+
+
+def dfs(problem: SearchProblem, verbose: bool = False, packed: bool = False, stats: Optional[SearchStats] = None,
+        on_expand: Optional[Callable[[NodeView], None]] = None) -> Optional[Solution]:
     
-    def get_gem_problem(self) -> GemProblem:
-        return GemProblem(self.world)
+    # DFS Method for algorithmic search in a graph.
+    return best_first_search(problem=problem, **SEARCH_SETTINGS['dfs'](), verbose=verbose, packed=packed, stats=stats, on_expand=on_expand)
+
+def bfs(problem: SearchProblem, verbose: bool = False, packed: bool = False, stats: Optional[SearchStats] = None,
+        on_expand: Optional[Callable[[NodeView], None]] = None) -> Optional[Solution]:
     
-    def get_corner_problem(self) -> CornerProblem:
-        return CornerProblem(self.world)
+    # BFS for algorithmic search in a graph.
+    # States are marked as seen when they are generated, so each one enters the FIFO queue at most once.
+    # Every action costs 1, hence the first goal state generated is reached by a shortest path.
+    return best_first_search(problem=problem, **SEARCH_SETTINGS['bfs'](), verbose=verbose, packed=packed, stats=stats, on_expand=on_expand)
+
+def astar(problem: SearchProblem, verbose: bool = False, packed: bool = False, decrease_key: bool = False, frontier: str = 'heap',
+          stats: Optional[SearchStats] = None, on_expand: Optional[Callable[[NodeView], None]] = None) -> Optional[Solution]:
     
-    def run_tests(self, pr: SearchProblem) -> dict:
+    # A* for algorithmic search in a graph : the node cost is the path cost g, the priority is g + h.
+    # By default, stale heap entries are filtered lazily ; 'decrease_key' switches to an indexed heap instead.
+    # frontier='bucket' replaces the heap by a BucketQueue (integer costs and heuristics only), ties favouring deeper nodes.
+    assert frontier in ('heap', 'bucket'), f'[E] Unknown frontier : {frontier}.'
+    assert not (decrease_key and frontier == 'bucket'), '[E] decrease_key requires the heap frontier.'
+    if decrease_key: return astar_decrease_key(problem=problem, verbose=verbose, packed=packed, stats=stats, on_expand=on_expand)
+    return best_first_search(problem=problem, **SEARCH_SETTINGS['astar' if frontier == 'heap' else 'astar_bucket'](),
+                             verbose=verbose, packed=packed, stats=stats, on_expand=on_expand)
+
+
+def astar_decrease_key(problem: SearchProblem, verbose: bool = False, packed: bool = False, stats: Optional[SearchStats] = None,
+                       on_expand: Optional[Callable[[NodeView], None]] = None) -> Optional[Solution]:
+
+    # A* where every state is queued at most once : a better path to a queued state lowers its priority
+    # in place (O(log n)) instead of pushing a duplicate entry. A cheaper path to an expanded state re-opens it.
+    return best_first_search(problem=problem, **SEARCH_SETTINGS['astar_decrease_key'](), verbose=verbose, packed=packed,
+                             stats=stats, on_expand=on_expand)
+
+
+def anytime_astar(problem: SearchProblem, initial_weight: float = 3.0, weight_step: float = 0.5, deadline: Optional[float] = None,
+                  verbose: bool = False, packed: bool = False, stats: Optional[SearchStats] = None) -> Iterator[tuple[Solution, float]]:
+
+    """
+    Anytime Repairing A* (ARA*) : yields (Solution, bound) pairs, where the cost of each solution is at most
+    'bound' times the optimal cost. The first search uses f = g + w * h with w = 'initial_weight', then w is lowered
+    by 'weight_step' down to 1. Each new search reuses the g-values of the previous ones : only the states whose
+    g-value improved since they were expanded (the INCONS list) are reopened, instead of starting over.
+    The last solution yielded with bound 1 is optimal.
+
+    Args:
+        deadline: Wall-clock budget in seconds. When it runs out, the generator stops after the last solution yielded.
+        stats: Accumulated over all the searches, with one (weight, nodes expanded) entry per search in `iterations`.
+    """
+
+    assert initial_weight >= 1 and weight_step > 0, '[E] ARA* needs initial_weight >= 1 and weight_step > 0.'
+    problem, decode = search_view(problem=problem, packed=packed)
+    get_successors, heuristic, is_goal_state = instrument(problem=problem, stats=stats)
+    started: float = time.perf_counter()
+    stop_at: float = math.inf if deadline is None else started + deadline
+
+    def record(solution: Optional[Solution] = None) -> None:
+        if stats is None: return
+        stats.iterations.append((weight, expanded))
+        stats.nodes_expanded += expanded
+        stats.nodes_generated += generated
+        stats.duplicates_discarded += duplicates
+        stats.observe(frontier_size=peak_frontier, closed_size=len(best))
+        if solution is not None: stats.solution_depth = solution.n_steps
+        stats.time_total = time.perf_counter() - started
+
+    root: SearchNode = SearchNode(state=problem.initial_state, parent=None, prev_action=None, cost=0.0)
+    if is_goal_state(state=root.state):
+        yield Solution.from_node(node=root, decode=decode, problem=problem), 1.0
+        return
+
+    heuristics: dict = {root.state: heuristic(problem_state=root.state)}
+    if heuristics[root.state] == math.inf: return
+
+    best: dict = {root.state: root}
+    goal: Optional[SearchNode] = None
+    weight: float = initial_weight
+    opened: set = {root.state}
+    incons: set = set()
+    last: tuple = (None, None)
+
+    while True:
+
+        # (Re)build the open list with the current weight, including the states made inconsistent by the last search.
+        queue: IndexedPriorityQueue = IndexedPriorityQueue()
+        for state in opened | incons:
+            queue.push(item=state, priority=best[state].cost + weight * heuristics[state])
+        incons, closed = set(), set()
+        expanded, generated, duplicates, peak_frontier = 0, 0, 0, len(queue)
+
+        # Improve the current solution until no open state can lead to a cheaper one with this weight.
+        while not queue.isEmpty() and (goal is None or queue.priority(queue.heap[0][2]) < goal.cost):
+
+            if time.perf_counter() > stop_at:
+                if verbose: print(f'[v] ARA* deadline reached (weight {weight}, nodes expanded {expanded})')
+                record()
+                return
+
+            peak_frontier = max(peak_frontier, len(queue))
+            state = queue.pop()
+            current: SearchNode = best[state]
+            closed.add(state)
+            expanded += 1
+            successors: list = get_successors(state=state)
+            generated += len(successors)
+
+            for s, a in successors:
+
+                new_cost: float = current.cost + 1
+                known: Optional[SearchNode] = best.get(s)
+                if known is not None and known.cost <= new_cost:
+                    duplicates += 1
+                    continue
+
+                if s not in heuristics: heuristics[s] = heuristic(problem_state=s)
+                if heuristics[s] == math.inf: continue
+
+                node: SearchNode = SearchNode(state=s, parent=current, prev_action=a, cost=new_cost)
+                best[s] = node
+
+                if is_goal_state(state=s):
+                    if goal is None or new_cost < goal.cost: goal = node
+                elif s in closed:
+                    incons.add(s)
+                else:
+                    queue.update(item=s, priority=new_cost + weight * heuristics[s])
+
+        opened = set(queue.index)
+        if goal is None:
+            if verbose: print(f'[v] ARA* found no solution (nodes expanded {expanded})')
+            record()
+            return
+
+        # Sub-optimality bound : the optimal cost is at least the smallest g + h over the open and inconsistent states.
+        frontier_bound: float = min((best[x].cost + heuristics[x] for x in opened | incons), default=math.inf)
+        bound: float = max(1.0, min(weight, goal.cost / frontier_bound)) if frontier_bound > 0 else weight
+        if verbose: print(f'[v] ARA* weight {weight} : {goal.cost} steps, bound {bound}, nodes expanded {expanded}')
+        solution: Solution = Solution.from_node(node=goal, decode=decode, problem=problem)
+        record(solution=solution)
+        if goal is not last[0] or bound != last[1]: yield solution, bound
+        last = (goal, bound)
+
+        if weight == 1 or bound == 1: return
+        weight = max(1.0, weight - weight_step)
+
+
+def ida_star(problem: SearchProblem, verbose: bool = False, packed: bool = False, transposition_size: int = 0,
+             stats: Optional[SearchStats] = None, on_expand: Optional[Callable[[SearchNode], None]] = None) -> Optional[Solution]:
+
+    # Iterative deepening A* : repeated depth-first searches bounded by an f = g + h threshold, which grows
+    # to the smallest f that exceeded it. Only the current path and its pending successors are kept in memory.
+    # 'transposition_size' > 0 enables a table of at most that many states (with their best g in the
+    # current iteration) to avoid re-expanding states reached again through another path.
+    # 'stats' accumulates over all iterations, with one (threshold, nodes expanded) entry per iteration.
+    started: float = time.perf_counter()
+    problem, decode = search_view(problem=problem, packed=packed)
+    get_successors, heuristic, is_goal_state = instrument(problem=problem, stats=stats)
+    root: SearchNode = SearchNode(state=problem.initial_state, parent=None, prev_action=None, cost=0.0)
+
+    def finish(node: Optional[SearchNode]) -> Optional[Solution]:
+        solution: Optional[Solution] = None if node is None else Solution.from_node(node=node, decode=decode, problem=problem)
+        if stats is not None:
+            stats.solution_depth = None if solution is None else solution.n_steps
+            stats.time_total += time.perf_counter() - started
+        return solution
+
+    def end_iteration() -> None:
+        if verbose: print(f'[v] IDA* iteration {iteration} : threshold {threshold}, nodes expanded {expanded}')
+        if stats is None: return
+        stats.iterations.append((threshold, expanded))
+        stats.nodes_expanded += expanded
+        stats.nodes_generated += generated
+        stats.duplicates_discarded += duplicates
+        stats.observe(frontier_size=peak_depth, closed_size=len(table))
+
+    if is_goal_state(state=root.state): return finish(node=root)
+
+    threshold: float = heuristic(problem_state=root.state)
+    iteration: int = 0
+
+    while threshold != math.inf:
+
+        iteration += 1
+        next_threshold: float = math.inf
+        table: dict = {}
+        on_path: set = {root.state}
+        if on_expand is not None: on_expand(root)
+        successors: list = get_successors(state=root.state)
+        expanded, generated, duplicates, peak_depth = 1, len(successors), 0, 1
+        stack: list[tuple[SearchNode, Iterator]] = [(root, iter(successors))]
+
+        while stack:
+
+            current, successors = stack[-1]
+            successor = next(successors, None)
+            if successor is None:
+                stack.pop()
+                on_path.discard(current.state)
+                continue
+
+            s, a = successor
+            if s in on_path:
+                duplicates += 1
+                continue
+
+            new_cost: float = current.cost + 1
+            f: float = new_cost + heuristic(problem_state=s)
+            if f > threshold:
+                next_threshold = min(next_threshold, f)
+                continue
+
+            if transposition_size:
+                known: Optional[float] = table.get(s)
+                if known is not None and known <= new_cost:
+                    duplicates += 1
+                    continue
+                if known is not None or len(table) < transposition_size: table[s] = new_cost
+
+            node: SearchNode = SearchNode(state=s, parent=current, prev_action=a, cost=new_cost)
+            if is_goal_state(state=s):
+                end_iteration()
+                return finish(node=node)
+
+            if on_expand is not None: on_expand(node)
+            expanded += 1
+            on_path.add(s)
+            successors = get_successors(state=s)
+            generated += len(successors)
+            stack.append((node, iter(successors)))
+            peak_depth = max(peak_depth, len(stack))
+
+        end_iteration()
+        threshold = next_threshold
+
+    return finish(node=None)
+
+
+def bidirectional_search(problem: ExitProblem, verbose: bool = False, stats: Optional[SearchStats] = None) -> Optional[Solution]:
+
+    # Bidirectional BFS for the exit problem. Its goal only depends on the agent position, so both frontiers
+    # live in position space : one grows from the initial position, the other from every exit at once,
+    # following reverse moves. Whole layers are expanded on the smallest side until the two sides meet.
+    started: float = time.perf_counter()
+    problem.check_if_only_one_agent(state=problem.initial_state)
+    if problem.is_goal_state(state=problem.initial_state): return Solution(actions=[], problem=problem)
+    if not problem.initial_state.agents_alive[0]: return None
+
+    grid: CompiledWorld = problem.compiled_world
+    start: tuple[int, int] = problem.initial_state.agents_positions[0]
+
+    def forward_moves(u: tuple[int, int]) -> list[tuple[tuple[int, int], Action]]:
+        # Exits cannot be left, and stepping on a deadly cell never leads to the goal.
+        if u in grid.exits: return []
+        return [((u[0] + a.delta[0], u[1] + a.delta[1]), a) for a in MOVES if grid.is_safe(pos=(u[0] + a.delta[0], u[1] + a.delta[1]))]
+
+    def backward_moves(v: tuple[int, int]) -> list[tuple[tuple[int, int], Action]]:
+        # Cells 'u' from which action 'a' leads to 'v'.
+        candidates = [((v[0] - a.delta[0], v[1] - a.delta[1]), a) for a in MOVES]
+        return [(u, a) for u, a in candidates if grid.is_safe(pos=u) and u not in grid.exits]
+
+    # Each side maps a position to (neighbour towards its origin, action between them, depth).
+    forward: dict = {start: (None, None, 0)}
+    backward: dict = {e: (None, None, 0) for e in grid.exit_list}
+    layers: dict = {'forward': [start], 'backward': list(grid.exit_list)}
+    expanded, generated, duplicates, peak_frontier = 0, 0, 0, 0
+
+    while layers['forward'] and layers['backward']:
+
+        side: str = 'forward' if len(layers['forward']) <= len(layers['backward']) else 'backward'
+        this, other = (forward, backward) if side == 'forward' else (backward, forward)
+        moves = forward_moves if side == 'forward' else backward_moves
+
+        next_layer: list[tuple[int, int]] = []
+        meeting: Optional[tuple[int, int]] = None
+
+        peak_frontier = max(peak_frontier, len(layers['forward']) + len(layers['backward']))
+        for p in layers[side]:
+            expanded += 1
+            for q, a in moves(p):
+                generated += 1
+                if q in this:
+                    duplicates += 1
+                    continue
+                this[q] = (p, a, this[p][2] + 1)
+                next_layer.append(q)
+                # Every node of the layer has the same depth on this side, keep the shallowest one on the other side.
+                if q in other and (meeting is None or other[q][2] < other[meeting][2]): meeting = q
+
+        layers[side] = next_layer
+        if meeting is not None: break
+
+    if verbose: print(f'[v] Node visited : {expanded}')
+    if stats is not None:
+        stats.nodes_expanded += expanded
+        stats.nodes_generated += generated
+        stats.duplicates_discarded += duplicates
+        stats.observe(frontier_size=peak_frontier, closed_size=len(forward) + len(backward))
+        stats.solution_depth = None if meeting is None else forward[meeting][2] + backward[meeting][2]
+        stats.time_total += time.perf_counter() - started
+    if meeting is None: return None
+
+    actions: list[Action] = []
+    p = meeting
+    while forward[p][0] is not None:
+        actions.append(forward[p][1])
+        p = forward[p][0]
+    actions.reverse()
+
+    p = meeting
+    while backward[p][0] is not None:
+        actions.append(backward[p][1])
+        p = backward[p][0]
+
+    return Solution(actions=actions, problem=problem)
+
+
+def jump_point_path(grid: CompiledWorld, start: tuple[int, int], targets: list[tuple[int, int]],
+                    estimate: Optional[Callable[[tuple[int, int]], float]] = None, verbose: bool = False) -> Optional[list[Action]]:
+
+    """
+    Jump Point Search on the 4-connected grid of a CompiledWorld : shortest walk of agent 0 from 'start'
+    to any cell of 'targets', as a list of actions (None if there is none).
+
+    Straight corridors are crossed in one jump instead of one expansion per cell. A jump stops on a target,
+    or on a cell with a forced neighbour, i.e. a free side cell whose predecessor along the jump is blocked.
+    Walls, voids, deadly lasers and the exits that are not targets (which cannot be left) block the jumps.
+    Vertical jumps also stop where a horizontal jump would find something, as in 4-connected JPS.
+
+    Args:
+        estimate: Admissible estimate of the distance to the targets, Manhattan distance by default.
+    """
+
+    goals: set[tuple[int, int]] = set(targets)
+    if not goals: return None
+    if start in goals: return []
+    if estimate is None: estimate = lambda p: min(SearchProblem.manhattan_distance(p1=p, p2=t) for t in goals)
+
+    def passable(p: tuple[int, int]) -> bool:
+        return grid.is_safe(pos=p) and (p not in grid.exits or p in goals)
+
+    def jump(x: tuple[int, int], d: tuple[int, int]) -> Optional[tuple[int, int]]:
+        # Steps from 'x' along 'd' until a jump point is found, returns None if the jump hits an obstacle.
+        while True:
+            n: tuple[int, int] = (x[0] + d[0], x[1] + d[1])
+            if not passable(n): return None
+            if n in goals: return n
+
+            for side in ((d[1], d[0]), (-d[1], -d[0])):
+                if passable((n[0] + side[0], n[1] + side[1])) and not passable((n[0] - d[0] + side[0], n[1] - d[1] + side[1])): return n
+
+            if d[0] != 0 and (jump(n, (0, 1)) is not None or jump(n, (0, -1)) is not None): return n
+            x = n
+
+    actions_by_delta: dict[tuple[int, int], Action] = {a.delta: a for a in MOVES}
+    queue: PriorityQueue = PriorityQueue()
+    queue.push(item=(start, None), priority=estimate(start))
+    parents: dict = {start: (None, None, 0)}  # jump point -> (previous jump point, direction, g)
+    closed: set = set()
 
-        ret: dict = dict()
+    while not queue.isEmpty():
 
-        separator: str = '\n-----------------------------'
-        print(f'[i] Running tests for {pr}.\n')
+        p, d = queue.pop()
+        if p in closed: continue
+        closed.add(p)
+
+        if p in goals:
+            if verbose: print(f'[v] Jump points expanded : {len(closed)}')
+            actions: list[Action] = []
+            while parents[p][0] is not None:
+                q, d, _ = parents[p]
+                actions = [actions_by_delta[d]] * SearchProblem.manhattan_distance(p1=q, p2=p) + actions
+                p = q
+            return actions
+
+        # Natural and forced neighbours : every direction from the start, otherwise forward and both sides.
+        directions = [a.delta for a in MOVES] if d is None else [d, (d[1], d[0]), (-d[1], -d[0])]
+        for direction in directions:
+            j: Optional[tuple[int, int]] = jump(p, direction)
+            if j is None or j in closed: continue
+            g: int = parents[p][2] + SearchProblem.manhattan_distance(p1=p, p2=j)
+            if j in parents and parents[j][2] <= g: continue
+            h: float = estimate(j)
+            if h == math.inf: continue
+            parents[j] = (p, direction, g)
+            queue.push(item=(j, direction), priority=g + h)
+
+    if verbose: print(f'[v] Jump points expanded : {len(closed)}')
+    return None
 
 
-        for f, n in zip([dfs, bfs, astar], ['DFS', 'BFS', 'ASTAR']):
-            print(f'[i] Running {n} algorithm...')
-            ref: float = time.time()
-            ret[n] = f(problem=pr, verbose=True)
-            delta: float = time.time() - ref
-            if ret[n]: print(f'[i] Solution taking {ret[n].n_steps} steps')
-            print(f'[i] Time elapsed : {round(delta, 3)}s (={round(delta*1000)} ms).{separator}')
+def jps(problem: ExitProblem, verbose: bool = False) -> Optional[Solution]:
 
-        return ret 
+    # Jump Point Search for the exit problem, guided by the exact exit distances of the problem.
+    # The jumps are expanded back into single actions, so this returns a normal Solution.
+    problem.check_if_only_one_agent(state=problem.initial_state)
+    if not problem.initial_state.agents_alive[0]: return None
 
-    @staticmethod
-    def make_graph(data: dict) -> None:
-        
-        algos = list(data.keys())
-        time_elapsed = [data[algo]['time_elapsed'] for algo in algos]
-        nodes_visited = [data[algo]['nodes_visited'] for algo in algos]
-        colors = ['r', 'g', 'b']
+    actions: Optional[list[Action]] = jump_point_path(
+        grid=problem.compiled_world,
+        start=problem.initial_state.agents_positions[0],
+        targets=problem.compiled_world.exit_list,
+        estimate=lambda p: problem.exit_distances.to_nearest(pos=p),
+        verbose=verbose)
 
-        indices = np.arange(len(algos))
-        bar_width = 0.3
-        
-        plt.figure(figsize=(6, 4))
-        plt.bar(indices, time_elapsed, color=colors, width=bar_width)
-        plt.xlabel('Algorithms')
-        plt.ylabel('Time elapsed (ms)')
-        plt.title('Time elapsed for each algorithm')
-        plt.xticks(indices, algos)
-        plt.show()
-
-        plt.figure(figsize=(6, 4))
-        plt.bar(indices, nodes_visited, color=colors, width=bar_width)
-        plt.xlabel('Algorithms')
-        plt.ylabel('Number of visited nodes')
-        plt.title('Number of visited nodes for each algorithm')
-        plt.xticks(indices, algos)
-        plt.show()
+    if actions is None: return None
+    return Solution(actions=actions, problem=problem)
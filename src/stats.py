@@ -0,0 +1,67 @@
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+
+@dataclass
+class SearchStats:
+
+    """
+    Counters filled by a search when it is given a SearchStats instance (`stats=` argument).
+
+    Times are cumulative wall-clock seconds (time.perf_counter) spent in the problem methods.
+    `iterations` holds one (threshold or weight, nodes expanded) pair per iteration of iterative searches (IDA*, ARA*).
+    """
+
+    nodes_expanded: int = 0
+    nodes_generated: int = 0
+    duplicates_discarded: int = 0
+    peak_frontier: int = 0
+    peak_closed: int = 0
+    solution_depth: int | None = None
+    time_successors: float = 0.0
+    time_heuristic: float = 0.0
+    time_goal: float = 0.0
+    time_total: float = 0.0
+    iterations: list[tuple[float, int]] = field(default_factory=list)
+
+    @property
+    def effective_branching_factor(self) -> float:
+
+        # b* such that a uniform tree of depth d (the solution depth) with branching b* holds N + 1 nodes,
+        # N being the number of nodes generated : N + 1 = 1 + b* + b*^2 + ... + b*^d. Without any solution,
+        # falls back to the mean number of successors per expansion.
+        if not self.nodes_expanded: return 0.0
+        if not self.solution_depth: return self.nodes_generated / self.nodes_expanded
+
+        def tree_size(b: float) -> float:
+            return sum(b ** i for i in range(1, self.solution_depth + 1))
+
+        # b*^d <= N, so b* <= N^(1/d) : bisecting below that bound keeps b^i far from the float range on deep solutions.
+        low, high = 0.0, max(1.0, float(self.nodes_generated) ** (1 / self.solution_depth))
+        for _ in range(100):
+            mid: float = (low + high) / 2
+            if tree_size(mid) < self.nodes_generated: low = mid
+            else: high = mid
+        return (low + high) / 2
+
+    def observe(self, frontier_size: int, closed_size: int) -> None:
+        self.peak_frontier = max(self.peak_frontier, frontier_size)
+        self.peak_closed = max(self.peak_closed, closed_size)
+
+    def timed(self, method: Callable, counter: str) -> Callable:
+        # Wraps a problem method so that the time spent in it is added to the 'counter' attribute.
+        def wrapper(*args, **kwargs):
+            start: float = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                setattr(self, counter, getattr(self, counter) + time.perf_counter() - start)
+        return wrapper
+
+    def summary(self) -> str:
+        return (f'expanded {self.nodes_expanded}, generated {self.nodes_generated}, duplicates {self.duplicates_discarded}, '
+                f'peak frontier {self.peak_frontier}, peak closed {self.peak_closed}, '
+                f'branching {self.effective_branching_factor:.2f}, time {self.time_total * 1000:.1f} ms '
+                f'(successors {self.time_successors * 1000:.1f} ms, heuristic {self.time_heuristic * 1000:.1f} ms, '
+                f'goal {self.time_goal * 1000:.1f} ms)')
@@ -0,0 +1,146 @@
+import os
+import time
+from typing import Iterator, Optional
+from lle import Action, World
+from src.problem import SearchProblem, GemProblem, ExitProblem, CornerProblem
+from src.search import Solution, astar, bfs, dfs
+
+
+# Rendering helpers, kept out of src/search.py so that importing the solver does not load the plotting libraries :
+# cv2, Pillow and matplotlib are only imported by the functions that need them.
+
+VIDEO_CODECS: dict = {
+    '.mp4': 'mp4v',
+    '.avi': 'XVID'
+}
+
+
+def solution_steps(solution: Solution) -> list:
+    # The actions played in the World : the moves of a multi-agent plan are grouped into joint actions.
+    if hasattr(solution.problem, 'joint_actions'): return solution.problem.joint_actions(actions=solution.actions)
+    return solution.actions
+
+
+def solution_frames(w: World, solution: Solution) -> Iterator:
+
+    # Images (BGR arrays, as given by World.get_image) of the initial state and of every step of the solution.
+    w.reset()
+    yield w.get_image()
+    for a in solution_steps(solution=solution):
+        w.step(action=a)
+        yield w.get_image()
+
+
+def visualize_solution(w: World, solution: Solution, name: str, delay: Optional[float] = None) -> None:
+
+    # Little method used to visualize solutions using openCV2.
+    # Waits for the user at every step, or plays the solution with 'delay' seconds between steps.
+    if not isinstance(solution, Solution): print('No solution found!'); return
+    import cv2
+
+    actions: list = ['Initial state'] + list(solution_steps(solution=solution))
+    for step, (img, action) in enumerate(zip(solution_frames(w=w, solution=solution), actions)):
+        cv2.imshow("Visualisation", img)
+        if delay is None:
+            cv2.waitKey(1)
+            input(f'[{name} : Step {step}] Action : {action} ')
+        else:
+            cv2.waitKey(max(1, int(delay * 1000)))
+
+    print(f'[G] Goal reached in {len(solution.actions)} steps for {name}.')
+
+
+def export_solution(w: World, solution: Solution, path: str, fps: float = 4.0) -> list[str]:
+
+    """
+    Writes the replay of 'solution' without opening any window and returns the paths of the written files.
+
+    The format follows 'path' : '.gif' (Pillow), '.mp4' or '.avi' (cv2.VideoWriter), otherwise 'path' is a directory
+    that receives one PNG image per step (step_0000.png, step_0001.png, ...).
+    """
+
+    frames: list = list(solution_frames(w=w, solution=solution))
+    extension: str = os.path.splitext(path)[1].lower()
+
+    if extension == '.gif':
+        from PIL import Image
+        images: list = [Image.fromarray(frame[..., ::-1]) for frame in frames]
+        images[0].save(path, save_all=True, append_images=images[1:], duration=int(1000 / fps), loop=0)
+        return [path]
+
+    import cv2
+
+    if extension in VIDEO_CODECS:
+        height, width = frames[0].shape[:2]
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*VIDEO_CODECS[extension]), fps, (width, height))
+        assert writer.isOpened(), f'[E] No video encoder available for {path}.'
+        for frame in frames: writer.write(frame)
+        writer.release()
+        return [path]
+
+    os.makedirs(path, exist_ok=True)
+    paths: list[str] = [os.path.join(path, f'step_{step:04d}.png') for step in range(len(frames))]
+    for p, frame in zip(paths, frames): cv2.imwrite(p, frame)
+    return paths
+
+
+class TestHelper:
+
+    def __init__(self, LLEmap: str) -> None:
+
+        self.world: World = World(LLEmap)
+
+    def get_exit_problem(self) -> ExitProblem:
+        return ExitProblem(self.world)
+
+    def get_gem_problem(self) -> GemProblem:
+        return GemProblem(self.world)
+
+    def get_corner_problem(self) -> CornerProblem:
+        return CornerProblem(self.world)
+
+    def run_tests(self, pr: SearchProblem) -> dict:
+
+        ret: dict = dict()
+
+        separator: str = '\n-----------------------------'
+        print(f'[i] Running tests for {pr}.\n')
+
+
+        for f, n in zip([dfs, bfs, astar], ['DFS', 'BFS', 'ASTAR']):
+            print(f'[i] Running {n} algorithm...')
+            ref: float = time.perf_counter()
+            ret[n] = f(problem=pr, verbose=True)
+            delta: float = time.perf_counter() - ref
+            if ret[n]: print(f'[i] Solution taking {ret[n].n_steps} steps')
+            print(f'[i] Time elapsed : {round(delta, 3)}s (={round(delta*1000)} ms).{separator}')
+
+        return ret
+
+    @staticmethod
+    def make_graph(data: dict, directory: Optional[str] = None) -> None:
+
+        # Shows the graphs, or saves them as PNG files in 'directory' when one is given.
+        import matplotlib
+        if directory is not None: matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+
+        algos = list(data.keys())
+        colors = ['r', 'g', 'b']
+        indices = range(len(algos))
+        bar_width = 0.3
+
+        for key, label, title in (('time_elapsed', 'Time elapsed (ms)', 'Time elapsed for each algorithm'),
+                                  ('nodes_visited', 'Number of visited nodes', 'Number of visited nodes for each algorithm')):
+            plt.figure(figsize=(6, 4))
+            plt.bar(indices, [data[algo][key] for algo in algos], color=colors, width=bar_width)
+            plt.xlabel('Algorithms')
+            plt.ylabel(label)
+            plt.title(title)
+            plt.xticks(indices, algos)
+            if directory is None:
+                plt.show()
+            else:
+                os.makedirs(directory, exist_ok=True)
+                plt.savefig(os.path.join(directory, f'{key}.png'))
+                plt.close()
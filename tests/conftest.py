@@ -0,0 +1,8 @@
+def pytest_addoption(parser):
+    group = parser.getgroup('performance', 'performance regression gate (tests/test_performance.py)')
+    group.addoption('--update-baseline', action='store_true', help='Record the current nodes expanded and runtimes as the new baseline.')
+    group.addoption('--perf-gate', action='store_true',
+                    help='Also compare runtimes to the baseline (machine dependent, nodes expanded are always compared).')
+    group.addoption('--perf-tolerance', type=float, default=1.0,
+                    help='Allowed relative runtime increase over the baseline before failing (1.0 = twice as slow).')
+    group.addoption('--perf-repeat', type=int, default=3, help='Number of timed runs per case with --perf-gate (the median is compared).')
@@ -0,0 +1,38 @@
+from pathlib import Path
+from lle import World
+from search import anytime_astar, astar
+from problem import ExitProblem, CornerProblem, GemProblem
+
+from .utils import check_gem_problem, check_corner_problem, IMPOSSIBLE, EMPTY, GEMS
+
+
+def test_solutions_improve_down_to_optimal():
+    with open(Path(__file__).parent / "map1.txt") as f:
+        problem = GemProblem(World(f.read()))
+    optimal = astar(problem).n_steps
+    results = list(anytime_astar(problem, initial_weight=3.0, weight_step=1.0))
+    assert len(results) >= 1
+    for solution, bound in results:
+        assert bound >= 1
+        assert solution.n_steps <= bound * optimal
+        check_gem_problem(problem, solution)
+    costs = [solution.n_steps for solution, _ in results]
+    assert costs == sorted(costs, reverse=True)
+    assert results[-1][0].n_steps == optimal and results[-1][1] == 1
+
+
+def test_packed_corner():
+    problem = CornerProblem(World(EMPTY))
+    solution, bound = list(anytime_astar(problem, packed=True))[-1]
+    assert bound == 1
+    assert solution.n_steps == astar(problem).n_steps
+    check_corner_problem(problem, solution)
+
+
+def test_deadline():
+    problem = GemProblem(World(GEMS))
+    assert list(anytime_astar(problem, deadline=0)) == []
+
+
+def test_impossible():
+    assert list(anytime_astar(ExitProblem(World(IMPOSSIBLE)))) == []
@@ -88,3 +88,22 @@ def test_gem():
     solution = astar(problem)
     assert solution is not None
     check_gem_problem(problem, solution)
+
+
+def test_decrease_key_same_cost():
+    for map_str in (ZIGZAG, GEMS):
+        problem = GemProblem(World(map_str))
+        solution = astar(problem, decrease_key=True)
+        assert solution is not None
+        assert solution.n_steps == astar(problem).n_steps
+        check_gem_problem(problem, solution)
+
+
+def test_bucket_frontier():
+    for map_str in (EMPTY, ZIGZAG, GEMS):
+        problem = GemProblem(World(map_str))
+        solution = astar(problem, frontier="bucket", packed=True)
+        assert solution is not None
+        assert solution.n_steps == astar(problem).n_steps
+        check_gem_problem(problem, solution)
+    assert astar(ExitProblem(World(IMPOSSIBLE)), frontier="bucket") is None
@@ -0,0 +1,56 @@
+import io
+import json
+import subprocess
+import sys
+from pathlib import Path
+from src.batch import batch, expand_maps, make_jobs, solve_job
+
+from .utils import GEMS, ZIGZAG
+
+ROOT = Path(__file__).parent.parent
+
+
+def write_maps(directory):
+    (directory / "gems.txt").write_text(GEMS)
+    (directory / "zigzag.txt").write_text(ZIGZAG)
+    (directory / "broken.txt").write_text("S0 Q")
+    (directory / "notes.md").write_text("not a map")
+
+
+def test_expand_maps(tmp_path):
+    write_maps(tmp_path)
+    names = ["broken.txt", "gems.txt", "zigzag.txt"]
+    assert [Path(p).name for p in expand_maps([str(tmp_path)])] == names
+    assert [Path(p).name for p in expand_maps([str(tmp_path / "*s.txt"), str(tmp_path / "gems.txt")])] == ["gems.txt"]
+
+
+def test_jobs_skip_unsupported_algorithms():
+    jobs = make_jobs(["a.txt", "b.txt"], ["exit", "gem"], ["bfs", "bidirectional"])
+    assert len(jobs) == 2 * 3
+    assert ("a.txt", "gem", "bidirectional") not in jobs
+
+
+def test_solve_job(tmp_path):
+    write_maps(tmp_path)
+    record = solve_job((str(tmp_path / "zigzag.txt"), "exit", "astar"))
+    assert record["steps"] == 19 == len(record["actions"])
+    assert record["nodes_expanded"] > 0 and record["time"] > 0
+    assert "error" in solve_job((str(tmp_path / "broken.txt"), "exit", "astar"))
+
+
+def test_batch_streams_jsonl(tmp_path):
+    write_maps(tmp_path)
+    output = io.StringIO()
+    n_jobs = batch([str(tmp_path)], ["exit", "gem"], ["bfs", "astar"], workers=2, output=output)
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert n_jobs == len(records) == 3 * 2 * 2
+    assert sum("error" in r for r in records) == 4
+
+
+def test_main_batch_command(tmp_path):
+    write_maps(tmp_path)
+    result = subprocess.run([sys.executable, "main.py", "batch", str(tmp_path / "zigzag.txt"), "--problems", "exit", "--algorithms", "bfs", "dfs"],
+                            cwd=ROOT, capture_output=True, text=True, stdin=subprocess.DEVNULL, timeout=60)
+    assert result.returncode == 0
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert sorted(r["algorithm"] for r in records) == ["bfs", "dfs"]
@@ -0,0 +1,47 @@
+import csv
+import json
+from lle import World
+from problem import CornerProblem, GemProblem
+from search import astar
+from src.benchmark import run_benchmark, save_plots, write_csv, write_json
+from src.map_generator import generate_map
+
+
+def test_generated_map_is_seeded():
+    assert generate_map(10, 12, n_gems=3, n_lasers=2, seed=4) == generate_map(10, 12, n_gems=3, n_lasers=2, seed=4)
+    assert generate_map(10, 12, n_gems=3, seed=4) != generate_map(10, 12, n_gems=3, seed=5)
+
+
+def test_generated_map_contents():
+    world = World(generate_map(9, 7, wall_density=0.3, n_gems=5, n_lasers=2, n_exits=2, seed=1))
+    assert (world.height, world.width) == (9, 7)
+    assert world.n_gems == 5 and len(world.exit_pos) == 2 and len(world.laser_sources) == 2
+    assert world.n_agents == 1
+
+
+def test_generated_maps_are_solvable():
+    for seed in range(5):
+        map_str = generate_map(7, 7, wall_density=0.35, n_gems=3, n_lasers=1, seed=seed)
+        assert astar(GemProblem(World(map_str))) is not None
+        assert astar(CornerProblem(World(map_str))) is not None
+
+
+def test_sweep_writes_results(tmp_path):
+    records = run_benchmark(algorithms=['bfs', 'astar', 'bidirectional'], problems=['exit', 'gem'], sizes=[4, 6], seeds=[0, 1], n_gems=2)
+    # bidirectional only solves the exit problem.
+    assert len(records) == 2 * 2 * (2 + 2 + 1)
+    assert all(r.nodes_expanded > 0 and r.time > 0 and r.peak_memory > 0 for r in records)
+    for r in records:
+        if r.algorithm != 'astar': continue
+        twin = next(x for x in records if x.algorithm == 'bfs' and (x.problem, x.height, x.seed) == (r.problem, r.height, r.seed))
+        assert r.steps == twin.steps
+
+    write_json(records, tmp_path / 'results.json')
+    write_csv(records, tmp_path / 'results.csv')
+    assert len(json.loads((tmp_path / 'results.json').read_text())) == len(records)
+    with open(tmp_path / 'results.csv') as f:
+        assert len(list(csv.DictReader(f))) == len(records)
+
+    paths = save_plots(records, tmp_path / 'plots')
+    assert len(paths) == 2
+    assert all((tmp_path / 'plots' / name).exists() for name in ('exit.png', 'gem.png'))
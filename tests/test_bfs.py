@@ -1,5 +1,5 @@
-from lle import World
-from search import bfs
+from lle import World, WorldState
+from search import astar, bfs
 from problem import ExitProblem, CornerProblem, GemProblem
 
 from .utils import check_exit_problem, check_corner_problem, check_gem_problem, IMPOSSIBLE, EMPTY, ZIGZAG, GEMS
@@ -88,3 +88,19 @@ def test_gem():
     solution = bfs(problem)
     assert solution is not None
     check_gem_problem(problem, solution)
+
+
+def test_shortest_paths():
+    for map_str in (EMPTY, ZIGZAG):
+        for problem_class in (ExitProblem, GemProblem):
+            problem = problem_class(World(map_str))
+            assert bfs(problem).n_steps == astar(problem).n_steps
+    problem = CornerProblem(World(EMPTY))
+    assert bfs(problem).n_steps == astar(problem).n_steps
+
+
+def test_initial_state_is_goal():
+    problem = ExitProblem(World("X . S0"))
+    problem.initial_state = WorldState([(0, 0)], [])
+    solution = bfs(problem)
+    assert solution is not None and solution.n_steps == 0
@@ -0,0 +1,60 @@
+import os
+import pytest
+from lle import World
+from problem import GemProblem
+from search import astar
+import src.cache
+import src.problem.distance_table
+from src.cache import DiskCache
+
+from .utils import check_gem_problem, IMPOSSIBLE, GEMS, ZIGZAG
+
+
+def test_key():
+    indented = "\n".join("    " + row for row in GEMS.splitlines())
+    assert DiskCache.key(GEMS, "gem") == DiskCache.key(indented + "\n\n", "gem")
+    assert DiskCache.key(GEMS, "gem") != DiskCache.key(GEMS, "exit")
+    assert DiskCache.key(GEMS, "gem") != DiskCache.key(ZIGZAG, "gem")
+
+
+def test_warm_solve_skips_preprocessing_and_search(tmp_path, monkeypatch):
+    cache = DiskCache(str(tmp_path))
+    cold = cache.solve(GEMS, "gem", "astar")
+    assert cold.n_steps == astar(GemProblem(World(GEMS))).n_steps
+    assert any(name.endswith("-gems.npy") for name in os.listdir(tmp_path))
+    cache.close()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("recomputed")
+    monkeypatch.setattr(src.problem.distance_table, "walking_distances", fail)
+    monkeypatch.setitem(src.cache.ALGORITHMS, "astar", fail)
+
+    cache = DiskCache(str(tmp_path))
+    problem = cache.problem(GEMS, "gem")
+    assert not problem.gem_distances.distances.flags.writeable  # Memory-mapped, read-only
+    warm = cache.solve(GEMS, "gem", "astar")
+    assert warm == cold and warm.states == cold.states
+    check_gem_problem(GemProblem(World(GEMS)), warm)
+    with pytest.raises(AssertionError, match="recomputed"):
+        cache.solve(GEMS, "exit", "astar")  # Another problem type is another entry
+
+
+def test_no_solution_is_cached(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    assert cache.solve(IMPOSSIBLE, "exit", "bfs") is None
+    assert cache.get_solution(DiskCache.key(IMPOSSIBLE, "exit"), "bfs") == (True, None)
+
+
+def test_lru_eviction(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=200)
+    cache.put_solution("a", "astar", "N" * 60)
+    cache.put_solution("b", "astar", "S" * 60)
+    cache.get_solution("a", "astar")  # 'a' is now the most recently used
+    cache.put_solution("c", "astar", "E" * 60)
+    assert cache.size() <= 200
+    assert cache.get_solution("a", "astar")[0] and cache.get_solution("c", "astar")[0]
+    assert not cache.get_solution("b", "astar")[0]
+
+    cache.max_bytes = 0
+    cache.evict()
+    assert cache.size() == 0 and not [name for name in os.listdir(tmp_path) if name.endswith(".npy")]
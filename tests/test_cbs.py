@@ -0,0 +1,113 @@
+import pytest
+from lle import World
+from budget import SearchBudget
+from problem import MultiAgentExitProblem, MultiAgentGemProblem
+from search import astar
+from src.cbs import Constraints, SpaceTimeProblem, cbs
+from stats import SearchStats
+
+from .test_multi_agent import BLOCKED, TWO_GEMS, check_solution
+
+# Agent 1 reaches the beam after one step only : agent 0 has to wait for it before crossing.
+WAIT_FOR_BLOCKER = """
+S0 @  @  @  .  S1
+.  .  .  .  .  L1W
+X  @  @  @  X  @
+"""
+
+CROSSING = """
+S0 .  .  .  X
+.  @  .  @  .
+S1 .  .  .  .
+.  @  S2 @  X
+X  .  .  .  .
+"""
+
+# The agents must swap in a corridor : impossible.
+SWAP = """
+S0 . . . S1
+@  @ . @ @
+X  @ @ @ X
+"""
+
+# Agents 1 and 2 can only reach the top right exit (which ends any walk through it) : the high level alone never terminates.
+UNREACHABLE = """
+S1 S2  X
+@  L2E .
+@  @   X
+X  S0  .
+"""
+
+# Agent 0 must take the bottom exit, on its own beam (an agent on an exit still dies when a beam reaches it),
+# and agent 1 has to block the beam of colour 1 while agent 0 crosses it.
+BEAM_EXITS = """
+@  X  .  .   S0 .
+@  .  .  .   S1 X
+.  .  .  .   .  @
+S2 .  L1N .  .  .
+.  X  .  L0W @  .
+"""
+
+SIX_AGENTS = """
+S0 .  .  .  .  @  .  .  .  X
+.  .  @  .  .  .  .  @  .  .
+.  .  @  .  S1 .  .  @  .  .
+S2 .  .  .  .  .  .  .  .  X
+.  .  .  @  @  .  .  .  .  .
+.  .  .  .  .  .  S3 .  .  .
+X  .  @  .  .  .  .  @  .  .
+.  .  @  .  S4 .  .  .  .  X
+.  .  .  .  .  .  @  .  .  .
+S5 .  .  X  .  .  .  .  .  X
+"""
+
+
+@pytest.mark.parametrize("map_str", [BLOCKED, WAIT_FOR_BLOCKER, CROSSING, BEAM_EXITS])
+def test_optimal(map_str):
+    problem = MultiAgentExitProblem(World(map_str))
+    result = cbs(problem)
+    assert result.status == "solved"
+    solution = result.solution
+    check_solution(problem, map_str, solution)
+    assert solution.n_steps == astar(problem).n_steps
+
+
+def test_laser_dependency():
+    problem = MultiAgentExitProblem(World(WAIT_FOR_BLOCKER))
+    stats = SearchStats()
+    joint = check_solution(problem, WAIT_FOR_BLOCKER, cbs(problem, stats=stats).solution)
+    assert [a.name for a in joint[0]] == ["Stay", "West"] and stats.nodes_expanded > 0
+
+
+def test_many_agents():
+    problem = MultiAgentExitProblem(World(SIX_AGENTS))
+    check_solution(problem, SIX_AGENTS, cbs(problem, budget=SearchBudget(max_nodes=2000)).solution)
+
+
+@pytest.mark.parametrize("map_str", [SWAP, UNREACHABLE])
+def test_no_solution(map_str):
+    result = cbs(MultiAgentExitProblem(World(map_str)))
+    assert result.status == "no_solution" and result.solution is None
+
+
+def test_budget():
+    result = cbs(MultiAgentExitProblem(World(WAIT_FOR_BLOCKER)), budget=SearchBudget(max_nodes=0))
+    assert result.status == "budget_exceeded" and result.limit == "nodes" and result.solution is None
+    assert result.stats.nodes_expanded == 0
+
+
+def test_low_level_constraints():
+    problem = MultiAgentExitProblem(World(BLOCKED))
+    start, world, distances = (0, 0), problem.agent_worlds[0], problem.agent_exit_distances[0]
+    free = astar(SpaceTimeProblem(world, start, distances, Constraints()))
+    assert [s for s in free.states] == [((1, 0), 1), ((2, 0), 2)]
+    waiting = astar(SpaceTimeProblem(world, start, distances, Constraints().forbid((1, 0), 1)))
+    assert waiting.n_steps == 3
+    # The exit is taken at time 4 : the agent has to arrive later, and cannot arrive at all once it is taken for good.
+    assert astar(SpaceTimeProblem(world, start, distances, Constraints().forbid((2, 0), 4))).n_steps == 5
+    assert astar(SpaceTimeProblem(world, start, distances, Constraints().forbid_from((2, 0), 4))) is None
+
+
+def test_only_exit_problems():
+    with pytest.raises(TypeError):
+        cbs(MultiAgentGemProblem(World(TWO_GEMS)))
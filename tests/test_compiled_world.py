@@ -0,0 +1,82 @@
+from pathlib import Path
+from lle import World, WorldState
+from problem import ExitProblem, GemProblem, CornerProblem
+from search import astar, bfs, dfs
+
+from .utils import check_exit_problem, check_corner_problem, check_gem_problem, EMPTY, ZIGZAG, GEMS, LASERS
+
+
+def reachable_states(problem: ExitProblem) -> list[WorldState]:
+    # Every state reachable from the initial state, explored through the live World.
+    seen: set = {problem.initial_state}
+    stack: list = [problem.initial_state]
+    while stack:
+        for s, _ in problem.get_successors(stack.pop()):
+            if s not in seen:
+                seen.add(s)
+                stack.append(s)
+    return list(seen)
+
+
+def successor_set(successors: list) -> set:
+    return {(s, a.value) for s, a in successors}
+
+
+def check_same_successors(map_str: str):
+    reference = ExitProblem(World(map_str))
+    compiled = ExitProblem(World(map_str), compiled=True)
+    for state in reachable_states(reference):
+        expected = reference.get_successors(state)
+        actual = compiled.get_successors(state)
+        assert [a.value for _, a in actual] == [a.value for _, a in expected]
+        assert successor_set(actual) == successor_set(expected)
+        assert compiled.is_goal_state(state) == reference.is_goal_state(state)
+
+
+def test_same_successors_empty():
+    check_same_successors(EMPTY)
+
+
+def test_same_successors_zigzag():
+    check_same_successors(ZIGZAG)
+
+
+def test_same_successors_gems():
+    check_same_successors(GEMS)
+
+
+def test_same_successors_lasers_and_voids():
+    check_same_successors(LASERS)
+
+
+def test_same_successors_map1():
+    with open(Path(__file__).parent / "map1.txt") as f:
+        check_same_successors(f.read())
+
+
+def test_compiled_does_not_touch_world():
+    world = World(GEMS)
+    problem = GemProblem(world, compiled=True)
+    before = world.get_state()
+    state = problem.initial_state
+    for _ in range(5):
+        state = problem.get_successors(state)[-1][0]
+    assert world.get_state() == before
+
+
+def test_compiled_search():
+    for algorithm in (dfs, bfs, astar):
+        problem = ExitProblem(World(ZIGZAG), compiled=True)
+        solution = algorithm(problem)
+        assert solution is not None
+        check_exit_problem(problem, solution)
+
+        problem = GemProblem(World(GEMS), compiled=True)
+        solution = algorithm(problem)
+        assert solution is not None
+        check_gem_problem(problem, solution)
+
+        problem = CornerProblem(World(EMPTY), compiled=True)
+        solution = algorithm(problem)
+        assert solution is not None
+        check_corner_problem(problem, solution)
@@ -0,0 +1,88 @@
+import io
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from lle import World
+from problem import GemProblem
+from search import astar
+from src.daemon import ProblemCache, SolverDaemon, solve_request
+
+from .utils import IMPOSSIBLE, GEMS, ZIGZAG
+
+ROOT = Path(__file__).parent.parent
+
+
+def test_problem_cache_lru():
+    cache = ProblemCache(capacity=2)
+    gems, hit = cache.get(GEMS, "gem")
+    assert not hit and gems.compiled
+    assert cache.get(GEMS, "gem") == (gems, True)
+    cache.get(ZIGZAG, "exit")
+    cache.get(GEMS, "gem")  # GEMS is now the most recently used
+    cache.get(IMPOSSIBLE, "exit")
+    assert cache.get(GEMS, "gem")[1] and not cache.get(ZIGZAG, "exit")[1]
+
+
+def test_solve_request():
+    cache = ProblemCache()
+    cold = solve_request(cache, {"id": 1, "map": GEMS, "problem": "gem"})
+    warm = solve_request(cache, {"id": 2, "map": GEMS, "problem": "gem"})
+    assert cold["status"] == warm["status"] == "solved" and (cold["cached"], warm["cached"]) == (False, True)
+    assert cold["actions"] == warm["actions"] and warm["steps"] == astar(GemProblem(World(GEMS))).n_steps
+    limited = solve_request(cache, {"map": GEMS, "problem": "gem", "algorithm": "bfs", "max_nodes": 10})
+    assert limited["status"] == "budget_exceeded" and limited["limit"] == "nodes" and "partial" in limited
+    assert solve_request(cache, {"map": IMPOSSIBLE})["status"] == "no_solution"
+    assert "error" in solve_request(cache, {"map": GEMS, "algorithm": "ida_star"})
+    assert "error" in solve_request(cache, {"map": "S0 Q"})
+
+
+def test_serve_json_lines(tmp_path):
+    (tmp_path / "zigzag.txt").write_text(ZIGZAG)
+    requests = [
+        {"id": "a", "map": GEMS, "problem": "gem"},
+        {"id": "b", "path": str(tmp_path / "zigzag.txt"), "algorithm": "bfs"},
+        {"id": "c", "map": GEMS, "problem": "gem"},
+        {"id": "d", "op": "ping"},
+        {"id": "e", "path": str(tmp_path / "missing.txt")},
+    ]
+    lines = "\n".join(json.dumps(r) for r in requests) + "\nnot json\n"
+    output = io.StringIO()
+    with SolverDaemon(workers=2) as daemon:
+        assert not daemon.serve(io.StringIO(lines), output)
+    responses = [json.loads(line) for line in output.getvalue().splitlines()]
+    by_id = {r["id"]: r for r in responses}
+    assert len(responses) == 6 and sum("error" in r for r in responses) == 2
+    assert by_id["d"]["ok"] and by_id["b"]["steps"] == 19
+    # Both GEMS requests went to the same worker, the second one found the problem in its cache.
+    assert by_id["a"]["worker"] == by_id["c"]["worker"] and by_id["a"]["cached"] != by_id["c"]["cached"]
+
+
+def test_unix_socket(tmp_path):
+    path = str(tmp_path / "solver.sock")
+    with SolverDaemon(workers=1) as daemon:
+        server = threading.Thread(target=daemon.serve_unix, args=(path,))
+        server.start()
+        while not os.path.exists(path): time.sleep(0.01)
+        with socket.socket(socket.AF_UNIX) as client:
+            client.connect(path)
+            stream = client.makefile("rw")
+            stream.write(json.dumps({"id": 1, "map": ZIGZAG}) + "\n")
+            stream.flush()
+            assert json.loads(stream.readline())["steps"] == 19
+            stream.write(json.dumps({"op": "shutdown"}) + "\n")
+            stream.flush()
+        server.join(timeout=10)
+        assert not server.is_alive() and not os.path.exists(path)
+
+
+def test_main_serve_command():
+    requests = json.dumps({"id": 1, "map": ZIGZAG, "algorithm": "astar"}) + "\n" + json.dumps({"op": "shutdown"}) + "\n"
+    result = subprocess.run([sys.executable, "main.py", "serve", "--workers", "1"], cwd=ROOT, input=requests,
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0
+    assert json.loads(result.stdout)["steps"] == 19
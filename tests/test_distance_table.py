@@ -0,0 +1,49 @@
+import math
+from pathlib import Path
+from lle import World
+from problem import ExitProblem, GemProblem, CornerProblem, DistanceTable
+from search import astar, bfs
+
+from .utils import EMPTY, ZIGZAG, GEMS
+
+
+def test_distances_follow_walls():
+    problem = ExitProblem(World(ZIGZAG))
+    start = problem.initial_state.agents_positions[0]
+    assert problem.heuristic(problem.initial_state) == bfs(problem).n_steps
+    assert problem.exit_distances.to_nearest(start) > problem.manhattan_distance(start, problem.world.exit_pos[0])
+
+
+def test_unreachable_is_infinite():
+    problem = ExitProblem(World(ZIGZAG))
+    table = DistanceTable(problem.compiled_world, [(0, 0)])
+    assert math.isinf(table.to(0, (1, 1)))  # Wall
+    assert table.to(0, (0, 0)) == 0
+
+
+def test_exit_cannot_be_crossed():
+    problem = GemProblem(World("S0 X . G"))
+    assert math.isinf(problem.heuristic(problem.initial_state))
+    assert astar(problem) is None
+
+
+def test_voids_are_avoided():
+    problem = ExitProblem(World("""
+        S0 V X
+        .  . ."""))
+    assert problem.heuristic(problem.initial_state) == 4
+
+
+def test_astar_is_optimal():
+    with open(Path(__file__).parent / "map1.txt") as f:
+        map1 = f.read()
+    for map_str in (EMPTY, ZIGZAG, map1):
+        problem = GemProblem(World(map_str))
+        assert astar(problem).n_steps == bfs(problem).n_steps
+    problem = CornerProblem(World(EMPTY))
+    assert astar(problem).n_steps == bfs(problem).n_steps
+
+
+def test_gem_heuristic_is_admissible():
+    problem = GemProblem(World(GEMS))
+    assert problem.heuristic(problem.initial_state) <= astar(problem).n_steps
@@ -0,0 +1,58 @@
+from pathlib import Path
+from lle import World
+from search import best_first_search, astar, bfs
+from frontier import HeapFrontier, BucketFrontier, StackFrontier, StateSet, CostTable
+from problem import ExitProblem, CornerProblem, GemProblem
+
+from .utils import check_gem_problem, check_corner_problem, IMPOSSIBLE, EMPTY
+
+
+class Node:
+    def __init__(self, name: str, cost: float):
+        self.name, self.cost = name, cost
+
+
+def map1() -> World:
+    with open(Path(__file__).parent / "map1.txt") as f:
+        return World(f.read())
+
+
+def test_heap_tie_breaking():
+    nodes = [Node("a", 1), Node("b", 3), Node("c", 2)]
+    for tie_break, expected in (("fifo", "abc"), ("lifo", "cba"), ("high_g", "bca"), ("low_g", "acb")):
+        frontier = HeapFrontier(tie_break=tie_break)
+        for node in nodes: frontier.push(node, 7)
+        frontier.push(Node("z", 0), 8)
+        assert "".join(frontier.pop().name for _ in range(3)) == expected
+        assert len(frontier) == 1
+
+
+def test_frontier_and_closed_set_combinations():
+    optimal = astar(GemProblem(map1())).n_steps
+    for frontier in ("heap", "bucket", "indexed"):
+        for check_duplicates in ("on_pop", "on_generate"):
+            if frontier == "indexed" and check_duplicates == "on_pop": continue
+            problem = GemProblem(map1())
+            solution = best_first_search(problem, frontier=frontier, closed="cost", priority="f", check_duplicates=check_duplicates)
+            assert solution.n_steps == optimal
+            check_gem_problem(problem, solution)
+
+
+def test_priority_functions():
+    optimal = bfs(GemProblem(map1())).n_steps
+    problem = GemProblem(map1())
+    greedy = best_first_search(problem, frontier=HeapFrontier(), closed=StateSet(), priority="h", packed=True)
+    check_gem_problem(problem, greedy)
+    weighted = best_first_search(problem, frontier=BucketFrontier(), closed=CostTable(), priority="weighted", weight=2)
+    assert optimal <= weighted.n_steps
+    check_gem_problem(problem, weighted)
+    uniform = best_first_search(problem, frontier=HeapFrontier(tie_break="lifo"), closed=CostTable(), priority="g")
+    assert uniform.n_steps == optimal
+
+
+def test_corner_and_impossible():
+    problem = CornerProblem(World(EMPTY))
+    solution = best_first_search(problem, frontier="deque", closed="set", priority="g", goal_test="on_generate", check_duplicates="on_generate")
+    assert solution.n_steps == astar(problem).n_steps
+    check_corner_problem(problem, solution)
+    assert best_first_search(ExitProblem(World(IMPOSSIBLE)), frontier=StackFrontier(), closed=StateSet(), priority="g") is None
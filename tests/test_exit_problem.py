@@ -1,5 +1,10 @@
+import random
+from pathlib import Path
 from lle import World, WorldState, Action
 from problem import ExitProblem
+from search import bfs, bidirectional_search, jps
+
+from .utils import check_exit_problem, IMPOSSIBLE, EMPTY, ZIGZAG, LASERS
 
 
 def test_goal_state():
@@ -73,3 +78,42 @@ def test_successors_agent_dead():
     state = world.get_state()
     successors = list(problem.get_successors(state))
     assert len(successors) == 0, "The agent is dead, there should be no successor"
+
+
+def test_bidirectional_search():
+    with open(Path(__file__).parent / "map1.txt") as f:
+        map1 = f.read()
+    for world in (World(EMPTY), World(ZIGZAG), World(map1), World.level(1), World(LASERS)):
+        problem = ExitProblem(world)
+        solution = bidirectional_search(problem)
+        assert solution is not None
+        assert solution.n_steps == bfs(problem).n_steps
+        assert len(solution.states) == solution.n_steps
+        check_exit_problem(problem, solution)
+    assert bidirectional_search(ExitProblem(World(IMPOSSIBLE))) is None
+
+
+def test_jps():
+    with open(Path(__file__).parent / "map1.txt") as f:
+        map1 = f.read()
+    for world in (World(EMPTY), World(ZIGZAG), World(map1), World.level(1), World(LASERS)):
+        problem = ExitProblem(world)
+        solution = jps(problem)
+        assert solution is not None
+        assert solution.n_steps == bfs(problem).n_steps
+        check_exit_problem(problem, solution)
+    assert jps(ExitProblem(World(IMPOSSIBLE))) is None
+
+
+def test_jps_random_maps():
+    rng = random.Random(0)
+    for _ in range(50):
+        height, width = rng.randint(2, 10), rng.randint(2, 10)
+        cells = [[rng.choice(". . . . @ V".split()) for _ in range(width)] for _ in range(height)]
+        cells[0][0], cells[-1][-1] = "S0", "X"
+        problem = ExitProblem(World("\n".join(" ".join(row) for row in cells)))
+        expected, solution = bfs(problem), jps(problem)
+        assert (expected is None) == (solution is None)
+        if solution is not None:
+            assert solution.n_steps == expected.n_steps
+            check_exit_problem(problem, solution)
@@ -115,3 +115,19 @@ def test_bfs():
     check_gem_problem(problem, solution)
     if world.n_gems != world.gems_collected:
         raise AssertionError("Your is_goal_state method is likely erroneous beacuse some gems have not been collected")
+
+
+def test_mst_heuristic_is_admissible_and_cached():
+    world = World(
+        """
+        S0 G . G
+        G  @ . G
+        .  G G X"""
+    )
+    problem = GemProblem(world)
+    optimal = bfs(problem).n_steps
+    assert problem.heuristic(problem.initial_state) <= optimal
+    solution = astar(problem)
+    assert solution.n_steps == optimal
+    assert len(problem.mst_cache) > 0
+    check_gem_problem(problem, solution)
@@ -0,0 +1,38 @@
+from pathlib import Path
+from lle import World
+from search import astar, ida_star
+from problem import ExitProblem, CornerProblem, GemProblem
+
+from .utils import check_exit_problem, check_corner_problem, check_gem_problem, IMPOSSIBLE, EMPTY, ZIGZAG
+
+
+def test_exit_zigzag():
+    problem = ExitProblem(World(ZIGZAG))
+    solution = ida_star(problem)
+    assert solution is not None
+    assert solution.n_steps == astar(problem).n_steps
+    check_exit_problem(problem, solution)
+
+
+def test_corner_empty():
+    problem = CornerProblem(World(EMPTY))
+    solution = ida_star(problem, transposition_size=1000)
+    assert solution is not None
+    assert solution.n_steps == astar(problem).n_steps
+    check_corner_problem(problem, solution)
+
+
+def test_gem_map1():
+    with open(Path(__file__).parent / "map1.txt") as f:
+        world = World(f.read())
+    problem = GemProblem(world)
+    solution = ida_star(problem, packed=True, transposition_size=10_000)
+    assert solution is not None
+    assert solution.n_steps == astar(problem).n_steps
+    check_gem_problem(problem, solution)
+
+
+def test_impossible():
+    assert ida_star(ExitProblem(World(IMPOSSIBLE))) is None
+    assert ida_star(GemProblem(World(IMPOSSIBLE))) is None
+    assert ida_star(CornerProblem(World(ZIGZAG))) is None
@@ -0,0 +1,99 @@
+import pytest
+from lle import Action, World
+from problem import ExitProblem, MultiAgentExitProblem, MultiAgentGemProblem
+from search import astar, bfs
+from src.visualization import solution_frames
+
+# Agent 0 can only cross the beam of colour 1 once agent 1 stands on it, upstream.
+BLOCKED = """
+S0 @  @  S1 @
+.  .  .  .  L1W
+X  @  @  X  @
+"""
+
+TWO_GEMS = """
+S0 .  G  .
+.  .  .  .
+S1 .  .  X
+X  .  G  .
+"""
+
+THREE_AGENTS = """
+S0 . . . . . .
+S1 . . @ . . .
+S2 . . @ . . X
+.  . . @ . . X
+G  . . . . . X
+"""
+
+
+def replay(map_str, joint_actions):
+    world = World(map_str)
+    world.reset()
+    for actions in joint_actions:
+        world.step(actions)
+    return world
+
+
+def check_solution(problem, map_str, solution):
+    joint = problem.joint_actions(solution.actions)
+    world = replay(map_str, joint)
+    assert all(world.get_state().agents_alive)
+    assert all(agent.has_arrived for agent in world.agents)
+    assert all(world.get_state().gems_collected)
+    return joint
+
+
+def test_single_agent_problems_reject_several_agents():
+    with pytest.raises(AssertionError):
+        ExitProblem(World(BLOCKED))
+
+
+def test_branching_factor():
+    problem = MultiAgentGemProblem(World(THREE_AGENTS))
+    state = problem.initial_state
+    for _ in range(6):
+        successors = problem.get_successors(state)
+        assert 0 < len(successors) <= 5
+        state = successors[-1][0]
+
+
+def test_laser_blocked_by_matching_colour():
+    problem = MultiAgentExitProblem(World(BLOCKED))
+    solution = astar(problem)
+    joint = check_solution(problem, BLOCKED, solution)
+    assert solution.n_steps == 4 and len(joint) == 2
+    # Agent 0 steps on the beam : it only survives if agent 1 steps on it at the same time.
+    first = problem.initial_state
+    chosen = [s for s, a in problem.get_successors(first) if a == Action.SOUTH][0]
+    assert chosen.pending == (Action.SOUTH.value,)
+    successors = problem.get_successors(chosen)
+    assert [a for s, a in successors] == [Action.SOUTH] and successors[0][0].pending == ()
+
+
+@pytest.mark.parametrize("map_str", [TWO_GEMS, THREE_AGENTS])
+def test_gem_problem(map_str):
+    problem = MultiAgentGemProblem(World(map_str))
+    solution = astar(problem)
+    check_solution(problem, map_str, solution)
+    if map_str is TWO_GEMS: assert solution.n_steps == bfs(problem).n_steps
+
+
+def test_heuristic_is_admissible():
+    problem = MultiAgentGemProblem(World(THREE_AGENTS))
+    solution = astar(problem)
+    states = [problem.initial_state] + solution.states
+    for remaining, state in zip(range(solution.n_steps, -1, -1), states):
+        assert problem.heuristic(state) <= remaining
+
+
+def test_no_compiled_nor_packed_mode():
+    with pytest.raises(AssertionError):
+        MultiAgentExitProblem(World(BLOCKED), compiled=True)
+    with pytest.raises(TypeError):
+        bfs(MultiAgentExitProblem(World(BLOCKED)), packed=True)
+
+
+def test_frames_follow_joint_actions():
+    solution = astar(MultiAgentExitProblem(World(BLOCKED)))
+    assert len(list(solution_frames(World(BLOCKED), solution))) == 1 + 2
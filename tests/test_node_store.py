@@ -0,0 +1,51 @@
+from lle import Action, World
+from frontier import HeapFrontier, IndexedFrontier
+from node_store import NodeStore
+from problem import GemProblem
+from search import astar, bfs, dfs
+
+from .utils import GEMS
+
+
+def test_path_follows_parent_indices():
+    store = NodeStore()
+    root = store.add("a", -1, None, 0.0)
+    b = store.add("b", root, Action.EAST, 1.0)
+    store.add("x", root, Action.WEST, 1.0)
+    c = store.add("c", b, Action.SOUTH, 2.0)
+    actions, states = store.path(c)
+    assert [a.value for a in actions] == [Action.EAST.value, Action.SOUTH.value]
+    assert states == ["b", "c"]
+    assert store.path(root) == ([], [])
+    assert len(store) == 4
+
+
+def test_view():
+    store = NodeStore()
+    root = store.add("a", -1, None, 0.0)
+    view = store.view(store.add("b", root, Action.NORTH, 1.0))
+    assert view.state == "b" and view.cost == 1 and view.prev_action.value == Action.NORTH.value
+    assert view.parent.index == root and view.parent.parent is None and view.parent.prev_action is None
+
+
+def test_bound_frontiers():
+    store = NodeStore()
+    frontier = HeapFrontier(tie_break="high_g")
+    frontier.bind(store)
+    for cost in (1.0, 3.0, 2.0): frontier.push(store.add(cost, -1, None, cost), 5)
+    assert [store.costs[frontier.pop()] for _ in range(3)] == [3, 2, 1]
+
+    frontier = IndexedFrontier()
+    frontier.bind(store)
+    frontier.push(store.add("s", -1, None, 4.0), 9)
+    frontier.push(store.add("s", -1, None, 2.0), 7)
+    assert len(frontier) == 1 and store.costs[frontier.pop()] == 2
+
+
+def test_solution_states_in_order():
+    for algorithm in (dfs, bfs, astar):
+        problem = GemProblem(World(GEMS))
+        solution = algorithm(problem)
+        assert len(solution.states) == solution.n_steps
+        assert problem.is_goal_state(solution.states[-1])
+        assert not problem.is_goal_state(solution.states[0])
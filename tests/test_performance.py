@@ -0,0 +1,54 @@
+import json
+from pathlib import Path
+import pytest
+from src.benchmark import measure
+
+from .utils import EMPTY, ZIGZAG, GEMS
+
+
+# Performance regression gate : nodes expanded and median runtime of each case are compared to the checked-in baseline.
+# Any increase of the nodes expanded fails. Runtimes depend on the machine, so they are only compared with --perf-gate :
+# they may then rise up to --perf-tolerance (plus TIME_FLOOR, which absorbs the timer noise of sub-millisecond cases). Run `pytest tests/test_performance.py --update-baseline` to record
+# a new baseline after an intended change.
+
+BASELINE: Path = Path(__file__).parent / "performance_baseline.json"
+TIME_FLOOR: float = 0.005
+
+with open(Path(__file__).parent / "map1.txt") as f:
+    MAPS: dict = {"EMPTY": EMPTY, "ZIGZAG": ZIGZAG, "GEMS": GEMS, "map1": f.read()}
+
+# (problem, algorithm, map). Blind searches of the gem and corner problems on GEMS take seconds and are left out.
+CASES: list = [
+    (problem, algorithm, map_name)
+    for map_name in MAPS
+    for problem in ("exit", "gem", "corner")
+    for algorithm in ("dfs", "bfs", "astar")
+    if not (map_name == "GEMS" and (problem == "corner" or (problem == "gem" and algorithm != "astar")))
+]
+
+
+def case_key(problem: str, algorithm: str, map_name: str) -> str:
+    return f"{problem}/{algorithm}/{map_name}"
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize("problem, algorithm, map_name", CASES, ids=[case_key(*case) for case in CASES])
+def test_no_regression(request, problem, algorithm, map_name):
+    timed = request.config.getoption("--perf-gate") or request.config.getoption("--update-baseline")
+    repeat = request.config.getoption("--perf-repeat") if timed else 1
+    _, stats, elapsed, _ = measure(algorithm, problem, MAPS[map_name], repeat=repeat, memory=False)
+    key = case_key(problem, algorithm, map_name)
+    baseline = json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+
+    if request.config.getoption("--update-baseline"):
+        baseline[key] = {"nodes_expanded": stats.nodes_expanded, "median_time": round(elapsed, 6)}
+        BASELINE.write_text(json.dumps(dict(sorted(baseline.items())), indent=2) + "\n")
+        return
+
+    assert key in baseline, f"[E] No baseline for {key}, run the tests with --update-baseline."
+    expected = baseline[key]
+    assert stats.nodes_expanded <= expected["nodes_expanded"], \
+        f"{key} expands {stats.nodes_expanded} nodes instead of {expected['nodes_expanded']}."
+    if not timed: return
+    limit = expected["median_time"] * (1 + request.config.getoption("--perf-tolerance")) + TIME_FLOOR
+    assert elapsed <= limit, f"{key} takes {elapsed:.4f}s, more than {limit:.4f}s (baseline {expected['median_time']:.4f}s)."
@@ -0,0 +1,38 @@
+import math
+from pathlib import Path
+from lle import World
+from problem import GemProblem
+from search import bfs
+from src.portfolio import portfolio_solve
+
+from .utils import check_gem_problem, IMPOSSIBLE, GEMS, ZIGZAG
+
+
+def test_optimal_solution():
+    result = portfolio_solve(GEMS, problem='gem', optimality=1.0)
+    assert result.algorithm in ('bfs', 'astar') and result.bound == 1
+    problem = GemProblem(World(GEMS))
+    assert result.solution.n_steps == bfs(problem).n_steps
+    check_gem_problem(problem, result.solution)
+
+
+def test_any_solution():
+    with open(Path(__file__).parent / "map1.txt") as f:
+        map1 = f.read()
+    result = portfolio_solve(map1, problem='gem', algorithms=('dfs', 'greedy', 'astar'), optimality=math.inf)
+    assert result.solution is not None
+    check_gem_problem(GemProblem(World(map1)), result.solution)
+
+
+def test_bounded_solution():
+    result = portfolio_solve(ZIGZAG, problem='exit', algorithms=('dfs', 'weighted_astar'), optimality=2.0)
+    assert result.algorithm == 'weighted_astar' and result.solution.n_steps == 19
+
+
+def test_no_solution():
+    result = portfolio_solve(IMPOSSIBLE, problem='exit', algorithms=('dfs', 'bfs'))
+    assert result is not None and result.solution is None
+
+
+def test_timeout():
+    assert portfolio_solve(GEMS, problem='corner', algorithms=('bfs',), timeout=0.5) is None
@@ -0,0 +1,78 @@
+import random
+from priority_queue import PriorityQueue, IndexedPriorityQueue, BucketQueue
+
+
+def drain(queue) -> list:
+    ret = []
+    while not queue.is_empty():
+        ret.append(queue.pop())
+    return ret
+
+
+def test_indexed_same_order_as_priority_queue():
+    rng = random.Random(0)
+    reference, indexed = PriorityQueue(), IndexedPriorityQueue()
+    for item in range(500):
+        priority = rng.randint(0, 50)
+        reference.push(item, priority)
+        indexed.push(item, priority)
+    assert drain(indexed) == drain(reference)
+
+
+def test_indexed_decrease_key():
+    queue = IndexedPriorityQueue()
+    for item, priority in (("a", 5), ("b", 3), ("c", 4)):
+        queue.push(item, priority)
+    assert "a" in queue and len(queue) == 3
+    queue.update("a", 1)
+    assert queue.priority("a") == 1
+    queue.update("b", 10)  # Higher priority : ignored
+    queue.update("d", 2)   # Unknown item : pushed
+    assert drain(queue) == ["a", "d", "b", "c"]
+    assert "a" not in queue
+
+
+def test_indexed_random_updates():
+    rng = random.Random(1)
+    queue, priorities = IndexedPriorityQueue(), {}
+    for _ in range(2000):
+        item = rng.randint(0, 200)
+        priority = rng.randint(0, 1000)
+        queue.update(item, priority)
+        priorities[item] = min(priority, priorities.get(item, priority))
+    popped = [(queue.priority(queue.heap[0][2]), queue.pop()) for _ in range(len(queue))]
+    assert [p for p, _ in popped] == sorted(priorities.values())
+    assert all(priorities[item] == p for p, item in popped)
+
+
+def test_bucket_queue_orders_by_priority():
+    rng = random.Random(2)
+    queue, priorities = BucketQueue(), []
+    for item in range(300):
+        priority = rng.randint(0, 40)
+        queue.push(item, priority)
+        priorities.append(priority)
+    assert len(queue) == 300
+    assert [priorities[item] for item in drain(queue)] == sorted(priorities)
+
+
+def test_bucket_queue_tie_breaking():
+    nodes = [("a", 1), ("b", 3), ("c", 2), ("d", 3)]
+    g_of = dict(nodes).__getitem__
+
+    queue = BucketQueue(tie_break="high_g", g_of=g_of)
+    for item, _ in nodes: queue.push(item, 5)
+    assert drain(queue) == ["b", "d", "c", "a"]
+
+    queue = BucketQueue(tie_break="low_g", g_of=g_of, lifo=True)
+    for item, _ in nodes: queue.push(item, 5)
+    assert drain(queue) == ["a", "c", "d", "b"]
+
+
+def test_bucket_queue_rejects_fractional_priority():
+    queue = BucketQueue()
+    try:
+        queue.push("a", 1.5)
+    except AssertionError:
+        return
+    raise AssertionError("A fractional priority should be rejected")
@@ -0,0 +1,51 @@
+from lle import Action, World
+from problem import CornerProblem, CornerState, GemProblem
+from search import Solution, astar, bfs
+
+from .utils import check_gem_problem, EMPTY, GEMS
+
+
+def test_states_are_replayed_on_demand():
+    problem = GemProblem(World(GEMS))
+    solution = astar(problem)
+    assert solution._states is None
+    states = list(solution.iter_states())
+    assert solution._states is None
+    assert solution.states == states and solution._states is not None
+    assert len(states) == solution.n_steps
+    assert problem.is_goal_state(states[-1])
+
+
+def test_packed_states_are_decoded():
+    problem = CornerProblem(World(EMPTY))
+    solution = bfs(problem, packed=True)
+    assert isinstance(solution.initial_state, int)
+    assert all(isinstance(s, CornerState) for s in solution.states)
+    assert all(solution.states[-1].visited_corners)
+
+
+def test_text_roundtrip():
+    problem = GemProblem(World(GEMS))
+    solution = astar(problem)
+    text = solution.to_text()
+    assert len(text) == solution.n_steps and set(text) <= set("NSEW.")
+    copy = Solution.from_text(text, problem)
+    assert copy == solution
+    assert copy.states == solution.states
+    check_gem_problem(problem, copy)
+
+
+def test_bytes_roundtrip():
+    problem = GemProblem(World(GEMS))
+    solution = astar(problem)
+    data = solution.to_bytes()
+    assert len(data) == 4 + (solution.n_steps + 1) // 2
+    assert Solution.from_bytes(data, problem) == solution
+    for actions in ([], [Action.STAY], [Action.NORTH, Action.WEST, Action.STAY]):
+        odd = Solution(actions, states=[])
+        assert [a.value for a in Solution.from_bytes(odd.to_bytes(), problem).actions] == [a.value for a in actions]
+
+
+def test_explicit_states_are_kept():
+    solution = Solution([Action.EAST], states=["s"])
+    assert solution.states == ["s"] and list(solution.iter_states()) == ["s"]
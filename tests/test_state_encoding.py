@@ -0,0 +1,57 @@
+from lle import World, WorldState
+from problem import ExitProblem, GemProblem, CornerProblem, CornerState
+from search import astar, bfs, dfs
+
+from .utils import check_exit_problem, check_corner_problem, check_gem_problem, EMPTY, ZIGZAG, GEMS
+
+
+def test_roundtrip_world_state():
+    problem = GemProblem(World(GEMS))
+    state = WorldState([(4, 3)], [i % 3 == 0 for i in range(problem.world.n_gems)], [True])
+    code = problem.encode_state(state)
+    assert isinstance(code, int)
+    assert problem.decode_state(code) == state
+    dead = WorldState([(4, 3)], [False] * problem.world.n_gems, [False])
+    assert problem.decode_state(problem.encode_state(dead)).agents_alive == [False]
+
+
+def test_roundtrip_corner_state():
+    problem = CornerProblem(World(EMPTY))
+    state = CornerState([(2, 3)], [], [True], visited_corners=[True, False, True, False])
+    decoded = problem.decode_state(problem.encode_state(state))
+    assert decoded == state
+    assert decoded.visited_corners == [True, False, True, False]
+
+
+def test_packed_successors_match():
+    problem = GemProblem(World(GEMS))
+    state = problem.initial_state
+    packed = problem.get_packed_successors(problem.encode_state(state))
+    expected = problem.get_successors(state)
+    assert [problem.decode_state(c) for c, _ in packed] == [s for s, _ in expected]
+    assert [a.value for _, a in packed] == [a.value for _, a in expected]
+
+
+def test_packed_search():
+    for algorithm in (dfs, bfs, astar):
+        problem = ExitProblem(World(ZIGZAG))
+        solution = algorithm(problem, packed=True)
+        assert solution is not None
+        assert all(isinstance(s, WorldState) for s in solution.states)
+        check_exit_problem(problem, solution)
+
+        problem = CornerProblem(World(EMPTY))
+        solution = algorithm(problem, packed=True)
+        assert solution is not None
+        assert all(isinstance(s, CornerState) for s in solution.states)
+        check_corner_problem(problem, solution)
+
+        problem = GemProblem(World(GEMS))
+        solution = algorithm(problem, packed=True)
+        assert solution is not None
+        check_gem_problem(problem, solution)
+
+
+def test_packed_bfs_same_length():
+    problem = GemProblem(World(GEMS))
+    assert bfs(problem, packed=True).n_steps == bfs(problem).n_steps
@@ -0,0 +1,71 @@
+from lle import World
+from problem import ExitProblem, GemProblem
+from search import anytime_astar, astar, bfs, bidirectional_search, dfs, ida_star
+from stats import SearchStats
+
+from .utils import EMPTY, ZIGZAG, GEMS
+
+
+def test_counters_are_filled():
+    for algorithm in (dfs, bfs, astar):
+        stats = SearchStats()
+        solution = algorithm(GemProblem(World(GEMS)), stats=stats)
+        assert stats.nodes_expanded > 0
+        assert stats.nodes_generated >= stats.nodes_expanded
+        assert stats.duplicates_discarded > 0
+        assert stats.peak_frontier > 0 and stats.peak_closed > 0
+        assert stats.solution_depth == solution.n_steps
+        assert stats.time_total >= stats.time_successors > 0
+        assert stats.time_goal > 0
+
+
+def test_heuristic_time_only_for_informed_search():
+    stats = SearchStats()
+    bfs(ExitProblem(World(ZIGZAG)), stats=stats)
+    assert stats.time_heuristic == 0
+    stats = SearchStats()
+    astar(ExitProblem(World(ZIGZAG)), stats=stats)
+    assert stats.time_heuristic > 0
+
+
+def test_on_expand_is_called_for_every_expansion():
+    expanded = []
+    stats = SearchStats()
+    astar(GemProblem(World(GEMS)), stats=stats, on_expand=expanded.append)
+    assert len(expanded) == stats.nodes_expanded
+    assert expanded[0].parent is None
+
+
+def test_effective_branching_factor():
+    stats = SearchStats(nodes_expanded=7, nodes_generated=14, solution_depth=3)
+    assert abs(stats.effective_branching_factor - 2) < 1e-6
+    stats = SearchStats()
+    bfs(ExitProblem(World(EMPTY)), stats=stats)
+    assert 1 < stats.effective_branching_factor < 4
+
+
+def test_effective_branching_factor_of_deep_solutions():
+    # b^d stays within the float range whatever the depth.
+    for depth in (120, 2000):
+        stats = SearchStats(nodes_expanded=5000, nodes_generated=10000, solution_depth=depth)
+        assert 1 < stats.effective_branching_factor < 10000 ** (1 / depth)
+        assert 'branching 1.' in stats.summary()
+
+
+def test_ida_star_iterations():
+    stats = SearchStats()
+    solution = ida_star(GemProblem(World(GEMS)), transposition_size=100_000, stats=stats)
+    assert stats.iterations
+    thresholds = [threshold for threshold, _ in stats.iterations]
+    assert thresholds == sorted(thresholds) and thresholds[-1] == solution.n_steps
+    assert stats.nodes_expanded == sum(expanded for _, expanded in stats.iterations)
+
+
+def test_other_searches_fill_stats():
+    stats = SearchStats()
+    solutions = list(anytime_astar(GemProblem(World(GEMS)), stats=stats))
+    assert stats.nodes_expanded > 0 and stats.solution_depth == solutions[-1][0].n_steps
+    assert [weight for weight, _ in stats.iterations][-1] == 1
+    stats = SearchStats()
+    solution = bidirectional_search(ExitProblem(World(ZIGZAG)), stats=stats)
+    assert stats.nodes_expanded > 0 and stats.solution_depth == solution.n_steps
@@ -0,0 +1,94 @@
+import asyncio
+import threading
+import pytest
+from lle import World
+from problem import ExitProblem, GemProblem
+from search import astar, iter_search, search_async
+from budget import CancelToken, SearchBudget
+from stats import SearchStats
+import budget
+
+from .utils import IMPOSSIBLE, GEMS
+
+
+def test_events_and_result():
+    problem = GemProblem(World(GEMS))
+    stats = SearchStats()
+    search = iter_search(problem, "astar", stats=stats)
+    events = list(search)
+    assert search.result.status == "solved" and not search.result.stopped_early
+    assert len(events) == stats.nodes_expanded
+    assert [e.expanded for e in events[:3]] == [0, 1, 2]
+    assert events[0].node.parent is None
+    assert search.result.solution.n_steps == astar(problem).n_steps
+
+
+def test_no_solution():
+    result = iter_search(ExitProblem(World(IMPOSSIBLE)), "bfs").run()
+    assert result.status == "no_solution" and result.solution is None and result.partial is None
+
+
+def test_node_budget():
+    problem = GemProblem(World(GEMS))
+    result = iter_search(problem, "astar", budget=SearchBudget(max_nodes=200)).run()
+    assert result.status == "budget_exceeded" and result.limit == "nodes"
+    assert result.stats.nodes_expanded == 200 and result.solution is None
+    # The best partial path is a valid plan that got closer to the goal.
+    assert 0 < result.partial.n_steps < astar(problem).n_steps
+    assert problem.heuristic(result.partial.states[-1]) < problem.heuristic(problem.initial_state)
+
+
+def test_budget_reuses_heuristics(monkeypatch):
+    # Ranking the partial paths must not evaluate the heuristic again.
+    problem = GemProblem(World(GEMS))
+    heuristic, calls = problem.heuristic, []
+    monkeypatch.setattr(problem, "heuristic", lambda problem_state: calls.append(problem_state) or heuristic(problem_state))
+    iter_search(problem, "astar").run()
+    unlimited = len(calls)
+    calls.clear()
+    assert iter_search(problem, "astar", budget=SearchBudget(max_nodes=10**6)).run().status == "solved"
+    assert len(calls) == unlimited
+
+
+def test_time_budget():
+    result = iter_search(GemProblem(World(GEMS)), "bfs", budget=SearchBudget(max_time=0.05)).run()
+    assert result.status == "budget_exceeded" and result.limit == "time"
+    assert result.stats.time_total < 1
+    assert result.partial is not None
+
+
+def test_memory_budget(monkeypatch):
+    memory = iter(range(0, 10**12, 10**6))
+    monkeypatch.setattr(budget, "resident_memory", lambda: next(memory))
+    result = iter_search(GemProblem(World(GEMS)), "bfs", budget=SearchBudget(max_memory=2_500_000)).run()
+    assert result.status == "budget_exceeded" and result.limit == "memory"
+    assert result.stats.nodes_expanded == 2 * budget.MEMORY_CHECK_INTERVAL
+
+
+def test_cancel_from_another_thread():
+    cancel = CancelToken()
+    timer = threading.Timer(0.05, cancel.cancel)
+    timer.start()
+    result = iter_search(GemProblem(World(GEMS)), "bfs", cancel=cancel).run()
+    assert result.status == "cancelled" and result.stopped_early and result.partial is not None
+
+
+def test_cancel_while_iterating():
+    cancel = CancelToken()
+    search = iter_search(GemProblem(World(GEMS)), "dfs", cancel=cancel)
+    for event in search:
+        if event.expanded == 10: cancel.cancel()
+    assert search.result.status == "cancelled" and search.result.stats.nodes_expanded == 11
+
+
+def test_async():
+    async def scenario():
+        result = await search_async(GemProblem(World(GEMS)), "astar", budget=SearchBudget(max_nodes=50))
+        assert result.limit == "nodes"
+        task = asyncio.create_task(search_async(GemProblem(World(GEMS)), "bfs"))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
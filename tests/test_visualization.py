@@ -0,0 +1,35 @@
+import subprocess
+import sys
+from pathlib import Path
+from lle import World
+from problem import GemProblem
+from search import astar
+from src.visualization import export_solution
+
+from .utils import GEMS
+
+ROOT = Path(__file__).parent.parent
+
+
+def test_solver_does_not_load_rendering_libraries():
+    code = "import sys; import src.search; print(sorted(m for m in ('matplotlib', 'PIL') if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "[]"
+
+
+def test_export_png_sequence(tmp_path):
+    world = World(GEMS)
+    solution = astar(GemProblem(world))
+    paths = export_solution(world, solution, str(tmp_path / "frames"))
+    assert len(paths) == solution.n_steps + 1
+    assert all(Path(p).exists() for p in paths)
+
+
+def test_export_gif(tmp_path):
+    from PIL import Image
+    world = World(GEMS)
+    solution = astar(GemProblem(world))
+    export_solution(world, solution, str(tmp_path / "replay.gif"))
+    with Image.open(tmp_path / "replay.gif") as gif:
+        assert gif.n_frames > 1
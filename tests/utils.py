@@ -32,6 +32,12 @@ G  . @ .  G X
 .  . G G  G X"""
 
 
+LASERS = """
+S0  . . V X
+L0E . . . .
+.   G . G ."""
+
+
 def check_exit_problem(problem: ExitProblem, solution: Solution):
     world = problem.world
     world.reset()